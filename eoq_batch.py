@@ -0,0 +1,103 @@
+"""
+Chunked batch processing for SKU masters.
+
+Reads CSV, Parquet or Arrow IPC files in bounded-memory chunks, runs the
+EOQ engine on each chunk and streams the results back out chunk by chunk.
+"""
+
+import os
+
+import pandas as pd
+
+from eoq_engine import INPUT_COLUMNS, calculate_frame
+
+DEFAULT_CHUNKSIZE = 250_000
+# Labels, read as text: codes like 1500 and X1500 in one file must not change type between chunks
+IDENTIFIER_COLUMNS = ('sku', 'supplier')
+
+
+def detect_format(name):
+    """Return 'csv', 'parquet' or 'arrow' based on a file name."""
+    ext = os.path.splitext(str(name))[1].lower()
+    if ext in ('.parquet', '.pq'):
+        return 'parquet'
+    if ext in ('.arrow', '.feather', '.ipc'):
+        return 'arrow'
+    if ext in ('.csv', '.txt', '.gz'):
+        return 'csv'
+    raise ValueError(f"unsupported file type: {name}")
+
+
+def read_sku_chunks(source, file_format='csv', chunksize=DEFAULT_CHUNKSIZE, columns=None,
+                    text_columns=IDENTIFIER_COLUMNS):
+    """
+    Yield the SKU master as DataFrames of at most `chunksize` rows.
+
+    `source` is a path or a binary file-like object (e.g. a Streamlit upload).
+    `columns` limits the columns read; Parquet and Arrow paths are memory-mapped.
+    CSV columns named in `text_columns` are read as strings, so their type
+    doesn't depend on the values of each chunk; Parquet and Arrow files
+    carry one type per column already.
+    """
+    if file_format == 'csv':
+        dtype = {col: str for col in text_columns}
+        with pd.read_csv(source, chunksize=chunksize, usecols=columns, dtype=dtype) as reader:
+            yield from reader
+    elif file_format == 'parquet':
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(source, memory_map=isinstance(source, (str, os.PathLike)))
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    elif file_format == 'arrow':
+        import pyarrow as pa
+
+        if isinstance(source, (str, os.PathLike)):
+            source = pa.memory_map(os.fspath(source))
+        table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            missing = [col for col in columns if col not in table.column_names]
+            if missing:
+                raise ValueError(f"missing columns: {', '.join(missing)}")
+            table = table.select(columns)
+        for batch in table.to_batches(max_chunksize=chunksize):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"unsupported file format: {file_format}")
+
+
+def count_rows(source, file_format):
+    """Row count from Parquet or Arrow metadata; None for CSV, which would need a full scan."""
+    if file_format == 'arrow':
+        import pyarrow as pa
+
+        if isinstance(source, (str, os.PathLike)):
+            source = pa.memory_map(os.fspath(source))
+        reader = pa.ipc.open_file(source)
+        return sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+    if file_format != 'parquet':
+        return None
+    import pyarrow.parquet as pq
+
+    return pq.ParquetFile(source).metadata.num_rows
+
+
+def process_chunks(chunks, defaults=None, store=None):
+    """
+    Run the engine over an iterable of SKU chunks.
+
+    Input columns missing from the file are filled from `defaults`, so a
+    master with only demand and cost columns can reuse the sidebar values
+    for the rest. With a ResultStore (eoq_store), unchanged SKUs are served
+    from the store instead of being recomputed.
+    """
+    defaults = defaults or {}
+    calculate = store.calculate_frame if store is not None else calculate_frame
+    for chunk in chunks:
+        missing = [col for col in INPUT_COLUMNS if col not in chunk.columns]
+        for col in missing:
+            if col not in defaults:
+                raise ValueError(f"missing input column without default: {col}")
+            chunk[col] = defaults[col]
+        yield calculate(chunk)
+
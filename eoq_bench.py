@@ -0,0 +1,439 @@
+"""
+Benchmark suite for the EOQ calculator.
+
+Times each stage of the app at several scales and stores the results as
+JSON, so a later run can be compared against a saved baseline:
+
+    python eoq_bench.py --save baseline.json
+    python eoq_bench.py --compare baseline.json --threshold 0.2
+"""
+
+import argparse
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+BENCHMARKS = {}
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'eoq_calculator.py')
+
+DEFAULT_INPUTS = {
+    'annual_demand': 50000,
+    'unit_cost': 50.0,
+    'order_cost': 200.0,
+    'holding_cost_pct': 20,
+    'lead_time_days': 14,
+    'service_level': 95.0,
+    'demand_variability': 20,
+}
+
+
+def benchmark(stage, scales, quick_scales=None):
+    """
+    Register `func(scale)` as a benchmark stage.
+
+    The function does its setup and returns a zero-argument callable; only
+    that callable is timed. A stage with resources to release (files, a
+    server) is a generator instead: it yields the callable and cleans up
+    once the timing is done.
+    """
+    def register(func):
+        BENCHMARKS[stage] = (func, tuple(scales), tuple(quick_scales or scales))
+        return func
+    return register
+
+
+def random_inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        'annual_demand': rng.uniform(100, 1e6, n),
+        'unit_cost': rng.uniform(1, 1000, n),
+        'order_cost': rng.uniform(10, 1000, n),
+        'holding_cost_pct': rng.uniform(5, 50, n),
+        'lead_time_days': rng.integers(1, 90, n).astype(float),
+        'service_level': rng.uniform(85, 99.9, n),
+        'demand_variability': rng.uniform(5, 50, n),
+    }
+
+
+@benchmark('imports', ['numpy', 'pandas', 'plotly', 'streamlit'])
+def bench_imports(module):
+    modules = {'plotly': 'plotly.graph_objects'}
+    code = f"import {modules.get(module, module)}"
+    return lambda: subprocess.run([sys.executable, '-c', code], check=True)
+
+
+@benchmark('calculate', [1, 1_000, 100_000, 1_000_000], quick_scales=[1, 1_000, 100_000])
+def bench_calculate(n):
+    from eoq_engine import calculate
+
+    inputs = random_inputs(n)
+    return lambda: calculate(**inputs)
+
+
+@benchmark('sawtooth', [3, 100, 10_000], quick_scales=[3, 100])
+def bench_sawtooth(n_scenarios):
+    from eoq_engine import calculate, inventory_sawtooth
+
+    r = calculate(**DEFAULT_INPUTS)
+    safety = np.linspace(0, 2, n_scenarios) * r['safety_stock']
+    return lambda: inventory_sawtooth(r['eoq'], safety, r['daily_demand'],
+                                      DEFAULT_INPUTS['lead_time_days'], 10 * r['days_between_orders'])
+
+
+@benchmark('simulation', [200, 1_000, 10_000, 100_000], quick_scales=[200, 1_000])
+def bench_simulation(n_paths):
+    from eoq_engine import calculate
+    from eoq_simulation import simulate_policy
+
+    r = calculate(**DEFAULT_INPUTS)
+    return lambda: simulate_policy(
+        r['eoq'], r['reorder_point'], r['daily_demand'], r['daily_std_dev'],
+        DEFAULT_INPUTS['lead_time_days'], r['holding_cost_per_unit'],
+        DEFAULT_INPUTS['order_cost'], n_paths=n_paths, rng=0,
+    )
+
+
+@benchmark('parallel', [1, 2, 4, 8], quick_scales=[1, 2])
+def bench_parallel(workers):
+    from eoq_engine import calculate
+    from eoq_parallel import simulate_portfolio
+
+    # 128 SKUs x 500 paths, the same results for every worker count
+    inputs = random_inputs(128)
+    results = calculate(**inputs)
+    policies = {
+        'order_qty': results['eoq'], 'reorder_point': results['reorder_point'],
+        'daily_demand': results['daily_demand'], 'daily_std_dev': results['daily_std_dev'],
+        'lead_time_days': inputs['lead_time_days'], 'holding_cost_per_unit': results['holding_cost_per_unit'],
+        'order_cost': inputs['order_cost'],
+    }
+    return lambda: simulate_portfolio(policies, n_paths=500, seed=1, workers=workers)
+
+
+@benchmark('policy', [1, 8, 32], quick_scales=[1, 8])
+def bench_policy(n_skus):
+    from eoq_engine import calculate
+    from eoq_policy import optimize_portfolio
+
+    # (s, S) and (R = 7, s, S) search for a 98% fill rate, 200 paths per SKU
+    inputs = random_inputs(n_skus)
+    results = calculate(**inputs)
+    policies = {
+        'order_qty': results['eoq'], 'reorder_point': results['reorder_point'],
+        'daily_demand': results['daily_demand'], 'daily_std_dev': results['daily_std_dev'],
+        'lead_time_days': inputs['lead_time_days'], 'holding_cost_per_unit': results['holding_cost_per_unit'],
+        'order_cost': inputs['order_cost'],
+    }
+    return lambda: optimize_portfolio(policies, n_paths=200, seed=1)
+
+
+@benchmark('discounts', [1_000, 100_000, 500_000], quick_scales=[1_000, 100_000])
+def bench_discounts(n):
+    from eoq_discounts import solve_price_breaks
+
+    inputs = random_inputs(n)
+    rng = np.random.default_rng(1)
+    breaks = np.cumsum(rng.uniform(0, 5000, (n, 5)), axis=1) - 1
+    breaks[:, 0] = 0
+    prices = inputs['unit_cost'][:, None] * np.cumprod(rng.uniform(0.9, 1.0, (n, 5)), axis=1)
+    return lambda: solve_price_breaks(inputs['annual_demand'], inputs['order_cost'], inputs['holding_cost_pct'],
+                                      breaks, prices, 'all_units')
+
+
+@benchmark('constrained', [1_000, 10_000, 100_000], quick_scales=[1_000, 10_000])
+def bench_constrained(n):
+    from eoq_constrained import constrained_eoq
+    from eoq_engine import calculate
+
+    inputs = random_inputs(n)
+    r = calculate(**inputs)
+    # Half of the unconstrained average inventory value, so the limit binds
+    limit = 0.5 * np.dot(inputs['unit_cost'], r['average_inventory'] + r['safety_stock'])
+    return lambda: constrained_eoq(inputs['annual_demand'], inputs['order_cost'], r['holding_cost_per_unit'],
+                                   inputs['unit_cost'], limit, safety_stock=r['safety_stock'])
+
+
+@benchmark('joint', [1_000, 100_000, 1_000_000], quick_scales=[1_000, 100_000])
+def bench_joint(n):
+    from eoq_engine import calculate
+    from eoq_joint import joint_replenishment
+
+    inputs = random_inputs(n)
+    r = calculate(**inputs)
+    rng = np.random.default_rng(1)
+    n_suppliers = max(n // 2000, 1)
+    supplier = rng.integers(0, n_suppliers, n)
+    major_cost = rng.uniform(100, 2000, n_suppliers)[supplier]
+    return lambda: joint_replenishment(supplier, inputs['annual_demand'], r['holding_cost_per_unit'],
+                                       major_cost, inputs['order_cost'] / 10)
+
+
+@benchmark('echelon', [100, 1_000, 5_000], quick_scales=[100, 1_000])
+def bench_echelon(n_stores):
+    from eoq_echelon import guaranteed_service
+
+    # DC -> 20 regional warehouses -> n_stores stores, 50 SKUs on the network
+    rng = np.random.default_rng(0)
+    regions = 20
+    edges = [(0, 1 + r) for r in range(regions)] + [(1 + s % regions, 1 + regions + s) for s in range(n_stores)]
+    n_nodes = 1 + regions + n_stores
+    lead_time = np.r_[[28], rng.integers(3, 10, regions), rng.integers(1, 4, n_stores)]
+    holding = rng.uniform(1, 10, (50, 1)) * np.r_[[1.0], np.full(regions, 1.2), np.full(n_stores, 1.5)]
+    std = np.r_[np.zeros(1 + regions), np.ones(n_stores)] * rng.uniform(0.5, 5, (50, n_nodes))
+    return lambda: guaranteed_service(edges, lead_time, holding, std, 95)
+
+
+@benchmark('lotsizing', [100, 1_000, 10_000], quick_scales=[100, 1_000])
+def bench_lotsizing(n):
+    from eoq_lotsizing import wagner_whitin
+
+    # Three years of weekly, seasonal and noisy demand per SKU
+    inputs = random_inputs(n)
+    rng = np.random.default_rng(1)
+    weeks = np.arange(156)
+    season = 1 + 0.5 * np.sin(2 * np.pi * (weeks / 52 + rng.uniform(0, 1, (n, 1))))
+    demand = rng.poisson(inputs['annual_demand'][:, None] / 52 * season).astype(float)
+    holding = inputs['unit_cost'] * inputs['holding_cost_pct'] / 100 / 52
+    return lambda: wagner_whitin(demand, inputs['order_cost'], holding)
+
+
+@benchmark('portfolio', ['float64', 'float32'])
+def bench_portfolio(dtype):
+    import pandas as pd
+
+    from eoq_portfolio import Portfolio
+
+    skus = pd.DataFrame(random_inputs(1_000_000))
+    skus.insert(0, 'sku', np.char.add('SKU', np.arange(len(skus)).astype(str)))
+    return lambda: Portfolio.from_frame(skus, dtype)
+
+
+@benchmark('store', [1_000, 100_000, 1_000_000], quick_scales=[1_000, 100_000])
+def bench_store(n):
+    import tempfile
+
+    import pandas as pd
+
+    from eoq_store import ResultStore
+
+    # A nightly rerun: 1% of the SKUs changed since the stored run
+    skus = pd.DataFrame(random_inputs(n))
+    skus.insert(0, 'sku', np.arange(n).astype(str))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'results.arrow')
+        with ResultStore(path) as store:
+            store.calculate_frame(skus)
+        skus.loc[::100, 'order_cost'] += 1
+
+        def run():
+            store = ResultStore(path)
+            store.calculate_frame(skus)
+            store.close(commit=False)
+        yield run
+
+
+@benchmark('browse', [100_000, 1_000_000], quick_scales=[100_000])
+def bench_browse(n):
+    import tempfile
+
+    import pandas as pd
+
+    from eoq_browser import ResultsBrowser
+    from eoq_engine import calculate_frame
+    from eoq_export import ResultWriter
+
+    # Top 100 by annual cost of one supplier, from a spooled results file
+    skus = pd.DataFrame(random_inputs(n))
+    skus.insert(0, 'supplier', np.arange(n) % 50)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'results.arrow')
+        with ResultWriter(path) as writer:
+            for start in range(0, n, 250_000):
+                writer.write(calculate_frame(skus.iloc[start:start + 250_000]))
+        browser = ResultsBrowser(path)
+        yield lambda: browser.page('total_inventory_cost_annual', filters=[('supplier', '==', 7)])
+
+
+@benchmark('history', [100_000, 1_000_000, 5_000_000], quick_scales=[100_000, 1_000_000])
+def bench_history(n_rows):
+    import tempfile
+
+    import pandas as pd
+
+    from eoq_history import read_history
+
+    # Sparse daily sales in date order: two years, 1 SKU per 500 rows, one row per SKU-day
+    rng = np.random.default_rng(1)
+    n_skus = max(n_rows // 500, 1)
+    sales = pd.DataFrame({
+        'sku': rng.integers(0, n_skus, n_rows).astype(str),
+        'date': np.datetime64('2024-01-01') + rng.integers(0, 730, n_rows).astype('timedelta64[D]'),
+        'quantity': rng.poisson(5, n_rows).astype(float),
+    }).drop_duplicates(['sku', 'date']).sort_values('date', kind='stable')
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sales.parquet')
+        sales.to_parquet(path, index=False)
+        yield lambda: read_history(path)
+
+
+@benchmark('figures', ['inventory_levels', 'cost_breakdown', 'service_level_cost', 'order_quantity'])
+def bench_figures(name):
+    import plotly.io as pio
+
+    from eoq_charts import FIGURE_BUILDERS, FIGURE_DEPENDENCIES
+    from eoq_engine import calculate
+
+    values = {**DEFAULT_INPUTS, **calculate(**DEFAULT_INPUTS)}
+    kwargs = {dep: values[dep] for dep in FIGURE_DEPENDENCIES[name]}
+    # Build plus the JSON serialization st.plotly_chart does on every render
+    return lambda: pio.to_json(FIGURE_BUILDERS[name](**kwargs), validate=False)
+
+
+@benchmark('export', ['csv', 'parquet', 'arrow'])
+def bench_export(file_format):
+    import pandas as pd
+
+    from eoq_engine import calculate_frame
+    from eoq_export import export_bytes
+
+    results = calculate_frame(pd.DataFrame(random_inputs(100_000)))
+    return lambda: export_bytes([results], file_format)
+
+
+@benchmark('service', [1, 64, 256], quick_scales=[1, 64])
+def bench_service(concurrency):
+    import asyncio
+    import threading
+
+    from eoq_service import CalculationService, load_test
+
+    # Server on its own event loop thread, stopped once the stage is timed
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        service = CalculationService()
+        host, port = asyncio.run_coroutine_threadsafe(service.start('127.0.0.1', 0), loop).result()
+        try:
+            yield lambda: asyncio.run(load_test(host, port, DEFAULT_INPUTS, n_requests=2000,
+                                                concurrency=concurrency))
+        finally:
+            asyncio.run_coroutine_threadsafe(service.stop(), loop).result()
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+@benchmark('app_rerun', ['cold', 'warm'])
+def bench_app_rerun(mode):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    def run():
+        if mode == 'cold':
+            st.cache_data.clear()
+            st.cache_resource.clear()
+        at = AppTest.from_file(APP_PATH, default_timeout=300).run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+
+    if mode == 'warm':
+        run()
+    return run
+
+
+@benchmark('app_cold_start', ['first_run'])
+def bench_app_cold_start(_):
+    # A fresh interpreter per run, so module imports and the theme read are included
+    code = ("from streamlit.testing.v1 import AppTest; "
+            f"AppTest.from_file({APP_PATH!r}, default_timeout=300).run()")
+    return lambda: subprocess.run([sys.executable, '-c', code], check=True, capture_output=True)
+
+
+def time_callable(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {'median': statistics.median(timings), 'min': min(timings), 'repeat': repeat}
+
+
+def run_benchmarks(stages=None, quick=False, repeat=5):
+    results = {}
+    for stage, (func, scales, quick_scales) in BENCHMARKS.items():
+        if stages and stage not in stages:
+            continue
+        for scale in (quick_scales if quick else scales):
+            setup = func(scale)
+            if inspect.isgenerator(setup):
+                try:
+                    timing = time_callable(next(setup), repeat)
+                finally:
+                    setup.close()
+            else:
+                timing = time_callable(setup, repeat)
+            results[f"{stage}[{scale}]"] = timing
+            print(f"{stage + '[' + str(scale) + ']':36s} {timing['median'] * 1000:12.3f} ms", file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return the benchmarks whose median got slower than baseline by more than `threshold`."""
+    regressions = []
+    for name, timing in results.items():
+        if name not in baseline:
+            continue
+        ratio = timing['median'] / baseline[name]['median']
+        flag = 'REGRESSION' if ratio > 1 + threshold else ('faster' if ratio < 1 - threshold else '')
+        print(f"{name:36s} {baseline[name]['median'] * 1000:12.3f} -> {timing['median'] * 1000:12.3f} ms"
+              f"  x{ratio:5.2f} {flag}")
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='eoq_bench', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--stage', action='append', choices=sorted(BENCHMARKS),
+                        help='run only this stage (repeatable)')
+    parser.add_argument('--quick', action='store_true', help='skip the largest scales')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per benchmark (default: 5)')
+    parser.add_argument('--save', metavar='PATH', help='write results as JSON')
+    parser.add_argument('--compare', metavar='PATH', help='baseline JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative slowdown flagged as regression (default: 0.2)')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.stage, args.quick, args.repeat)
+
+    if args.save:
+        with open(args.save, 'w') as fh:
+            json.dump({
+                'created': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'numpy': np.__version__,
+                'results': results,
+            }, fh, indent=2)
+
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)['results']
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
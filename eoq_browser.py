@@ -0,0 +1,129 @@
+"""
+Server-side paging over large result files.
+
+A results file (Arrow IPC, as spooled by the bulk upload or written by the
+CLI) is memory-mapped and read one record batch at a time. Each batch is
+filtered, and for a sorted page only the best `offset + limit` rows seen
+so far are kept, so a page of a million-SKU portfolio needs memory for one
+batch and one page rather than for the portfolio. Only the page itself is
+converted to pandas and sent to the browser.
+
+Filters are (column, op, value) tuples, all of which must hold:
+
+    [('supplier', 'in', ('ACME', 'Globex')), ('total_inventory_cost_annual', '>=', 10_000)]
+"""
+
+import os
+
+import numpy as np
+
+FILTER_OPS = ('==', '!=', '<', '<=', '>', '>=', 'in', 'contains')
+ROW_COLUMN = '_row'
+
+
+def _filter_mask(table, filters):
+    """Boolean mask of the rows passing every filter; None without filters."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    compare = {'==': pc.equal, '!=': pc.not_equal, '<': pc.less, '<=': pc.less_equal,
+               '>': pc.greater, '>=': pc.greater_equal}
+    mask = None
+    for column, op, value in filters:
+        if column not in table.column_names:
+            raise ValueError(f"unknown filter column: {column}")
+        values = table[column]
+        if op == 'in':
+            condition = pc.is_in(values, value_set=pa.array(list(value)).cast(values.type))
+        elif op == 'contains':
+            condition = pc.match_substring(values.cast(pa.string()), str(value), ignore_case=True)
+        elif op in compare:
+            condition = compare[op](values, value)
+        else:
+            raise ValueError(f"unsupported filter operator {op!r}; expected one of {', '.join(FILTER_OPS)}")
+        mask = condition if mask is None else pc.and_(mask, condition)
+    return mask
+
+
+class ResultsBrowser:
+    """Sorted, filtered pages of an Arrow IPC results file, read without loading it."""
+
+    def __init__(self, path):
+        import pyarrow as pa
+
+        self.path = os.fspath(path)
+        self._reader = pa.ipc.open_file(pa.memory_map(self.path))
+        self.schema = self._reader.schema
+        self.num_rows = sum(self._reader.get_batch(i).num_rows for i in range(self._reader.num_record_batches))
+
+    @property
+    def columns(self):
+        return list(self.schema.names)
+
+    def _tables(self, filters):
+        """Filtered record batches as tables, with each row's position in the file."""
+        import pyarrow as pa
+
+        start = 0
+        for i in range(self._reader.num_record_batches):
+            table = pa.Table.from_batches([self._reader.get_batch(i)])
+            table = table.append_column(ROW_COLUMN, pa.array(np.arange(start, start + table.num_rows)))
+            start += table.num_rows
+            mask = _filter_mask(table, filters)
+            yield table if mask is None else table.filter(mask)
+
+    def page(self, sort_by=None, descending=True, filters=(), offset=0, limit=100):
+        """
+        Rows offset to offset + limit of the matching rows, in file order or
+        sorted by `sort_by`, as a DataFrame indexed by row position in the
+        file; returns (page, number of matching rows). Ties keep file order,
+        so consecutive pages neither repeat nor skip rows.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        if offset < 0 or limit < 1:
+            raise ValueError("offset must be >= 0 and limit >= 1")
+        if sort_by is not None and sort_by not in self.schema.names:
+            raise ValueError(f"unknown sort column: {sort_by}")
+        keep = offset + limit
+        sort_keys = None
+        if sort_by is not None:
+            sort_keys = [(sort_by, 'descending' if descending else 'ascending'), (ROW_COLUMN, 'ascending')]
+
+        best = None
+        matches = 0
+        for table in self._tables(filters):
+            matches += table.num_rows
+            if table.num_rows == 0:
+                continue
+            if sort_keys is None:
+                # File order: the first `keep` matches, then only count
+                have = 0 if best is None else best.num_rows
+                if have < keep:
+                    part = table.slice(0, keep - have)
+                    best = part if best is None else pa.concat_tables([best, part])
+                continue
+            candidates = table if best is None else pa.concat_tables([best, table])
+            best = candidates.take(pc.select_k_unstable(candidates, k=min(keep, candidates.num_rows),
+                                                        sort_keys=sort_keys))
+
+        if best is None:
+            return self.schema.empty_table().to_pandas().rename_axis('row'), 0
+        if sort_keys is not None:
+            best = best.sort_by(sort_keys)
+        frame = best.slice(offset, limit).to_pandas()
+        return frame.set_index(ROW_COLUMN).rename_axis('row'), matches
+
+    def distinct(self, column, limit=1000):
+        """Sorted distinct values of a column, e.g. for a filter; None if there are more than `limit`."""
+        import pyarrow.compute as pc
+
+        if column not in self.schema.names:
+            raise ValueError(f"unknown column: {column}")
+        values = set()
+        for i in range(self._reader.num_record_batches):
+            values.update(pc.unique(self._reader.get_batch(i).column(column)).drop_null().to_pylist())
+            if len(values) > limit:
+                return None
+        return sorted(values)
@@ -3,11 +3,244 @@ EOQ Calculator by Dennis Schmal
 Supply Chain Digitalization Manager | AI Solutions Builder
 """
 
+import time
+
+RUN_STARTED = time.perf_counter()
+
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
+import calendar
+import os
+import tempfile
+from contextlib import nullcontext
 from datetime import datetime
+from pathlib import Path
+
+# Only what the key metrics need is imported up front. pandas, Plotly and the
+# batch/simulation modules are imported by the sections that use them, so a
+# cold process shows the metrics before paying for those imports.
+from eoq_engine import DAYS_PER_YEAR, INPUT_COLUMNS, METRIC_COLUMNS, calculate
+from eoq_export import EXPORT_FORMATS
+from eoq_profiling import StageRecorder
+
+THEME_CSS_PATH = Path(__file__).with_name("static") / "eoq_theme.css"
+
+# Opt-in stage timing (?debug=1): rolling timings shared by all sessions
+TIMINGS_PATH = "eoq_timings.jsonl"
+
+
+@st.cache_resource
+def stage_recorder():
+    return StageRecorder()
+
+
+def timed(stage):
+    return stage_recorder().stage(stage, trace_memory=True) if debug_mode else nullcontext()
+
+
+@st.cache_resource
+def theme_css():
+    return THEME_CSS_PATH.read_text()
+
+
+# Cached computations - shared across sessions, least recently used entries evicted
+RESULTS_CACHE_SIZE = 1024
+FIGURE_CACHE_SIZE = 256
+SIMULATION_SEED = 42
+
+
+def normalize_inputs(inputs):
+    """Hashable cache key: inputs in INPUT_COLUMNS order, as floats rounded to 6 decimals."""
+    return tuple(round(float(inputs[col]), 6) for col in INPUT_COLUMNS)
+
+
+@st.cache_data(max_entries=RESULTS_CACHE_SIZE, show_spinner=False)
+def cached_results(params):
+    return calculate(**dict(zip(INPUT_COLUMNS, params)))
+
+
+# Figures are cached as shared objects and never mutated after building. The
+# key holds only the values the figure depends on, so e.g. the service level
+# curve survives a service level change.
+@st.cache_resource(max_entries=FIGURE_CACHE_SIZE, show_spinner=False)
+def cached_figure(name, key):
+    from eoq_charts import FIGURE_BUILDERS, FIGURE_DEPENDENCIES
+
+    with timed(f"build:{name}"):
+        return FIGURE_BUILDERS[name](**dict(zip(FIGURE_DEPENDENCIES[name], key)))
+
+
+def render_figure(name, values):
+    from eoq_charts import FIGURE_DEPENDENCIES
+
+    key = tuple(round(float(values[dep]), 6) for dep in FIGURE_DEPENDENCIES[name])
+    fig = cached_figure(name, key)
+    with timed(f"render:{name}"):
+        st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+
+
+@st.cache_data(max_entries=RESULTS_CACHE_SIZE, show_spinner=False)
+def cached_sweep(params, y_axis, x_axis, metric):
+    from eoq_sensitivity import default_axis, sweep
+
+    base = dict(zip(INPUT_COLUMNS, params))
+    y_values = default_axis(y_axis, base[y_axis])
+    x_values = default_axis(x_axis, base[x_axis])
+    return x_values, y_values, sweep(base, {y_axis: y_values, x_axis: x_values}, metric)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def cached_simulation(params, n_paths, horizon_days, lead_time_std):
+    from eoq_simulation import simulate_policy
+
+    i = dict(zip(INPUT_COLUMNS, params))
+    r = cached_results(params)
+    return simulate_policy(
+        order_qty=r['eoq'],
+        reorder_point=r['reorder_point'],
+        daily_demand=r['daily_demand'],
+        daily_std_dev=r['daily_std_dev'],
+        lead_time_days=i['lead_time_days'],
+        holding_cost_per_unit=r['holding_cost_per_unit'],
+        order_cost=i['order_cost'],
+        lead_time_std=lead_time_std,
+        n_paths=n_paths,
+        horizon_days=horizon_days,
+        rng=SIMULATION_SEED,
+    )
+
+
+@st.cache_data(max_entries=RESULTS_CACHE_SIZE, show_spinner=False)
+def cached_scenarios_table(params):
+    import pandas as pd
+
+    from eoq_charts import AGGRESSIVE_SERVICE_LEVEL, CONSERVATIVE_SERVICE_LEVEL, scenario_safety_stocks
+
+    inputs = dict(zip(INPUT_COLUMNS, params))
+    results = cached_results(params)
+    safety = scenario_safety_stocks(results['safety_stock'], results['lead_time_demand_std'])
+    avg_inventory = {name: (results['eoq'] / 2) + ss for name, ss in safety.items()}
+    annual_cost = {
+        name: results['total_order_cost_annual'] + inv * results['holding_cost_per_unit']
+        for name, inv in avg_inventory.items()
+    }
+    order = ['Conservative', 'Current', 'Aggressive']
+
+    # Numbers stay numeric; SCENARIO_COLUMN_CONFIG formats them for display
+    return pd.DataFrame({
+        'Scenario': order,
+        'Service Level': [float(CONSERVATIVE_SERVICE_LEVEL), inputs['service_level'], float(AGGRESSIVE_SERVICE_LEVEL)],
+        'Safety Stock': [float(safety[name]) for name in order],
+        'Avg Inventory': [float(avg_inventory[name]) for name in order],
+        'Annual Cost': [float(annual_cost[name]) for name in order],
+    })
+
+
+# Inputs and every engine metric of the current SKU, one typed row
+@st.cache_data(max_entries=RESULTS_CACHE_SIZE, show_spinner=False)
+def cached_export(params, file_format):
+    import pandas as pd
+
+    from eoq_export import export_bytes
+
+    r = cached_results(params)
+    row = {**dict(zip(INPUT_COLUMNS, params)), **{name: r[name] for name in METRIC_COLUMNS}}
+    return export_bytes([pd.DataFrame({name: [float(value)] for name, value in row.items()})], file_format)
+
+
+@st.cache_data(max_entries=RESULTS_CACHE_SIZE, show_spinner=False)
+def cached_capital_plan(params, capital_limit):
+    from eoq_constrained import constrained_eoq
+
+    i = dict(zip(INPUT_COLUMNS, params))
+    r = cached_results(params)
+    plan = constrained_eoq(i['annual_demand'], i['order_cost'], r['holding_cost_per_unit'], i['unit_cost'],
+                           capital_limit, safety_stock=r['safety_stock'])
+    order_qty = float(plan['order_qty'][0])
+    return {
+        'order_qty': order_qty,
+        'average_inventory': order_qty / 2 + r['safety_stock'],
+        'days_between_orders': DAYS_PER_YEAR * order_qty / i['annual_demand'],
+        'total_cost_annual': float(plan['total_cost_annual'][0]),
+        'shadow_price': plan['shadow_price'],
+    }
+
+
+@st.cache_data(max_entries=RESULTS_CACHE_SIZE, show_spinner=False)
+def cached_price_breaks(params, breaks, prices, kind):
+    from eoq_discounts import price_break_cost, solve_price_breaks
+
+    i = dict(zip(INPUT_COLUMNS, params))
+    r = cached_results(params)
+    solution = solve_price_breaks(i['annual_demand'], i['order_cost'], i['holding_cost_pct'],
+                                  breaks, prices, kind, r['safety_stock'])
+    # Below the first break nothing can be bought, so the EOQ is raised to it
+    eoq_qty = max(r['eoq'], breaks[0])
+    cost_at_eoq = price_break_cost(eoq_qty, i['annual_demand'], i['order_cost'], i['holding_cost_pct'],
+                                   breaks, prices, kind, r['safety_stock'])
+    return {name: float(value) for name, value in solution.items()}, float(cost_at_eoq), float(eoq_qty)
+
+
+@st.cache_resource(max_entries=FIGURE_CACHE_SIZE, show_spinner=False)
+def cached_price_break_figure(params, breaks, prices, kind):
+    from eoq_charts import price_break_figure
+
+    i = dict(zip(INPUT_COLUMNS, params))
+    r = cached_results(params)
+    solution = cached_price_breaks(params, breaks, prices, kind)[0]
+    with timed("build:price_breaks"):
+        return price_break_figure(i['annual_demand'], i['order_cost'], i['holding_cost_pct'], r['safety_stock'],
+                                  breaks, prices, kind, r['eoq'], solution['order_qty'])
+
+
+# Shared and never mutated, like the figures; a history table can have a row
+# per SKU of the whole assortment
+@st.cache_resource(max_entries=4, show_spinner="Reading demand history...")
+def cached_history(file_id, name, _source):
+    from eoq_batch import detect_format
+    from eoq_history import read_history
+
+    return read_history(_source, detect_format(name))
+
+
+# Lot sizing plans day by day, like the engine's constant daily demand, with
+# each month's seasonal index applied to its days (non-leap year)
+@st.cache_data(max_entries=RESULTS_CACHE_SIZE, show_spinner=False)
+def cached_lot_sizing(params, seasonality):
+    import numpy as np
+
+    from eoq_lotsizing import LOT_SIZING_METHODS
+
+    i = dict(zip(INPUT_COLUMNS, params))
+    r = cached_results(params)
+    month_days = calendar.mdays[1:]
+    month = np.repeat(np.arange(12), month_days)
+    weights = np.asarray(seasonality)[month]
+    demand = i['annual_demand'] * weights / weights.sum()
+    holding_per_day = r['holding_cost_per_unit'] / len(demand)
+
+    plans = {name: method(demand, i['order_cost'], holding_per_day) for name, method in LOT_SIZING_METHODS.items()}
+
+    orders = plans['wagner_whitin']['orders']
+    order_counts = np.bincount(month, weights=orders > 0, minlength=12)
+    with np.errstate(invalid='ignore'):
+        order_qty = np.bincount(month, weights=orders, minlength=12) / order_counts
+    return {
+        'demand': tuple(np.bincount(month, weights=demand, minlength=12)),
+        'order_qty': tuple(order_qty),
+        'orders': tuple(order_counts.astype(int).tolist()),
+        'total_cost': {name: float(plan['total_cost']) for name, plan in plans.items()},
+    }
+
+
+@st.cache_resource(max_entries=FIGURE_CACHE_SIZE, show_spinner=False)
+def cached_monthly_figure(params, seasonality):
+    from eoq_charts import monthly_demand_figure
+
+    plan = cached_lot_sizing(params, seasonality)
+    with timed("build:monthly_demand"):
+        return monthly_demand_figure(plan['demand'], plan['order_qty'], plan['orders'],
+                                     cached_results(params)['eoq'])
+
 
 # Page config
 st.set_page_config(
@@ -17,213 +250,11 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Dark theme CSS - matching stock peer analysis style
-st.markdown("""
-    <style>
-    /* Dark theme - matching reference */
-    .main {
-        background-color: #0E1117;
-    }
-    
-    .block-container {
-        padding-top: 2rem;
-        padding-bottom: 2rem;
-    }
-    
-    /* Headers - white text */
-    h1, h2, h3 {
-        color: #FFFFFF !important;
-        font-weight: 600 !important;
-    }
-    
-    h1 {
-        font-size: 28px !important;
-        margin-bottom: 0.5rem !important;
-    }
-    
-    h2 {
-        font-size: 18px !important;
-        margin-top: 2rem !important;
-        margin-bottom: 1.5rem !important;
-    }
-    
-    /* Subtitle text */
-    .subtitle {
-        color: #A0AEC0;
-        font-size: 14px;
-        margin-bottom: 2rem;
-    }
-    
-    /* Metric cards - dark theme */
-    [data-testid="stMetric"] {
-        background-color: #1A202C;
-        padding: 1.2rem;
-        border-radius: 8px;
-        border: 1px solid #2D3748;
-    }
-    
-    [data-testid="stMetricLabel"] {
-        color: ##FFFFFF !important;
-        font-size: 12px !important;
-        font-weight: 500 !important;
-        text-transform: uppercase;
-    }
-    
-    [data-testid="stMetricValue"] {
-        color: #FFFFFF !important;
-        font-size: 28px !important;
-        font-weight: 700 !important;
-    }
-    
-    /* Captions */
-    .stCaptionContainer p, [data-testid="stCaptionContainer"] p {
-        color: #718096 !important;
-        font-size: 12px !important;
-    }
-    
-    /* Sidebar - dark */
-    section[data-testid="stSidebar"] {
-        background-color: #1A202C;
-    }
-    
-    section[data-testid="stSidebar"] > div {
-        background-color: #1A202C;
-    }
-    
-    /* Sidebar text - white/light gray */
-    section[data-testid="stSidebar"] h2 {
-        color: #FFFFFF !important;
-        font-size: 16px !important;
-        margin-bottom: 1.5rem !important;
-        padding-bottom: 0.5rem !important;
-        border-bottom: 1px solid #2D3748 !important;
-    }
-    
-    section[data-testid="stSidebar"] h3 {
-        color: #E2E8F0 !important;
-        font-size: 14px !important;
-        margin-top: 1.5rem !important;
-        margin-bottom: 1rem !important;
-    }
-    
-    section[data-testid="stSidebar"] label {
-        color: #E2E8F0 !important;
-        font-weight: 500 !important;
-        font-size: 13px !important;
-    }
-    
-    section[data-testid="stSidebar"] input {
-        background-color: #2D3748 !important;
-        color: #FFFFFF !important;
-        border: 1px solid #4A5568 !important;
-    }
-    
-    section[data-testid="stSidebar"] [data-baseweb="slider"] {
-        margin-top: 0.5rem !important;
-    }
-    
-    /* Pills/badges - like stock tickers */
-    .metric-pill {
-        display: inline-block;
-        background-color: #2B6CB0;
-        color: white;
-        padding: 0.4rem 0.9rem;
-        border-radius: 16px;
-        font-size: 12px;
-        font-weight: 600;
-        margin: 0.25rem;
-    }
-    
-    .info-pill {
-        display: inline-block;
-        background-color: #2D3748;
-        color: #A0AEC0;
-        padding: 0.4rem 0.8rem;
-        border-radius: 4px;
-        font-size: 12px;
-        font-weight: 500;
-        margin: 0.25rem;
-    }
-    
-    /* Info/Success boxes - dark theme */
-    .stAlert {
-        background-color: #1A365D !important;
-        border-left: 4px solid #3182CE !important;
-        border-radius: 6px !important;
-    }
-    
-    [data-baseweb="notification"] p {
-        color: #90CDF4 !important;
-    }
-    
-    .element-container div[kind="success"] {
-        background-color: #1C4532 !important;
-        border-left: 4px solid #38A169 !important;
-    }
-    
-    .element-container div[kind="success"] p {
-        color: #9AE6B4 !important;
-    }
-    
-    /* Tables - dark theme */
-    .dataframe {
-        background-color: #1A202C !important;
-        color: #E2E8F0 !important;
-    }
-    
-    .dataframe th {
-        background-color: #2D3748 !important;
-        color: #E2E8F0 !important;
-        font-weight: 600 !important;
-    }
-    
-    .dataframe td {
-        background-color: #1A202C !important;
-        color: #E2E8F0 !important;
-        border-bottom: 1px solid #2D3748 !important;
-    }
-    
-    .dataframe tr:hover td {
-        background-color: #2D3748 !important;
-    }
-    
-    /* Buttons - dark theme */
-    .stButton > button {
-        background-color: #3182CE !important;
-        color: white !important;
-        border: none !important;
-        border-radius: 6px !important;
-        font-weight: 600 !important;
-    }
-    
-    .stButton > button:hover {
-        background-color: #2C5282 !important;
-    }
-    
-    .stDownloadButton > button {
-        background-color: #38A169 !important;
-        color: white !important;
-        border: none !important;
-        border-radius: 6px !important;
-        font-weight: 600 !important;
-    }
-    
-    .stDownloadButton > button:hover {
-        background-color: #2F855A !important;
-    }
-    
-    /* Expander - dark theme */
-    .streamlit-expanderHeader {
-        background-color: #1A202C !important;
-        color: #E2E8F0 !important;
-        border: 1px solid #2D3748 !important;
-    }
-    
-    .streamlit-expanderHeader:hover {
-        background-color: #2D3748 !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+debug_mode = st.query_params.get("debug") == "1"
+
+# Theme: colors and fonts come from .streamlit/config.toml; the remaining
+# rules are read once per process and injected as a style-only element
+st.html(f"<style>{theme_css()}</style>")
 
 # Header
 st.markdown("# 📦 EOQ Calculator")
@@ -241,14 +272,37 @@ st.markdown("""
 # Sidebar
 st.sidebar.markdown("## ⚙️ Input Parameters")
 
-st.sidebar.markdown("### 📊 Demand & Costs")
-annual_demand = st.sidebar.number_input(
-    "Annual Demand (units)",
-    min_value=100,
-    max_value=10000000,
-    value=50000,
-    step=1000
+st.sidebar.markdown("### 📈 Demand History")
+uploaded_history = st.sidebar.file_uploader(
+    "Daily sales (CSV or Parquet)",
+    type=['csv', 'parquet'],
+    help="One row per SKU and day with columns sku, date and quantity; days without a row count as zero. "
+         "Annual demand and demand variability are then taken from the history."
 )
+history = history_row = None
+if uploaded_history is not None:
+    try:
+        history = cached_history(uploaded_history.file_id, uploaded_history.name, uploaded_history)
+    except ValueError as exc:
+        st.sidebar.error(f"Could not read demand history: {exc}")
+if history is not None and len(history):
+    history_sku = st.sidebar.selectbox("SKU", history.index)
+    history_row = history.loc[history_sku]
+    st.sidebar.caption(f"{history_row['days']:,} days since {history_row['first_date']:%Y-%m-%d}, "
+                       f"{history_row['mean_daily']:,.1f} ± {history_row['std_daily']:,.1f} units/day")
+
+st.sidebar.markdown("### 📊 Demand & Costs")
+if history_row is None:
+    annual_demand = st.sidebar.number_input(
+        "Annual Demand (units)",
+        min_value=100,
+        max_value=10000000,
+        value=50000,
+        step=1000
+    )
+else:
+    annual_demand = float(history_row['annual_demand'])
+    st.sidebar.metric("Annual Demand (units)", f"{annual_demand:,.0f}")
 
 unit_cost = st.sidebar.number_input(
     "Unit Cost (€)",
@@ -286,18 +340,34 @@ lead_time_days = st.sidebar.number_input(
 
 service_level = st.sidebar.slider(
     "Service Level (%)",
-    min_value=85,
-    max_value=99,
-    value=95,
-    step=1
+    min_value=85.0,
+    max_value=99.9,
+    value=95.0,
+    step=0.1,
+    format="%.1f"
 )
 
-demand_variability = st.sidebar.slider(
-    "Demand Variability (%)",
-    min_value=5,
-    max_value=50,
-    value=20,
-    step=5
+if history_row is None:
+    demand_variability = st.sidebar.slider(
+        "Demand Variability (%)",
+        min_value=5,
+        max_value=50,
+        value=20,
+        step=5
+    )
+else:
+    demand_variability = float(history_row['demand_variability'])
+    st.sidebar.metric("Demand Variability (%)", f"{demand_variability:.1f}")
+
+st.sidebar.markdown("### 🏭 Constraints")
+
+capital_limit = st.sidebar.number_input(
+    "Inventory Capital Limit (€)",
+    min_value=0.0,
+    max_value=1000000000.0,
+    value=0.0,
+    step=1000.0,
+    help="Cap on the average inventory value, cycle plus safety stock. 0 means no limit."
 )
 
 st.sidebar.markdown("---")
@@ -311,29 +381,39 @@ st.sidebar.markdown("""
 """, unsafe_allow_html=True)
 
 # Calculations
-holding_cost_per_unit = unit_cost * (holding_cost_pct / 100)
-eoq = np.sqrt((2 * annual_demand * order_cost) / holding_cost_per_unit)
-daily_demand = annual_demand / 365
-
-z_scores = {
-    85: 1.04, 86: 1.08, 87: 1.13, 88: 1.17, 89: 1.23,
-    90: 1.28, 91: 1.34, 92: 1.41, 93: 1.48, 94: 1.55,
-    95: 1.65, 96: 1.75, 97: 1.88, 98: 2.05, 99: 2.33
+inputs = {
+    'annual_demand': annual_demand,
+    'unit_cost': unit_cost,
+    'order_cost': order_cost,
+    'holding_cost_pct': holding_cost_pct,
+    'lead_time_days': lead_time_days,
+    'service_level': service_level,
+    'demand_variability': demand_variability,
 }
-z_score = z_scores[service_level]
-
-daily_std_dev = daily_demand * (demand_variability / 100)
-lead_time_demand_std = daily_std_dev * np.sqrt(lead_time_days)
-safety_stock = z_score * lead_time_demand_std
-average_lead_time_demand = daily_demand * lead_time_days
-reorder_point = average_lead_time_demand + safety_stock
-
-orders_per_year = annual_demand / eoq
-days_between_orders = 365 / orders_per_year
-total_order_cost_annual = orders_per_year * order_cost
-average_inventory = (eoq / 2) + safety_stock
-total_holding_cost_annual = average_inventory * holding_cost_per_unit
-total_inventory_cost_annual = total_order_cost_annual + total_holding_cost_annual
+params = normalize_inputs(inputs)
+with timed("calculations"):
+    results = cached_results(params)
+
+capital_plan = None
+if capital_limit > 0:
+    try:
+        capital_plan = cached_capital_plan(params, capital_limit)
+    except ValueError as exc:
+        st.warning(f"Capital limit ignored: {exc}")
+
+eoq = results['eoq']
+safety_stock = results['safety_stock']
+reorder_point = results['reorder_point']
+orders_per_year = results['orders_per_year']
+days_between_orders = results['days_between_orders']
+total_order_cost_annual = results['total_order_cost_annual']
+average_inventory = results['average_inventory']
+total_holding_cost_annual = results['total_holding_cost_annual']
+total_inventory_cost_annual = results['total_inventory_cost_annual']
+# A binding capital limit changes the order quantity, and with it the inventory and cycle
+if capital_plan and capital_plan['shadow_price'] > 0:
+    average_inventory = capital_plan['average_inventory']
+    days_between_orders = capital_plan['days_between_orders']
 
 # Key metrics
 st.markdown("## 📈 Key Metrics")
@@ -359,11 +439,20 @@ with col4:
 st.markdown("")
 
 # Business impact
-col_b1, col_b2, col_b3 = st.columns(3)
+if capital_plan:
+    col_b1, col_b2, col_b3, col_b4 = st.columns(4)
+else:
+    col_b1, col_b2, col_b3 = st.columns(3)
 
 with col_b1:
-    st.metric("Total Annual Cost", f"€{total_inventory_cost_annual:,.0f}")
-    st.caption("ordering + holding")
+    if capital_plan and capital_plan['shadow_price'] > 0:
+        st.metric("Total Annual Cost", f"€{capital_plan['total_cost_annual']:,.0f}",
+                  delta=f"€{capital_plan['total_cost_annual'] - total_inventory_cost_annual:,.0f} from limit",
+                  delta_color="inverse")
+        st.caption(f"ordering + holding at {capital_plan['order_qty']:,.0f} units per order")
+    else:
+        st.metric("Total Annual Cost", f"€{total_inventory_cost_annual:,.0f}")
+        st.caption("ordering + holding")
 
 with col_b2:
     st.metric("Avg Inventory", f"{average_inventory:,.0f}")
@@ -373,305 +462,157 @@ with col_b3:
     st.metric("Order Cycle", f"{days_between_orders:.0f}")
     st.caption("days between orders")
 
+if capital_plan:
+    with col_b4:
+        st.metric("Capital Shadow Price", f"€{capital_plan['shadow_price']:.3f}")
+        st.caption("saved per year per extra € of limit")
+
+# Recorded on every run, not just with ?debug=1: the first run of a fresh
+# process is the cold start, and it can't be reproduced later
+stage_recorder().record("time_to_first_metric", time.perf_counter() - RUN_STARTED)
+
 st.markdown("")
 
 # Main chart - Inventory simulation with multiple scenarios
 st.markdown("## 📊 Inventory Level Analysis")
 
-time_points = np.linspace(0, 3 * days_between_orders, 200)
-
-# Create data for current scenario and alternatives
-scenarios = {
-    'Current': {'safety': safety_stock, 'color': '#3B82F6'},  # Blue
-    'Conservative': {'safety': z_scores[99] * lead_time_demand_std, 'color': '#10B981'},  # Green
-    'Aggressive': {'safety': z_scores[90] * lead_time_demand_std, 'color': '#F59E0B'},  # Yellow
-}
-
-fig_main = go.Figure()
-
-for scenario_name, scenario_data in scenarios.items():
-    inventory_levels = []
-    scenario_safety = scenario_data['safety']
-    scenario_reorder = average_lead_time_demand + scenario_safety
-    
-    for t in time_points:
-        days_in_cycle = t % days_between_orders
-        if days_in_cycle < lead_time_days:
-            inventory = eoq + scenario_safety - (daily_demand * (days_between_orders - lead_time_days + days_in_cycle))
-        else:
-            inventory = eoq + scenario_safety - (daily_demand * (days_in_cycle - lead_time_days))
-        inventory_levels.append(max(scenario_safety, inventory))
-    
-    fig_main.add_trace(go.Scatter(
-        x=time_points,
-        y=inventory_levels,
-        mode='lines',
-        name=scenario_name,
-        line=dict(color=scenario_data['color'], width=2),
-        hovertemplate='%{y:,.0f} units<extra></extra>'
-    ))
-
-# Add reorder point line
-fig_main.add_hline(
-    y=reorder_point,
-    line_dash="dash",
-    line_color="#EF4444",
-    line_width=1.5,
-    annotation_text="Reorder Point",
-    annotation_position="right",
-    annotation=dict(font=dict(size=11, color='#EF4444'))
-)
-
-fig_main.update_layout(
-    height=400,
-    plot_bgcolor='#0E1117',
-    paper_bgcolor='#0E1117',
-    font=dict(size=12, color='#E2E8F0'),
-    xaxis=dict(
-        showgrid=True,
-        gridcolor='#2D3748',
-        gridwidth=0.5,
-        title='Days',
-        title_font=dict(color='#A0AEC0')
-    ),
-    yaxis=dict(
-        showgrid=True,
-        gridcolor='#2D3748',
-        gridwidth=0.5,
-        title='Inventory (units)',
-        title_font=dict(color='#A0AEC0')
-    ),
-    legend=dict(
-        orientation="h",
-        yanchor="bottom",
-        y=1.02,
-        xanchor="right",
-        x=1,
-        font=dict(color='#E2E8F0')
-    ),
-    margin=dict(l=60, r=40, t=60, b=60),
-    hovermode='x unified'
-)
-
-st.plotly_chart(fig_main, use_container_width=True, config={'displayModeBar': False})
+values = {**inputs, **results}
+render_figure('inventory_levels', values)
 
 st.markdown("")
 
-# Grid of smaller charts - 2x2 layout
+# Detailed analysis - tabs in a fragment, so switching tabs reruns only this
+# section and only the open tab builds its chart
 st.markdown("## 📊 Detailed Analysis")
 
-col_c1, col_c2 = st.columns(2)
-
-with col_c1:
-    st.markdown("**Cost Breakdown**")
-    
-    fig_costs = go.Figure()
-    
-    categories = ['Ordering', 'Holding']
-    values = [total_order_cost_annual, total_holding_cost_annual]
-    colors = ['#3B82F6', '#10B981']
-    
-    fig_costs.add_trace(go.Bar(
-        x=categories,
-        y=values,
-        marker=dict(color=colors),
-        text=[f'€{v:,.0f}' for v in values],
-        textposition='inside',
-        textfont=dict(color='white', size=14),
-        hovertemplate='%{x}: €%{y:,.0f}<extra></extra>'
-    ))
-    
-    fig_costs.update_layout(
-        height=300,
-        plot_bgcolor='#0E1117',
-        paper_bgcolor='#0E1117',
-        font=dict(size=12, color='#E2E8F0'),
-        xaxis=dict(showgrid=False),
-        yaxis=dict(
-            showgrid=True,
-            gridcolor='#2D3748',
-            gridwidth=0.5,
-            title='Cost (€)',
-            title_font=dict(color='#A0AEC0')
-        ),
-        margin=dict(l=60, r=20, t=20, b=40),
-        showlegend=False
-    )
-    
-    st.plotly_chart(fig_costs, use_container_width=True, config={'displayModeBar': False})
-
-with col_c2:
-    st.markdown("**Cost Impact by Service Level**")
-    
-    service_levels = [85, 90, 95, 99]
-    costs = []
-    
-    for sl in service_levels:
-        z = z_scores[sl]
-        ss = z * lead_time_demand_std
-        avg_inv = (eoq / 2) + ss
-        total_cost = total_order_cost_annual + (avg_inv * holding_cost_per_unit)
-        costs.append(total_cost)
-    
-    fig_service = go.Figure()
-    
-    fig_service.add_trace(go.Scatter(
-        x=service_levels,
-        y=costs,
-        mode='lines+markers',
-        line=dict(color='#F59E0B', width=3),
-        marker=dict(size=8, color='#F59E0B'),
-        hovertemplate='%{x}%: €%{y:,.0f}<extra></extra>'
-    ))
-    
-    fig_service.update_layout(
-        height=300,
-        plot_bgcolor='#0E1117',
-        paper_bgcolor='#0E1117',
-        font=dict(size=12, color='#E2E8F0'),
-        xaxis=dict(
-            showgrid=True,
-            gridcolor='#2D3748',
-            gridwidth=0.5,
-            title='Service Level (%)',
-            title_font=dict(color='#A0AEC0')
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridcolor='#2D3748',
-            gridwidth=0.5,
-            title='Total Cost (€)',
-            title_font=dict(color='#A0AEC0')
-        ),
-        margin=dict(l=60, r=20, t=20, b=40),
-        showlegend=False
-    )
-    
-    st.plotly_chart(fig_service, use_container_width=True, config={'displayModeBar': False})
-
-st.markdown("")
-
-col_c3, col_c4 = st.columns(2)
+DETAIL_TABS = {
+    "Cost Breakdown": 'cost_breakdown',
+    "Cost Impact by Service Level": 'service_level_cost',
+    "Order Quantity Impact": 'order_quantity',
+    "Monthly Demand Pattern": 'monthly_demand',
+}
 
-with col_c3:
-    st.markdown("**Order Quantity Impact**")
-    
-    # Show different order quantities
-    order_qtys = np.linspace(eoq * 0.5, eoq * 1.5, 50)
-    total_costs = []
-    
-    for qty in order_qtys:
-        orders = annual_demand / qty
-        order_cost_total = orders * order_cost
-        avg_inv = (qty / 2) + safety_stock
-        holding_cost_total = avg_inv * holding_cost_per_unit
-        total_costs.append(order_cost_total + holding_cost_total)
-    
-    fig_qty = go.Figure()
-    
-    # Total cost curve
-    fig_qty.add_trace(go.Scatter(
-        x=order_qtys,
-        y=total_costs,
-        mode='lines',
-        name='Total Cost',
-        line=dict(color='#8B5CF6', width=3),
-        fill='tozeroy',
-        fillcolor='rgba(139, 92, 246, 0.1)',
-        hovertemplate='Qty: %{x:,.0f}<br>Cost: €%{y:,.0f}<extra></extra>'
-    ))
-    
-    # Optimal point
-    fig_qty.add_vline(
-        x=eoq,
-        line_dash="dash",
-        line_color='#3B82F6',
-        line_width=2,
-        annotation_text=f"EOQ: {eoq:,.0f}",
-        annotation_position="top",
-        annotation=dict(font=dict(size=11, color='#3B82F6'))
-    )
-    
-    fig_qty.update_layout(
-        height=300,
-        plot_bgcolor='#0E1117',
-        paper_bgcolor='#0E1117',
-        font=dict(size=12, color='#E2E8F0'),
-        xaxis=dict(
-            showgrid=True,
-            gridcolor='#2D3748',
-            gridwidth=0.5,
-            title='Order Quantity',
-            title_font=dict(color='#A0AEC0')
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridcolor='#2D3748',
-            gridwidth=0.5,
-            title='Total Cost (€)',
-            title_font=dict(color='#A0AEC0')
-        ),
-        margin=dict(l=60, r=20, t=20, b=40),
-        showlegend=False
-    )
-    
-    st.plotly_chart(fig_qty, use_container_width=True, config={'displayModeBar': False})
 
-with col_c4:
-    st.markdown("**Monthly Demand Pattern**")
-    
-    # Simulate monthly demand with variability
-    months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-    monthly_avg = annual_demand / 12
-    np.random.seed(42)
-    monthly_demand = monthly_avg + np.random.normal(0, monthly_avg * (demand_variability/100), 12)
-    monthly_demand = np.maximum(monthly_demand, 0)
-    
-    fig_monthly = go.Figure()
-    
-    fig_monthly.add_trace(go.Bar(
-        x=months,
-        y=monthly_demand,
-        marker=dict(
-            color=monthly_demand,
-            colorscale='Viridis',
-            showscale=False
-        ),
-        hovertemplate='%{x}: %{y:,.0f} units<extra></extra>'
-    ))
-    
-    # Average line
-    fig_monthly.add_hline(
-        y=monthly_avg,
-        line_dash="dash",
-        line_color='#EF4444',
-        line_width=1.5,
-        annotation_text=f"Avg: {monthly_avg:,.0f}",
-        annotation_position="right",
-        annotation=dict(font=dict(size=10, color='#EF4444'))
-    )
-    
-    fig_monthly.update_layout(
-        height=300,
-        plot_bgcolor='#0E1117',
-        paper_bgcolor='#0E1117',
-        font=dict(size=12, color='#E2E8F0'),
-        xaxis=dict(
-            showgrid=False,
-            title=None
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridcolor='#2D3748',
-            gridwidth=0.5,
-            title='Demand (units)',
-            title_font=dict(color='#A0AEC0')
-        ),
-        margin=dict(l=60, r=20, t=20, b=40),
-        showlegend=False
-    )
-    
-    st.plotly_chart(fig_monthly, use_container_width=True, config={'displayModeBar': False})
+PRICING_KINDS = {
+    "Single price": None,
+    "All-units discounts": 'all_units',
+    "Incremental discounts": 'incremental',
+}
+# Price breaks as discounts off the sidebar unit cost
+DEFAULT_PRICE_BREAKS = [
+    {'min_qty': 0, 'discount_pct': 0.0},
+    {'min_qty': 2000, 'discount_pct': 3.0},
+    {'min_qty': 5000, 'discount_pct': 5.0},
+]
+
+
+def order_quantity_tab(values):
+    pricing = st.radio("Supplier pricing", list(PRICING_KINDS), horizontal=True)
+    kind = PRICING_KINDS[pricing]
+    if kind is None:
+        render_figure('order_quantity', values)
+        return
+
+    col_p1, col_p2 = st.columns([1, 2])
+    with col_p1:
+        rows = st.data_editor(
+            DEFAULT_PRICE_BREAKS,
+            num_rows="dynamic",
+            hide_index=True,
+            key='price_breaks',
+            column_config={
+                'min_qty': st.column_config.NumberColumn("Min Qty", min_value=0, step=1, format="%d"),
+                'discount_pct': st.column_config.NumberColumn("Discount (%)", min_value=0.0, max_value=99.0,
+                                                              step=0.5, format="%.1f"),
+            }
+        )
+
+    tiers = sorted((row['min_qty'], row['discount_pct']) for row in rows
+                   if row.get('min_qty') is not None and row.get('discount_pct') is not None)
+    breaks = tuple(float(qty) for qty, _ in tiers)
+    prices = tuple(round(values['unit_cost'] * (1 - pct / 100), 6) for _, pct in tiers)
+    params = normalize_inputs(values)
+    try:
+        solution, cost_at_eoq, eoq_qty = cached_price_breaks(params, breaks, prices, kind)
+    except ValueError as exc:
+        col_p2.error(f"Invalid price breaks: {exc}")
+        return
+
+    with col_p2:
+        st.metric("Best Order Quantity", f"{solution['order_qty']:,.0f}")
+        st.caption(f"at €{solution['unit_price']:,.2f} per unit on average")
+        st.metric("Saving vs EOQ", f"€{cost_at_eoq - solution['total_cost_annual']:,.0f}")
+        caption = f"per year incl. purchasing, total €{solution['total_cost_annual']:,.0f}"
+        if eoq_qty > values['eoq']:
+            caption += f"; the EOQ is below the first break, so it is compared at {eoq_qty:,.0f} units"
+        st.caption(caption)
+
+    fig = cached_price_break_figure(params, breaks, prices, kind)
+    with timed("render:price_breaks"):
+        st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+
+
+LOT_SIZING_LABELS = {
+    'wagner_whitin': "Optimal Plan",
+    'silver_meal': "Silver-Meal",
+    'eoq': "Fixed EOQ",
+}
+# Demand per month relative to an average month
+DEFAULT_SEASONALITY = [{'month': month, 'index': 1.0} for month in calendar.month_abbr[1:]]
+
+
+def monthly_demand_tab(values):
+    col_m1, col_m2 = st.columns([1, 2])
+    with col_m1:
+        rows = st.data_editor(
+            DEFAULT_SEASONALITY,
+            hide_index=True,
+            key='seasonality',
+            height=460,
+            column_config={
+                'month': st.column_config.TextColumn("Month", disabled=True),
+                'index': st.column_config.NumberColumn("Seasonal Index", min_value=0.0, step=0.1,
+                                                       format="%.2f"),
+            }
+        )
+
+    indices = [row['index'] or 0.0 for row in rows]
+    if sum(indices) <= 0:
+        col_m2.error("At least one month needs a positive seasonal index.")
+        return
+    # Scaled to an average of 1, so annual demand stays as set in the sidebar
+    seasonality = tuple(round(index * 12 / sum(indices), 6) for index in indices)
+    params = normalize_inputs(values)
+    costs = cached_lot_sizing(params, seasonality)['total_cost']
+
+    with col_m2:
+        cols = st.columns(len(LOT_SIZING_LABELS))
+        for col, (name, label) in zip(cols, LOT_SIZING_LABELS.items()):
+            delta = round(costs[name] - costs['eoq'])
+            col.metric(label, f"€{costs[name]:,.0f}",
+                       delta=f"€{delta:,.0f} vs EOQ" if name != 'eoq' else None, delta_color="inverse")
+        st.caption("Ordering and cycle stock holding over the year, planned day by day; Fixed EOQ orders "
+                   "on the EOQ cycle. The chart shows the optimal plan's average order size per month.")
+        fig = cached_monthly_figure(params, seasonality)
+        with timed("render:monthly_demand"):
+            st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+
+
+@st.fragment
+def detailed_analysis(values):
+    tabs = st.tabs(list(DETAIL_TABS), key='detail_tab', on_change='rerun')
+    for tab, name in zip(tabs, DETAIL_TABS.values()):
+        if tab.open:
+            with tab:
+                if name == 'order_quantity':
+                    order_quantity_tab(values)
+                elif name == 'monthly_demand':
+                    monthly_demand_tab(values)
+                else:
+                    render_figure(name, values)
+
+
+detailed_analysis(values)
 
 st.markdown("")
 
@@ -701,62 +642,382 @@ st.markdown("")
 # Scenario table
 st.markdown("## 🔄 Scenario Comparison")
 
-scenarios_df = pd.DataFrame({
-    'Scenario': ['Conservative (99%)', f'Current ({service_level}%)', 'Aggressive (90%)'],
-    'Service Level': ['99%', f'{service_level}%', '90%'],
-    'Safety Stock': [
-        f"{z_scores[99] * lead_time_demand_std:,.0f}",
-        f"{safety_stock:,.0f}",
-        f"{z_scores[90] * lead_time_demand_std:,.0f}"
-    ],
-    'Avg Inventory': [
-        f"{(eoq/2) + z_scores[99] * lead_time_demand_std:,.0f}",
-        f"{average_inventory:,.0f}",
-        f"{(eoq/2) + z_scores[90] * lead_time_demand_std:,.0f}"
-    ],
-    'Annual Cost': [
-        f"€{total_order_cost_annual + ((eoq/2) + z_scores[99] * lead_time_demand_std) * holding_cost_per_unit:,.0f}",
-        f"€{total_inventory_cost_annual:,.0f}",
-        f"€{total_order_cost_annual + ((eoq/2) + z_scores[90] * lead_time_demand_std) * holding_cost_per_unit:,.0f}"
-    ]
-})
-
-st.dataframe(scenarios_df, use_container_width=True, hide_index=True)
+SCENARIO_COLUMN_CONFIG = {
+    'Service Level': st.column_config.NumberColumn(format="%g%%"),
+    'Safety Stock': st.column_config.NumberColumn(format="%,.0f"),
+    'Avg Inventory': st.column_config.NumberColumn(format="%,.0f"),
+    'Annual Cost': st.column_config.NumberColumn(format="€%,.0f"),
+}
+
+with timed("scenarios_table"):
+    scenarios_df = cached_scenarios_table(params)
+
+st.dataframe(scenarios_df, use_container_width=True, hide_index=True, column_config=SCENARIO_COLUMN_CONFIG)
+
+st.markdown("")
+
+# Sensitivity analysis
+st.markdown("## 🌡️ Sensitivity Analysis")
+
+INPUT_LABELS = {
+    'annual_demand': "Annual Demand (units)",
+    'unit_cost': "Unit Cost (€)",
+    'order_cost': "Order Cost (€)",
+    'holding_cost_pct': "Holding Cost (%)",
+    'lead_time_days': "Lead Time (days)",
+    'service_level': "Service Level (%)",
+    'demand_variability': "Demand Variability (%)",
+}
+SWEEP_METRICS = {
+    "Total Annual Cost (€)": 'total_inventory_cost_annual',
+    "Safety Stock (units)": 'safety_stock',
+    "Reorder Point (units)": 'reorder_point',
+    "EOQ (units)": 'eoq',
+}
+
+
+@st.fragment
+def sensitivity_analysis(params):
+    from eoq_charts import sensitivity_heatmap_figure
+
+    col_h1, col_h2, col_h3 = st.columns(3)
+    with col_h1:
+        x_axis = st.selectbox("X axis", list(INPUT_LABELS), index=4, format_func=INPUT_LABELS.get)
+    with col_h2:
+        y_axis = st.selectbox("Y axis", [col for col in INPUT_LABELS if col != x_axis],
+                              index=4, format_func=INPUT_LABELS.get)
+    with col_h3:
+        metric_label = st.selectbox("Metric", list(SWEEP_METRICS))
+
+    x_values, y_values, z = cached_sweep(params, y_axis, x_axis, SWEEP_METRICS[metric_label])
+    fig_heat = sensitivity_heatmap_figure(x_values, y_values, z, INPUT_LABELS[x_axis],
+                                          INPUT_LABELS[y_axis], metric_label)
+    with timed("render:sensitivity_heatmap"):
+        st.plotly_chart(fig_heat, use_container_width=True, config={'displayModeBar': False})
+
+
+sensitivity_analysis(params)
+
+st.markdown("")
+
+# Monte Carlo simulation
+st.markdown("## 🎲 Monte Carlo Simulation")
+st.caption("Daily demand paths under the current policy: order EOQ units when stock on hand plus on order reaches the reorder point.")
+
+
+@st.fragment
+def monte_carlo(params):
+    from eoq_charts import simulation_cost_figure
+    from eoq_simulation import summarize
+
+    col_s1, col_s2, col_s3 = st.columns(3)
+    with col_s1:
+        n_paths = st.select_slider("Paths", options=[1000, 5000, 10000, 20000, 50000], value=10000)
+    with col_s2:
+        horizon_days = st.select_slider("Horizon (days)", options=[90, 180, 365, 730], value=365)
+    with col_s3:
+        lead_time_std = st.number_input("Lead Time Std Dev (days)", min_value=0.0, max_value=30.0, value=0.0, step=0.5)
+
+    if not st.button("▶️ Run Simulation"):
+        return
+
+    with st.spinner("Simulating..."):
+        sim = cached_simulation(params, n_paths, horizon_days, lead_time_std)
+    summary = summarize(sim)
+    expected_cost = cached_results(params)['total_inventory_cost_annual']
+
+    col_m1, col_m2, col_m3 = st.columns(3)
+    with col_m1:
+        st.metric("Fill Rate", f"{summary['fill_rate']['mean']:.2%}")
+        st.caption(f"5th percentile {summary['fill_rate']['p5']:.2%}")
+    with col_m2:
+        st.metric("Stockout Days", f"{summary['stockout_days']['mean']:.1f}")
+        st.caption(f"per path, 95th percentile {summary['stockout_days']['p95']:.0f}")
+    with col_m3:
+        st.metric("Simulated Annual Cost", f"€{summary['total_cost']['mean']:,.0f}")
+        st.caption(f"p5 €{summary['total_cost']['p5']:,.0f} – p95 €{summary['total_cost']['p95']:,.0f}")
+
+    fig_sim = simulation_cost_figure(sim['total_cost'], expected_cost)
+    with timed("render:simulation_cost"):
+        st.plotly_chart(fig_sim, use_container_width=True, config={'displayModeBar': False})
+
+
+monte_carlo(params)
 
 st.markdown("")
 
 # Export
 st.markdown("## 💾 Export Results")
 
-export_data = pd.DataFrame({
-    'Parameter': [
-        'Annual Demand', 'Unit Cost', 'Order Cost', 'Holding Cost %',
-        'Lead Time', 'Service Level', 'Demand Variability',
-        'EOQ', 'Safety Stock', 'Reorder Point', 'Orders/Year',
-        'Days Between Orders', 'Average Inventory',
-        'Annual Ordering Cost', 'Annual Holding Cost', 'Total Annual Cost'
-    ],
-    'Value': [
-        f"{annual_demand:,.0f} units", f"€{unit_cost:.2f}", f"€{order_cost:.2f}",
-        f"{holding_cost_pct}%", f"{lead_time_days} days", f"{service_level}%", 
-        f"{demand_variability}%", f"{eoq:,.0f} units", f"{safety_stock:,.0f} units",
-        f"{reorder_point:,.0f} units", f"{orders_per_year:.1f}",
-        f"{days_between_orders:.1f} days", f"{average_inventory:,.0f} units",
-        f"€{total_order_cost_annual:,.0f}", f"€{total_holding_cost_annual:,.0f}",
-        f"€{total_inventory_cost_annual:,.0f}"
-    ]
-})
-
-csv = export_data.to_csv(index=False)
+EXPORT_FORMAT_LABELS = {
+    'parquet': "Parquet",
+    'arrow': "Arrow IPC",
+    'csv': "CSV",
+}
+
+export_format = st.radio("Format", list(EXPORT_FORMAT_LABELS), format_func=EXPORT_FORMAT_LABELS.get,
+                         horizontal=True, key='export_format',
+                         help="Unformatted numbers in every format; Parquet and Arrow keep the column types")
+extension, mime = EXPORT_FORMATS[export_format]
+with timed("export"):
+    export = cached_export(params, export_format)
 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
 st.download_button(
-    "📥 Download CSV",
-    data=csv,
-    file_name=f"eoq_results_{timestamp}.csv",
-    mime="text/csv"
+    f"📥 Download {EXPORT_FORMAT_LABELS[export_format]}",
+    data=export,
+    file_name=f"eoq_results_{timestamp}{extension}",
+    mime=mime
 )
 
+st.markdown("")
+
+# Bulk upload
+st.markdown("## 📂 Bulk SKU Upload")
+st.caption(
+    "One row per SKU with columns " + ", ".join(INPUT_COLUMNS)
+    + ". Missing columns use the sidebar values. With supplier and major_order_cost columns, SKUs of"
+    " the same supplier are also planned for joint replenishment, with order_cost as the cost per line."
+    " With a demand history loaded and a sku column, annual_demand and demand_variability come from the"
+    " history."
+)
+
+JOINT_COLUMNS = ('supplier', 'annual_demand', 'holding_cost_per_unit', 'major_order_cost', 'order_cost',
+                 'safety_stock')
+
+
+def bulk_export_path(path, file_format):
+    """Where the spooled bulk results are kept converted to another format."""
+    return path if file_format == 'arrow' else f"{path}{EXPORT_FORMATS[file_format][0]}"
+
+
+def bulk_export(path, file_format):
+    """
+    The spooled bulk results as an open file of the chosen format. Conversion
+    streams chunk by chunk to a file next to the spool, once per format.
+    """
+    import pyarrow as pa
+
+    from eoq_batch import read_sku_chunks
+    from eoq_export import ResultWriter
+
+    export_path = bulk_export_path(path, file_format)
+    if not os.path.exists(export_path):
+        # The spool's schema also covers a master without rows
+        with pa.memory_map(path) as source:
+            schema = pa.ipc.open_file(source).schema
+        partial = f"{export_path}.part"
+        with ResultWriter(partial, file_format, schema) as writer:
+            for chunk in read_sku_chunks(path, 'arrow'):
+                writer.write(chunk)
+        os.replace(partial, export_path)
+    return open(export_path, 'rb')
+
+
+def bulk_spool_dir():
+    """
+    This session's directory for spooled bulk results. The session state
+    holds the only reference, so the directory and everything in it is
+    removed when the session ends (or at the latest when the server exits).
+    """
+    if 'bulk_spool_dir' not in st.session_state:
+        st.session_state['bulk_spool_dir'] = tempfile.TemporaryDirectory(prefix='eoq_bulk_')
+    return st.session_state['bulk_spool_dir'].name
+
+
+def remove_bulk_results(path):
+    """Delete a spooled results file and its converted exports."""
+    for file_format in EXPORT_FORMATS:
+        export_path = bulk_export_path(path, file_format)
+        if os.path.exists(export_path):
+            os.remove(export_path)
+
+
+# Pages are read from the spooled results file: sorting and filtering happen
+# here, and only the visible rows are sent to the browser
+@st.cache_data(max_entries=RESULTS_CACHE_SIZE, show_spinner=False)
+def cached_results_page(path, sort_by, descending, filters, offset, limit):
+    from eoq_browser import ResultsBrowser
+
+    return ResultsBrowser(path).page(sort_by, descending, filters, offset, limit)
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def cached_distinct(path, column):
+    from eoq_browser import ResultsBrowser
+
+    return ResultsBrowser(path).distinct(column)
+
+
+BROWSER_PAGE_SIZES = (25, 100, 500)
+BROWSER_COLUMN_CONFIG = {
+    'annual_demand': st.column_config.NumberColumn("Annual Demand", format="%,.0f"),
+    'unit_cost': st.column_config.NumberColumn("Unit Cost", format="€%.2f"),
+    'eoq': st.column_config.NumberColumn("EOQ", format="%,.0f"),
+    'safety_stock': st.column_config.NumberColumn("Safety Stock", format="%,.0f"),
+    'reorder_point': st.column_config.NumberColumn("Reorder Point", format="%,.0f"),
+    'orders_per_year': st.column_config.NumberColumn("Orders/Year", format="%.1f"),
+    'average_inventory': st.column_config.NumberColumn("Avg Inventory", format="%,.0f"),
+    'total_inventory_cost_annual': st.column_config.NumberColumn("Total Annual Cost", format="€%,.0f"),
+}
+
+
+@st.fragment
+def results_browser(path):
+    from eoq_browser import ResultsBrowser
+
+    names = ResultsBrowser(path).columns
+    columns = [col for col in names if col not in ('sku', 'supplier')]
+    labels = {**INPUT_LABELS, **{col: label for label, col in SWEEP_METRICS.items()}}
+    st.markdown("**Browse results**")
+    col_b1, col_b2, col_b3, col_b4 = st.columns(4)
+    with col_b1:
+        sort_by = st.selectbox("Sort by", columns, index=columns.index('total_inventory_cost_annual'),
+                               format_func=lambda col: labels.get(col, col), key='browse_sort')
+    with col_b2:
+        descending = st.toggle("Largest first", value=True, key='browse_descending')
+    with col_b3:
+        page_size = st.selectbox("Rows per page", BROWSER_PAGE_SIZES, index=1, key='browse_page_size')
+
+    filters = []
+    if 'sku' in names:
+        with col_b4:
+            sku_search = st.text_input("SKU contains", key='browse_sku').strip()
+        if sku_search:
+            filters.append(('sku', 'contains', sku_search))
+    if 'supplier' in names:
+        suppliers = cached_distinct(path, 'supplier')
+        if suppliers is not None:
+            picked = st.multiselect("Suppliers", suppliers, key='browse_suppliers')
+            if picked:
+                filters.append(('supplier', 'in', tuple(picked)))
+    filters = tuple(filters)
+
+    page = st.number_input("Page", min_value=1, value=1, step=1, key='browse_page')
+    rows, matches = cached_results_page(path, sort_by, descending, filters, (page - 1) * page_size, page_size)
+    pages = max(-(-matches // page_size), 1)
+    if page > pages:
+        # Past the end after narrowing the filters: show the last page
+        page = pages
+        rows, matches = cached_results_page(path, sort_by, descending, filters, (page - 1) * page_size, page_size)
+    st.dataframe(rows, use_container_width=True, column_config=BROWSER_COLUMN_CONFIG)
+    first = (page - 1) * page_size
+    st.caption(f"Rows {min(first + 1, matches):,}–{first + len(rows):,} of {matches:,} matching SKUs "
+               f"(page {page:,} of {pages:,})")
+
+
+# Runs as a fragment so uploading and processing don't rerun the rest of the page
+@st.fragment
+def bulk_upload(defaults, timestamp, export_format, history=None):
+    import pandas as pd
+
+    from eoq_batch import count_rows, detect_format, process_chunks, read_sku_chunks
+    from eoq_export import ResultWriter
+    from eoq_history import apply_history
+    from eoq_joint import joint_frame
+
+    uploaded_master = st.file_uploader("SKU master (CSV, Parquet or Arrow)", type=['csv', 'parquet', 'arrow'])
+
+    if uploaded_master is not None and st.button("▶️ Process SKU Master"):
+        file_format = detect_format(uploaded_master.name)
+        total_rows = count_rows(uploaded_master, file_format)
+        uploaded_master.seek(0)
+
+        previous_path = st.session_state.pop('bulk_results_path', None)
+        if previous_path:
+            remove_bulk_results(previous_path)
+        st.session_state.pop('bulk_suppliers', None)
+
+        progress = st.progress(0.0, text="Processing SKU master...")
+        rows_done = 0
+        portfolio_cost = 0.0
+        joint_parts = []
+        # Results are spooled as Arrow IPC and only converted on download
+        with tempfile.NamedTemporaryFile(suffix='.arrow', dir=bulk_spool_dir(), delete=False) as out:
+            pass
+        try:
+            with ResultWriter(out.name, 'arrow') as writer:
+                chunks = read_sku_chunks(uploaded_master, file_format)
+                if history is not None:
+                    chunks = (apply_history(chunk, history, defaults=defaults) if 'sku' in chunk.columns
+                              else chunk for chunk in chunks)
+                for chunk in process_chunks(chunks, defaults):
+                    # Inputs read as integers in one chunk and decimals in the next share one schema
+                    chunk[list(INPUT_COLUMNS)] = chunk[list(INPUT_COLUMNS)].astype('float64')
+                    writer.write(chunk)
+                    rows_done += len(chunk)
+                    portfolio_cost += chunk['total_inventory_cost_annual'].sum()
+                    if set(JOINT_COLUMNS) <= set(chunk.columns):
+                        joint_parts.append(chunk[list(JOINT_COLUMNS)])
+                    if total_rows:
+                        fraction = rows_done / total_rows
+                    else:
+                        fraction = uploaded_master.tell() / max(uploaded_master.size, 1)
+                    progress.progress(min(fraction, 1.0), text=f"Processed {rows_done:,} SKUs")
+        except BaseException as exc:
+            # Also on a stopped rerun or an unexpected error: don't leave a half-written spool
+            remove_bulk_results(out.name)
+            progress.empty()
+            if not isinstance(exc, ValueError):
+                raise
+            st.error(f"Could not process SKU master: {exc}")
+        else:
+            progress.progress(1.0, text=f"Processed {rows_done:,} SKUs")
+            st.session_state['bulk_results_path'] = out.name
+            st.session_state['bulk_summary'] = (rows_done, portfolio_cost)
+            if joint_parts:
+                _, suppliers = joint_frame(pd.concat(joint_parts, ignore_index=True))
+                st.session_state['bulk_suppliers'] = suppliers
+
+    if st.session_state.get('bulk_results_path'):
+        bulk_rows, bulk_cost = st.session_state['bulk_summary']
+        col_u1, col_u2 = st.columns(2)
+        with col_u1:
+            st.metric("SKUs Processed", f"{bulk_rows:,}")
+        with col_u2:
+            st.metric("Portfolio Annual Cost", f"€{bulk_cost:,.0f}")
+
+        bulk_path = st.session_state['bulk_results_path']
+        extension, mime = EXPORT_FORMATS[export_format]
+        st.download_button(
+            f"📥 Download Bulk Results ({EXPORT_FORMAT_LABELS[export_format]})",
+            data=lambda: bulk_export(bulk_path, export_format),
+            file_name=f"eoq_bulk_results_{timestamp}{extension}",
+            mime=mime
+        )
+        st.caption("The download is converted on disk but held in server memory while it is sent. For "
+                   "portfolios of millions of SKUs, `python eoq_cli.py batch` writes the file directly.")
+        results_browser(bulk_path)
+
+    suppliers = st.session_state.get('bulk_suppliers')
+    if suppliers is not None:
+        joint_cost = suppliers['joint_cost_annual'].sum()
+        independent_cost = suppliers['independent_cost_annual'].sum()
+        st.markdown("**Joint replenishment by supplier**")
+        col_j1, col_j2 = st.columns(2)
+        with col_j1:
+            st.metric("Joint Annual Cost", f"€{joint_cost:,.0f}",
+                      delta=f"€{joint_cost - independent_cost:,.0f} vs independent", delta_color="inverse")
+            st.caption("one major order cost per supplier order")
+        with col_j2:
+            st.metric("Independent EOQ Cost", f"€{independent_cost:,.0f}")
+            st.caption("every SKU ordered alone, major + line cost")
+        st.dataframe(
+            suppliers,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                'supplier': "Supplier",
+                'items': st.column_config.NumberColumn("SKUs", format="%d"),
+                'base_cycle_days': st.column_config.NumberColumn("Base Cycle (days)", format="%.1f"),
+                'joint_cost_annual': st.column_config.NumberColumn("Joint Cost (€)", format="%.0f"),
+                'independent_cost_annual': st.column_config.NumberColumn("Independent Cost (€)", format="%.0f"),
+            }
+        )
+
+
+bulk_upload(inputs, timestamp, export_format, history)
+
 # Technical details
 with st.expander("🔧 Technical Details"):
     st.markdown("""
@@ -769,3 +1030,34 @@ with st.expander("🔧 Technical Details"):
     
     **Built by Dennis Schmal** | [GitHub](https://github.com/dschmahl) • [Website](https://dennisschmal.de)
     """)
+
+# Performance debug panel
+if debug_mode:
+    import pandas as pd
+
+    recorder = stage_recorder()
+    recorder.record("rerun_total", time.perf_counter() - RUN_STARTED)
+
+    with st.expander("🐞 Performance Debug", expanded=True):
+        st.caption(f"Rolling p50/p95 over the last {recorder.window} samples per stage, all sessions. "
+                   "Allocations are traced during each stage only and are process-wide: they include "
+                   "other sessions running at the same time, and overlapping stages record none.")
+        st.dataframe(
+            pd.DataFrame(recorder.summary()),
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                'p50_ms': st.column_config.NumberColumn("p50 (ms)", format="%.2f"),
+                'p95_ms': st.column_config.NumberColumn("p95 (ms)", format="%.2f"),
+                'alloc_p95_kib': st.column_config.NumberColumn("p95 alloc (KiB)", format="%.0f"),
+            }
+        )
+
+        col_d1, col_d2 = st.columns(2)
+        with col_d1:
+            if st.button("💾 Dump Timings"):
+                written = recorder.dump(TIMINGS_PATH)
+                st.success(f"Appended {written:,} samples to {os.path.abspath(TIMINGS_PATH)}")
+        with col_d2:
+            if st.button("🗑️ Reset Timings"):
+                recorder.clear()
@@ -0,0 +1,492 @@
+"""
+Plotly figure builders for the EOQ calculator.
+
+Each builder takes exactly the inputs and engine results it draws, as
+keyword arguments named after INPUT_COLUMNS / METRIC_COLUMNS, and returns
+a fresh go.Figure. FIGURE_DEPENDENCIES lists those names per figure so
+callers can cache a figure on just the values that affect it.
+"""
+
+import inspect
+
+import numpy as np
+import plotly.graph_objects as go
+
+from eoq_discounts import price_break_cost
+from eoq_engine import inventory_sawtooth, service_level_z, total_cost_at_quantity
+
+# Service levels (%) behind the alternative scenarios in chart and table
+CONSERVATIVE_SERVICE_LEVEL = 99
+AGGRESSIVE_SERVICE_LEVEL = 90
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def scenario_safety_stocks(safety_stock, lead_time_demand_std):
+    """Safety stock of the current, conservative and aggressive scenario."""
+    z_conservative, z_aggressive = service_level_z([CONSERVATIVE_SERVICE_LEVEL, AGGRESSIVE_SERVICE_LEVEL])
+    return {
+        'Current': safety_stock,
+        'Conservative': z_conservative * lead_time_demand_std,
+        'Aggressive': z_aggressive * lead_time_demand_std,
+    }
+
+
+def inventory_levels_figure(eoq, safety_stock, lead_time_demand_std, daily_demand,
+                            lead_time_days, days_between_orders, reorder_point):
+    scenario_colors = {
+        'Current': '#3B82F6',  # Blue
+        'Conservative': '#10B981',  # Green
+        'Aggressive': '#F59E0B',  # Yellow
+    }
+    scenarios = scenario_safety_stocks(safety_stock, lead_time_demand_std)
+
+    scenario_times, scenario_levels = inventory_sawtooth(
+        order_qty=eoq,
+        safety_stock=list(scenarios.values()),
+        daily_demand=daily_demand,
+        lead_time_days=lead_time_days,
+        horizon_days=3 * days_between_orders,
+    )
+
+    fig_main = go.Figure()
+
+    for i, scenario_name in enumerate(scenarios):
+        fig_main.add_trace(go.Scatter(
+            x=scenario_times[i],
+            y=scenario_levels[i],
+            mode='lines',
+            name=scenario_name,
+            line=dict(color=scenario_colors[scenario_name], width=2),
+            hovertemplate='%{y:,.0f} units<extra></extra>'
+        ))
+
+    # Add reorder point line
+    fig_main.add_hline(
+        y=reorder_point,
+        line_dash="dash",
+        line_color="#EF4444",
+        line_width=1.5,
+        annotation_text="Reorder Point",
+        annotation_position="right",
+        annotation=dict(font=dict(size=11, color='#EF4444'))
+    )
+
+    fig_main.update_layout(
+        height=400,
+        plot_bgcolor='#0E1117',
+        paper_bgcolor='#0E1117',
+        font=dict(size=12, color='#E2E8F0'),
+        xaxis=dict(
+            showgrid=True,
+            gridcolor='#2D3748',
+            gridwidth=0.5,
+            title='Days',
+            title_font=dict(color='#A0AEC0')
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor='#2D3748',
+            gridwidth=0.5,
+            title='Inventory (units)',
+            title_font=dict(color='#A0AEC0')
+        ),
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1,
+            font=dict(color='#E2E8F0')
+        ),
+        margin=dict(l=60, r=40, t=60, b=60),
+        hovermode='x unified'
+    )
+    return fig_main
+
+
+def cost_breakdown_figure(total_order_cost_annual, total_holding_cost_annual):
+    fig_costs = go.Figure()
+
+    categories = ['Ordering', 'Holding']
+    values = [total_order_cost_annual, total_holding_cost_annual]
+    colors = ['#3B82F6', '#10B981']
+
+    fig_costs.add_trace(go.Bar(
+        x=categories,
+        y=values,
+        marker=dict(color=colors),
+        text=[f'€{v:,.0f}' for v in values],
+        textposition='inside',
+        textfont=dict(color='white', size=14),
+        hovertemplate='%{x}: €%{y:,.0f}<extra></extra>'
+    ))
+
+    fig_costs.update_layout(
+        height=300,
+        plot_bgcolor='#0E1117',
+        paper_bgcolor='#0E1117',
+        font=dict(size=12, color='#E2E8F0'),
+        xaxis=dict(showgrid=False),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor='#2D3748',
+            gridwidth=0.5,
+            title='Cost (€)',
+            title_font=dict(color='#A0AEC0')
+        ),
+        margin=dict(l=60, r=20, t=20, b=40),
+        showlegend=False
+    )
+    return fig_costs
+
+
+def service_level_cost_figure(eoq, lead_time_demand_std, total_order_cost_annual, holding_cost_per_unit):
+    service_levels = np.linspace(85, 99.9, 150)
+    ss = service_level_z(service_levels) * lead_time_demand_std
+    costs = total_order_cost_annual + ((eoq / 2) + ss) * holding_cost_per_unit
+
+    fig_service = go.Figure()
+
+    fig_service.add_trace(go.Scatter(
+        x=service_levels,
+        y=costs,
+        mode='lines',
+        line=dict(color='#F59E0B', width=3),
+        hovertemplate='%{x:.1f}%: €%{y:,.0f}<extra></extra>'
+    ))
+
+    fig_service.update_layout(
+        height=300,
+        plot_bgcolor='#0E1117',
+        paper_bgcolor='#0E1117',
+        font=dict(size=12, color='#E2E8F0'),
+        xaxis=dict(
+            showgrid=True,
+            gridcolor='#2D3748',
+            gridwidth=0.5,
+            title='Service Level (%)',
+            title_font=dict(color='#A0AEC0')
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor='#2D3748',
+            gridwidth=0.5,
+            title='Total Cost (€)',
+            title_font=dict(color='#A0AEC0')
+        ),
+        margin=dict(l=60, r=20, t=20, b=40),
+        showlegend=False
+    )
+    return fig_service
+
+
+def order_quantity_figure(annual_demand, order_cost, holding_cost_per_unit, safety_stock, eoq):
+    # Show different order quantities
+    order_qtys = np.linspace(eoq * 0.5, eoq * 1.5, 50)
+    total_costs = total_cost_at_quantity(order_qtys, annual_demand, order_cost, holding_cost_per_unit, safety_stock)
+
+    fig_qty = go.Figure()
+
+    # Total cost curve
+    fig_qty.add_trace(go.Scatter(
+        x=order_qtys,
+        y=total_costs,
+        mode='lines',
+        name='Total Cost',
+        line=dict(color='#8B5CF6', width=3),
+        fill='tozeroy',
+        fillcolor='rgba(139, 92, 246, 0.1)',
+        hovertemplate='Qty: %{x:,.0f}<br>Cost: €%{y:,.0f}<extra></extra>'
+    ))
+
+    # Optimal point
+    fig_qty.add_vline(
+        x=eoq,
+        line_dash="dash",
+        line_color='#3B82F6',
+        line_width=2,
+        annotation_text=f"EOQ: {eoq:,.0f}",
+        annotation_position="top",
+        annotation=dict(font=dict(size=11, color='#3B82F6'))
+    )
+
+    fig_qty.update_layout(
+        height=300,
+        plot_bgcolor='#0E1117',
+        paper_bgcolor='#0E1117',
+        font=dict(size=12, color='#E2E8F0'),
+        xaxis=dict(
+            showgrid=True,
+            gridcolor='#2D3748',
+            gridwidth=0.5,
+            title='Order Quantity',
+            title_font=dict(color='#A0AEC0')
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor='#2D3748',
+            gridwidth=0.5,
+            title='Total Cost (€)',
+            title_font=dict(color='#A0AEC0')
+        ),
+        margin=dict(l=60, r=20, t=20, b=40),
+        showlegend=False
+    )
+    return fig_qty
+
+
+def price_break_figure(annual_demand, order_cost, holding_cost_pct, safety_stock, breaks, prices, kind,
+                       eoq, optimal_qty):
+    """Total annual cost incl. purchasing across a price-break schedule; one line segment per tier."""
+    breaks = np.asarray(breaks, dtype=float)
+    upper = max(eoq, optimal_qty, breaks[-1]) * 1.5
+    lower = max(breaks[0], min(eoq, optimal_qty) * 0.5, 1.0)
+    edges = np.append(breaks, np.inf)
+
+    # Sample each tier separately and separate them with nan, so the
+    # all-units curve shows its drop at every break instead of a ramp
+    order_qtys, total_costs = [], []
+    for start, end in zip(edges[:-1], edges[1:]):
+        start, end = max(start, lower), min(end, upper)
+        if start >= end:
+            continue
+        q = np.linspace(start, end, 100, endpoint=False)
+        order_qtys += [q, [np.nan]]
+        total_costs += [price_break_cost(q, annual_demand, order_cost, holding_cost_pct, breaks, prices,
+                                         kind, safety_stock), [np.nan]]
+    order_qtys = np.concatenate(order_qtys)
+    total_costs = np.concatenate(total_costs)
+    candidates = breaks[(breaks >= lower) & (breaks <= upper)]
+
+    fig_breaks = go.Figure()
+
+    fig_breaks.add_trace(go.Scatter(
+        x=order_qtys,
+        y=total_costs,
+        mode='lines',
+        name='Total Cost',
+        line=dict(color='#8B5CF6', width=3),
+        connectgaps=False,
+        hovertemplate='Qty: %{x:,.0f}<br>Cost: €%{y:,.0f}<extra></extra>'
+    ))
+
+    # Price breaks
+    fig_breaks.add_trace(go.Scatter(
+        x=candidates,
+        y=price_break_cost(candidates, annual_demand, order_cost, holding_cost_pct, breaks, prices,
+                           kind, safety_stock),
+        mode='markers',
+        name='Price Break',
+        marker=dict(color='#F59E0B', size=8),
+        hovertemplate='Break at %{x:,.0f}: €%{y:,.0f}<extra></extra>'
+    ))
+
+    fig_breaks.add_vline(
+        x=eoq,
+        line_dash="dot",
+        line_color='#A0AEC0',
+        line_width=1.5,
+        annotation_text=f"EOQ: {eoq:,.0f}",
+        annotation_position="bottom right",
+        annotation=dict(font=dict(size=11, color='#A0AEC0'))
+    )
+
+    # Optimal point
+    fig_breaks.add_vline(
+        x=optimal_qty,
+        line_dash="dash",
+        line_color='#3B82F6',
+        line_width=2,
+        annotation_text=f"Optimal: {optimal_qty:,.0f}",
+        annotation_position="top",
+        annotation=dict(font=dict(size=11, color='#3B82F6'))
+    )
+
+    fig_breaks.update_layout(
+        height=300,
+        plot_bgcolor='#0E1117',
+        paper_bgcolor='#0E1117',
+        font=dict(size=12, color='#E2E8F0'),
+        xaxis=dict(
+            showgrid=True,
+            gridcolor='#2D3748',
+            gridwidth=0.5,
+            title='Order Quantity',
+            title_font=dict(color='#A0AEC0')
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor='#2D3748',
+            gridwidth=0.5,
+            title='Total Cost incl. Purchasing (€)',
+            title_font=dict(color='#A0AEC0')
+        ),
+        margin=dict(l=60, r=20, t=20, b=40),
+        showlegend=False
+    )
+    return fig_breaks
+
+
+def monthly_demand_figure(demand, order_qty, orders, eoq):
+    """Demand per month with the average order size and order count of a lot-sizing plan."""
+    demand = np.asarray(demand, dtype=float)
+    monthly_avg = demand.mean()
+
+    fig_monthly = go.Figure()
+
+    fig_monthly.add_trace(go.Bar(
+        x=MONTHS,
+        y=demand,
+        name='Demand',
+        marker=dict(
+            color=demand,
+            colorscale='Viridis',
+            showscale=False
+        ),
+        hovertemplate='%{x}: %{y:,.0f} units<extra></extra>'
+    ))
+
+    # Lot sizes follow the season where a fixed EOQ can't
+    fig_monthly.add_trace(go.Scatter(
+        x=MONTHS,
+        y=order_qty,
+        customdata=orders,
+        mode='lines+markers',
+        name='Avg Order Qty',
+        line=dict(color='#F59E0B', width=2),
+        marker=dict(size=8),
+        hovertemplate='%{x}: %{customdata} orders of %{y:,.0f} units<extra></extra>'
+    ))
+
+    # Average line
+    fig_monthly.add_hline(
+        y=monthly_avg,
+        line_dash="dash",
+        line_color='#EF4444',
+        line_width=1.5,
+        annotation_text=f"Avg: {monthly_avg:,.0f}",
+        annotation_position="right",
+        annotation=dict(font=dict(size=10, color='#EF4444'))
+    )
+
+    fig_monthly.add_hline(
+        y=eoq,
+        line_dash="dot",
+        line_color='#A0AEC0',
+        line_width=1.5,
+        annotation_text=f"EOQ: {eoq:,.0f}",
+        annotation_position="left",
+        annotation=dict(font=dict(size=10, color='#A0AEC0'))
+    )
+
+    fig_monthly.update_layout(
+        height=300,
+        plot_bgcolor='#0E1117',
+        paper_bgcolor='#0E1117',
+        font=dict(size=12, color='#E2E8F0'),
+        xaxis=dict(
+            showgrid=False,
+            title=None
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor='#2D3748',
+            gridwidth=0.5,
+            title='Units',
+            title_font=dict(color='#A0AEC0')
+        ),
+        margin=dict(l=60, r=20, t=20, b=40),
+        showlegend=False
+    )
+    return fig_monthly
+
+
+def simulation_cost_figure(total_cost, expected_cost):
+    """Histogram of simulated annual costs against the analytic EOQ cost."""
+    fig_sim = go.Figure()
+
+    fig_sim.add_trace(go.Histogram(
+        x=total_cost,
+        nbinsx=50,
+        marker=dict(color='#8B5CF6'),
+        hovertemplate='€%{x:,.0f}: %{y:,} paths<extra></extra>'
+    ))
+
+    fig_sim.add_vline(
+        x=expected_cost,
+        line_dash="dash",
+        line_color='#3B82F6',
+        line_width=2,
+        annotation_text=f"Model: €{expected_cost:,.0f}",
+        annotation_position="top",
+        annotation=dict(font=dict(size=11, color='#3B82F6'))
+    )
+
+    fig_sim.update_layout(
+        height=300,
+        plot_bgcolor='#0E1117',
+        paper_bgcolor='#0E1117',
+        font=dict(size=12, color='#E2E8F0'),
+        xaxis=dict(
+            showgrid=True,
+            gridcolor='#2D3748',
+            gridwidth=0.5,
+            title='Annual Cost (€)',
+            title_font=dict(color='#A0AEC0')
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor='#2D3748',
+            gridwidth=0.5,
+            title='Paths',
+            title_font=dict(color='#A0AEC0')
+        ),
+        margin=dict(l=60, r=20, t=20, b=40),
+        showlegend=False
+    )
+    return fig_sim
+
+
+def sensitivity_heatmap_figure(x_values, y_values, z, x_label, y_label, z_label):
+    """Heatmap of a 2-D sensitivity sweep; z is shaped (len(y_values), len(x_values))."""
+    fig_heat = go.Figure()
+
+    fig_heat.add_trace(go.Heatmap(
+        x=x_values,
+        y=y_values,
+        z=z,
+        colorscale='Viridis',
+        colorbar=dict(title=dict(text=z_label, font=dict(color='#A0AEC0'))),
+        hovertemplate=f'{x_label}: %{{x:,.1f}}<br>{y_label}: %{{y:,.1f}}<br>{z_label}: %{{z:,.0f}}<extra></extra>'
+    ))
+
+    fig_heat.update_layout(
+        height=400,
+        plot_bgcolor='#0E1117',
+        paper_bgcolor='#0E1117',
+        font=dict(size=12, color='#E2E8F0'),
+        xaxis=dict(
+            title=x_label,
+            title_font=dict(color='#A0AEC0')
+        ),
+        yaxis=dict(
+            title=y_label,
+            title_font=dict(color='#A0AEC0')
+        ),
+        margin=dict(l=60, r=20, t=20, b=40)
+    )
+    return fig_heat
+
+
+FIGURE_BUILDERS = {
+    'inventory_levels': inventory_levels_figure,
+    'cost_breakdown': cost_breakdown_figure,
+    'service_level_cost': service_level_cost_figure,
+    'order_quantity': order_quantity_figure,
+}
+
+FIGURE_DEPENDENCIES = {
+    name: tuple(inspect.signature(builder).parameters)
+    for name, builder in FIGURE_BUILDERS.items()
+}
@@ -0,0 +1,509 @@
+"""
+Headless command-line interface for the EOQ engine.
+
+Usage:
+    python eoq_cli.py batch sku_master.csv -o results.parquet --workers 8
+    python eoq_cli.py constrain sku_master.csv -o plan.csv --limit 2500000
+    python eoq_cli.py joint sku_master.csv -o plan.csv --suppliers suppliers.csv
+    python eoq_cli.py echelon network.csv -o placement.csv --service-level 97
+    python eoq_cli.py simulate sku_master.csv -o simulated.parquet --paths 1000 --workers 64
+    python eoq_cli.py optimize sku_master.csv -o policies.csv --fill-rate 98 --review-days 1 7
+    python eoq_cli.py portfolio sku_master.csv --float32 -o portfolio.arrow
+    python eoq_cli.py history sales.parquet -o demand.csv
+    python eoq_cli.py batch sku_master.csv -o results.parquet --history sales.parquet
+    python eoq_cli.py batch sku_master.csv -o results.parquet --store results.arrow
+    python eoq_cli.py serve --port 8000
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from eoq_batch import DEFAULT_CHUNKSIZE, detect_format, process_chunks, read_sku_chunks
+from eoq_constrained import CONSTRAINT_BASES, constrained_eoq
+from eoq_echelon import echelon_frame
+from eoq_engine import INPUT_COLUMNS
+from eoq_export import ResultWriter
+from eoq_history import apply_history, read_history
+from eoq_joint import joint_frame
+from eoq_parallel import simulate_frame
+from eoq_policy import DEFAULT_REVIEW_PERIODS, optimize_frame
+from eoq_portfolio import Portfolio
+from eoq_simulation import DEFAULT_CHUNK_PATHS
+from eoq_service import DEFAULT_MAX_BATCH, DEFAULT_MAX_DELAY
+
+
+def _as_float_inputs(result):
+    result[list(INPUT_COLUMNS)] = result[list(INPUT_COLUMNS)].astype('float64')
+    return result
+
+
+def _process_chunk(chunk, defaults):
+    return _as_float_inputs(next(process_chunks([chunk], defaults)))
+
+
+def _parallel_map(func, chunks, defaults, workers):
+    """Apply func to chunks in order, keeping at most 2 chunks per worker in flight."""
+    if workers <= 1:
+        for chunk in chunks:
+            yield func(chunk, defaults)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(func, chunk, defaults))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _parse_defaults(pairs):
+    defaults = {}
+    for pair in pairs:
+        name, sep, value = pair.partition('=')
+        if not sep or name not in INPUT_COLUMNS:
+            raise SystemExit(f"invalid --set {pair!r}; expected one of {', '.join(INPUT_COLUMNS)}=VALUE")
+        defaults[name] = float(value)
+    return defaults
+
+
+def _read_history(args):
+    return read_history(args.history, sku_column=args.sku_column, date_column=args.date_column,
+                        quantity_column=args.quantity_column, zero_fill=not args.no_zero_fill,
+                        chunksize=args.chunksize)
+
+
+def run_batch(args):
+    defaults = _parse_defaults(args.set)
+    chunks = read_sku_chunks(args.input, detect_format(args.input), args.chunksize)
+    writer = ResultWriter(args.output)
+
+    start = time.perf_counter()
+    if args.history:
+        # Small per-SKU table; applied here so workers don't each receive a copy
+        history = _read_history(args)
+        print(f"history of {len(history):,} SKUs read in {time.perf_counter() - start:.2f} s", file=sys.stderr)
+        chunks = (apply_history(chunk, history, args.sku_column, defaults) for chunk in chunks)
+    rows = 0
+    store = None
+    if args.store:
+        from eoq_store import ResultStore
+
+        store = ResultStore(args.store, args.sku_column)
+        if args.rebuild:
+            store.invalidate()
+    completed = False
+    try:
+        if store is not None:
+            # Lookups are cheaper than shipping chunks to workers; only misses are computed
+            results = (_as_float_inputs(result) for result in process_chunks(chunks, defaults, store))
+        else:
+            results = _parallel_map(_process_chunk, chunks, defaults, args.workers)
+        for result in results:
+            writer.write(result)
+            rows += len(result)
+        completed = True
+    finally:
+        writer.close()
+        if store is not None:
+            store.close(commit=completed)
+    elapsed = time.perf_counter() - start
+
+    if store is not None:
+        workers = f"store {store.hits:,} hits / {store.misses:,} misses"
+    else:
+        workers = f"{args.workers} workers"
+    print(
+        f"{rows:,} SKUs in {elapsed:.2f} s ({rows / max(elapsed, 1e-9):,.0f} rows/s, {workers}) -> {args.output}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def run_constrain(args):
+    import pandas as pd
+
+    defaults = _parse_defaults(args.set)
+    chunks = read_sku_chunks(args.input, detect_format(args.input), args.chunksize)
+    # The shadow price couples every item, so the whole file is solved at once
+    skus = pd.concat(process_chunks(chunks, defaults), ignore_index=True)
+    if args.usage_column not in skus.columns:
+        raise ValueError(f"missing usage column: {args.usage_column}")
+
+    start = time.perf_counter()
+    plan = constrained_eoq(
+        skus['annual_demand'].to_numpy(), skus['order_cost'].to_numpy(),
+        skus['holding_cost_per_unit'].to_numpy(), skus[args.usage_column].to_numpy(),
+        args.limit, safety_stock=skus['safety_stock'].to_numpy(), basis=args.basis,
+    )
+    elapsed = time.perf_counter() - start
+
+    skus['constrained_qty'] = plan['order_qty']
+    skus['constrained_cost_annual'] = plan['total_cost_annual']
+    writer = ResultWriter(args.output)
+    try:
+        writer.write(skus)
+    finally:
+        writer.close()
+
+    extra = plan['total_cost_annual'].sum() - plan['unconstrained_cost'].sum()
+    print(
+        f"{len(skus):,} SKUs, {args.usage_column} usage {plan['usage']:,.2f} of {args.limit:,.2f} ({args.basis}); "
+        f"shadow price {plan['shadow_price']:.6g}, extra cost {extra:,.2f}/year "
+        f"({plan['iterations']} iterations, {elapsed * 1000:.1f} ms) -> {args.output}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def run_joint(args):
+    import pandas as pd
+
+    defaults = _parse_defaults(args.set)
+    chunks = read_sku_chunks(args.input, detect_format(args.input), args.chunksize)
+    # Each supplier's cycle depends on all of its items, so the file is solved at once
+    skus = pd.concat(process_chunks(chunks, defaults), ignore_index=True)
+
+    start = time.perf_counter()
+    plan, suppliers = joint_frame(skus, args.supplier_column, args.major_cost_column)
+    elapsed = time.perf_counter() - start
+
+    for path, frame in ((args.output, plan), (args.suppliers, suppliers)):
+        if path:
+            writer = ResultWriter(path)
+            try:
+                writer.write(frame)
+            finally:
+                writer.close()
+
+    joint, independent = suppliers['joint_cost_annual'].sum(), suppliers['independent_cost_annual'].sum()
+    saved = 1 - joint / independent if independent > 0 else 0.0
+    print(
+        f"{len(skus):,} SKUs, {len(suppliers):,} suppliers: joint {joint:,.2f}/year vs independent "
+        f"{independent:,.2f}/year ({saved:.1%} saved, {elapsed * 1000:.1f} ms) -> {args.output}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def run_echelon(args):
+    import pandas as pd
+
+    chunks = read_sku_chunks(args.input, detect_format(args.input), args.chunksize)
+    nodes = pd.concat(chunks, ignore_index=True)
+
+    start = time.perf_counter()
+    plan, totals = echelon_frame(nodes, args.service_level, args.sku_column,
+                                 args.customer_service_days, args.supply_service_days)
+    elapsed = time.perf_counter() - start
+
+    for path, frame in ((args.output, plan), (args.totals, totals)):
+        if path:
+            writer = ResultWriter(path)
+            try:
+                writer.write(frame)
+            finally:
+                writer.close()
+
+    network, single = totals['holding_cost_annual'].sum(), totals['single_echelon_holding_cost_annual'].sum()
+    saved = 1 - network / single if single > 0 else 0.0
+    print(
+        f"{len(totals):,} SKUs x {len(plan) // max(len(totals), 1):,} nodes: network safety stock "
+        f"{network:,.2f}/year vs single-echelon {single:,.2f}/year ({saved:.1%} saved, {elapsed * 1000:.1f} ms) "
+        f"-> {args.output}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def run_simulate(args):
+    import pandas as pd
+
+    defaults = _parse_defaults(args.set)
+    chunks = read_sku_chunks(args.input, detect_format(args.input), args.chunksize)
+    skus = pd.concat(process_chunks(chunks, defaults), ignore_index=True)
+
+    start = time.perf_counter()
+    simulated = simulate_frame(skus, n_paths=args.paths, horizon_days=args.horizon_days, seed=args.seed,
+                               workers=args.workers, chunk_paths=args.chunk_paths)
+    elapsed = time.perf_counter() - start
+
+    writer = ResultWriter(args.output)
+    try:
+        writer.write(_as_float_inputs(simulated))
+    finally:
+        writer.close()
+
+    paths = len(skus) * args.paths
+    print(
+        f"{len(skus):,} SKUs x {args.paths:,} paths in {elapsed:.2f} s ({paths / max(elapsed, 1e-9):,.0f} paths/s, "
+        f"{args.workers} workers, seed {args.seed}) -> {args.output}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def run_optimize(args):
+    import pandas as pd
+
+    defaults = _parse_defaults(args.set)
+    chunks = read_sku_chunks(args.input, detect_format(args.input), args.chunksize)
+    skus = pd.concat(process_chunks(chunks, defaults), ignore_index=True)
+
+    start = time.perf_counter()
+    optimized = optimize_frame(skus, target_fill_rate=args.fill_rate / 100, review_periods=args.review_days,
+                               n_paths=args.paths, horizon_days=args.horizon_days, seed=args.seed,
+                               workers=args.workers, chunk_paths=args.chunk_paths)
+    elapsed = time.perf_counter() - start
+
+    writer = ResultWriter(args.output)
+    try:
+        writer.write(_as_float_inputs(optimized))
+    finally:
+        writer.close()
+
+    found = optimized['opt_total_cost'].notna()
+    current, best = optimized.loc[found, 'sim_total_cost'].sum(), optimized.loc[found, 'opt_total_cost'].sum()
+    current_fill = optimized.loc[found, 'sim_fill_rate'].mean()
+    print(
+        f"{found.sum():,} of {len(skus):,} SKUs reach a {args.fill_rate:g}% fill rate: {best:,.2f}/year vs "
+        f"{current:,.2f}/year at {current_fill:.1%} mean fill for EOQ / reorder point "
+        f"({optimized['opt_evaluated'].mean():,.0f} candidates per SKU, {elapsed:.2f} s) -> {args.output}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def run_portfolio(args):
+    import pandas as pd
+
+    defaults = _parse_defaults(args.set)
+    chunks = read_sku_chunks(args.input, detect_format(args.input), args.chunksize)
+    skus = pd.concat(process_chunks(chunks, defaults), ignore_index=True)
+    frame_bytes = skus.memory_usage(deep=True).sum() / max(len(skus), 1)
+
+    start = time.perf_counter()
+    portfolio = Portfolio.from_frame(skus, 'float32' if args.float32 else 'float64', args.sku_column)
+    elapsed = time.perf_counter() - start
+    del skus
+
+    if args.output:
+        writer = ResultWriter(args.output)
+        try:
+            writer.write(portfolio.to_frame())
+        finally:
+            writer.close()
+
+    usage = portfolio.memory_usage()
+    print(
+        f"{len(portfolio):,} SKUs as {portfolio.data.dtype[0]} in {elapsed:.2f} s: {usage['total']:,.1f} bytes/SKU "
+        f"({usage['values']:,.1f} values + {usage['identifiers']:,.1f} identifiers) vs {frame_bytes:,.1f} "
+        f"bytes/SKU as a DataFrame" + (f" -> {args.output}" if args.output else ""),
+        file=sys.stderr,
+    )
+    return 0
+
+
+def run_history(args):
+    start = time.perf_counter()
+    history = _read_history(args)
+    elapsed = time.perf_counter() - start
+
+    writer = ResultWriter(args.output)
+    try:
+        writer.write(history.reset_index())
+    finally:
+        writer.close()
+
+    print(
+        f"{len(history):,} SKUs over {history['days'].sum():,} SKU-days in {elapsed:.2f} s -> {args.output}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def run_serve(args):
+    import asyncio
+
+    from eoq_service import serve
+
+    defaults = _parse_defaults(args.set)
+
+    def ready(address):
+        print(f"serving on http://{address[0]}:{address[1]} (batches of up to {args.max_batch}, "
+              f"{args.max_delay_ms:g} ms wait)", file=sys.stderr)
+
+    try:
+        asyncio.run(serve(args.host, args.port, defaults, args.max_batch, args.max_delay_ms / 1000, ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _add_history_columns(parser):
+    parser.add_argument('--sku-column', default='sku', help='SKU column of sales and SKU file (default: sku)')
+    parser.add_argument('--date-column', default='date', help='sales date column (default: date)')
+    parser.add_argument('--quantity-column', default='quantity', help='sales quantity column (default: quantity)')
+    parser.add_argument('--no-zero-fill', action='store_true',
+                        help='use only days present in the file instead of counting missing days as zero')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='eoq_cli', description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    batch = subparsers.add_parser('batch', help='compute EOQ metrics for every row of a SKU file')
+    batch.add_argument('input', help='SKU master (.csv, .parquet or .arrow)')
+    batch.add_argument('-o', '--output', required=True, help='results file (.parquet, .arrow or .csv)')
+    batch.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                       help='worker processes (default: all cores)')
+    batch.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                       help=f'rows per chunk (default: {DEFAULT_CHUNKSIZE:,})')
+    batch.add_argument('--set', action='append', default=[], metavar='COLUMN=VALUE',
+                       help='default for an input column missing from the file')
+    batch.add_argument('--store', metavar='PATH',
+                       help='result store (.arrow) of the previous run; only SKUs that are new or changed '
+                            'are computed (needs a SKU column, runs in one process)')
+    batch.add_argument('--rebuild', action='store_true', help='ignore the result store and compute every SKU')
+    batch.add_argument('--history', metavar='PATH',
+                       help='daily sales (.csv, .parquet or .arrow) to derive annual_demand and demand_variability from')
+    _add_history_columns(batch)
+    batch.set_defaults(func=run_batch)
+
+    constrain = subparsers.add_parser(
+        'constrain', help='order quantities for all SKUs together under a shared inventory limit')
+    constrain.add_argument('input', help='SKU master (.csv, .parquet or .arrow)')
+    constrain.add_argument('-o', '--output', required=True, help='plan file (.parquet, .arrow or .csv)')
+    constrain.add_argument('--limit', type=float, required=True,
+                           help='limit on total inventory usage, in units of the usage column')
+    constrain.add_argument('--usage-column', default='unit_cost',
+                           help='resource per unit, e.g. a volume column (default: unit_cost, i.e. capital)')
+    constrain.add_argument('--basis', choices=list(CONSTRAINT_BASES), default='average',
+                           help='limit average inventory or the peak after an order arrives (default: average)')
+    constrain.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                           help=f'rows per chunk while reading (default: {DEFAULT_CHUNKSIZE:,})')
+    constrain.add_argument('--set', action='append', default=[], metavar='COLUMN=VALUE',
+                           help='default for an input column missing from the file')
+    constrain.set_defaults(func=run_constrain)
+
+    joint = subparsers.add_parser(
+        'joint', help='joint replenishment: common order cycles for SKUs of the same supplier')
+    joint.add_argument('input', help='SKU master (.csv, .parquet or .arrow); order_cost is the cost per order line')
+    joint.add_argument('-o', '--output', required=True, help='plan file per SKU (.parquet, .arrow or .csv)')
+    joint.add_argument('--suppliers', metavar='PATH', help='also write one row per supplier (.parquet, .arrow or .csv)')
+    joint.add_argument('--supplier-column', default='supplier', help='supplier label column (default: supplier)')
+    joint.add_argument('--major-cost-column', default='major_order_cost',
+                       help='cost per supplier order (default: major_order_cost)')
+    joint.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                       help=f'rows per chunk while reading (default: {DEFAULT_CHUNKSIZE:,})')
+    joint.add_argument('--set', action='append', default=[], metavar='COLUMN=VALUE',
+                       help='default for an input column missing from the file')
+    joint.set_defaults(func=run_joint)
+
+    echelon = subparsers.add_parser(
+        'echelon', help='place safety stock across a supply network (guaranteed-service model)')
+    echelon.add_argument('input', help='one row per node (and SKU): node, upstream, lead_time_days, unit_cost, '
+                                       'holding_cost_pct, annual_demand, demand_variability (.csv, .parquet or .arrow); '
+                                       'one upstream node per node, so no assembly nodes with several suppliers')
+    echelon.add_argument('-o', '--output', required=True, help='placement per node (.parquet, .arrow or .csv)')
+    echelon.add_argument('--totals', metavar='PATH',
+                         help='also write network vs single-echelon holding cost per SKU (.parquet, .arrow or .csv)')
+    echelon.add_argument('--service-level', type=float, default=95.0, help='service level in %% (default: 95)')
+    echelon.add_argument('--customer-service-days', type=int, default=0,
+                         help='service time quoted to customers by nodes without downstream nodes (default: 0)')
+    echelon.add_argument('--supply-service-days', type=int, default=0,
+                         help='service time of the outside supplier to nodes without upstream nodes (default: 0)')
+    echelon.add_argument('--sku-column', default='sku', help='SKU column, one network per SKU (default: sku)')
+    echelon.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                         help=f'rows per chunk while reading (default: {DEFAULT_CHUNKSIZE:,})')
+    echelon.set_defaults(func=run_echelon)
+
+    simulate = subparsers.add_parser(
+        'simulate', help='Monte Carlo of every SKU\'s EOQ / reorder point policy, reproducible for any worker count')
+    simulate.add_argument('input', help='SKU master (.csv, .parquet or .arrow)')
+    simulate.add_argument('-o', '--output', required=True, help='results file (.parquet, .arrow or .csv)')
+    simulate.add_argument('--paths', type=int, default=1_000, help='simulated paths per SKU (default: 1,000)')
+    simulate.add_argument('--horizon-days', type=int, default=365, help='days per path (default: 365)')
+    simulate.add_argument('--seed', type=int, default=0, help='root seed of all random streams (default: 0)')
+    simulate.add_argument('--chunk-paths', type=int, default=DEFAULT_CHUNK_PATHS,
+                          help=f'paths per random stream; changing it changes the draws (default: {DEFAULT_CHUNK_PATHS:,})')
+    simulate.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                          help='worker processes (default: all cores)')
+    simulate.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                          help=f'rows per chunk while reading (default: {DEFAULT_CHUNKSIZE:,})')
+    simulate.add_argument('--set', action='append', default=[], metavar='COLUMN=VALUE',
+                          help='default for an input column missing from the file')
+    simulate.set_defaults(func=run_simulate)
+
+    optimize = subparsers.add_parser(
+        'optimize', help='cheapest (s, S) / (R, s, S) policy per SKU for a target fill rate, by simulation')
+    optimize.add_argument('input', help='SKU master (.csv, .parquet or .arrow)')
+    optimize.add_argument('-o', '--output', required=True, help='results file (.parquet, .arrow or .csv)')
+    optimize.add_argument('--fill-rate', type=float, default=98.0, help='target fill rate in %% (default: 98)')
+    optimize.add_argument('--review-days', type=int, nargs='+', default=list(DEFAULT_REVIEW_PERIODS),
+                          help='review periods to search; 1 is continuous review (default: 1 7)')
+    optimize.add_argument('--paths', type=int, default=500, help='simulated paths per SKU (default: 500)')
+    optimize.add_argument('--horizon-days', type=int, default=365, help='days per path (default: 365)')
+    optimize.add_argument('--seed', type=int, default=0, help='root seed of all random streams (default: 0)')
+    optimize.add_argument('--chunk-paths', type=int, default=DEFAULT_CHUNK_PATHS,
+                          help=f'paths per random stream; changing it changes the draws (default: {DEFAULT_CHUNK_PATHS:,})')
+    optimize.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                          help='worker processes (default: all cores)')
+    optimize.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                          help=f'rows per chunk while reading (default: {DEFAULT_CHUNKSIZE:,})')
+    optimize.add_argument('--set', action='append', default=[], metavar='COLUMN=VALUE',
+                          help='default for an input column missing from the file')
+    optimize.set_defaults(func=run_optimize)
+
+    portfolio = subparsers.add_parser(
+        'portfolio', help='compact in-memory portfolio; reports memory per SKU')
+    portfolio.add_argument('input', help='SKU master (.csv, .parquet or .arrow)')
+    portfolio.add_argument('-o', '--output', help='also write the portfolio (.parquet, .arrow or .csv)')
+    portfolio.add_argument('--float32', action='store_true',
+                           help='store values as float32 (relative error about 6e-8, see eoq_portfolio)')
+    portfolio.add_argument('--sku-column', default='sku', help='SKU column (default: sku)')
+    portfolio.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                           help=f'rows per chunk while reading (default: {DEFAULT_CHUNKSIZE:,})')
+    portfolio.add_argument('--set', action='append', default=[], metavar='COLUMN=VALUE',
+                           help='default for an input column missing from the file')
+    portfolio.set_defaults(func=run_portfolio)
+
+    history = subparsers.add_parser(
+        'history', help='annual demand and demand variability per SKU from daily sales')
+    history.add_argument('history', help='sales, one row per sale or per SKU and day, in date order (.csv, .parquet or .arrow)')
+    history.add_argument('-o', '--output', required=True, help='statistics file (.parquet, .arrow or .csv)')
+    history.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                         help=f'rows per chunk (default: {DEFAULT_CHUNKSIZE:,})')
+    _add_history_columns(history)
+    history.set_defaults(func=run_history)
+
+    serve = subparsers.add_parser('serve', help='HTTP API for single and bulk calculations')
+    serve.add_argument('--host', default='127.0.0.1', help='interface to listen on (default: 127.0.0.1)')
+    serve.add_argument('--port', type=int, default=8000, help='port (default: 8000)')
+    serve.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH,
+                       help=f'most single requests computed together (default: {DEFAULT_MAX_BATCH})')
+    serve.add_argument('--max-delay-ms', type=float, default=DEFAULT_MAX_DELAY * 1000,
+                       help=f'how long a request waits for a batch to fill (default: {DEFAULT_MAX_DELAY * 1000:g})')
+    serve.add_argument('--set', action='append', default=[], metavar='COLUMN=VALUE',
+                       help='default for an input missing from a request')
+    serve.set_defaults(func=run_serve)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as exc:
+        print(f"eoq_cli: error: {exc}", file=sys.stderr)
+        return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
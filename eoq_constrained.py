@@ -0,0 +1,95 @@
+"""
+Multi-item EOQ under a shared resource limit.
+
+Order quantities of all items are set together so that the inventory they
+tie up (capital, volume, ...) stays within one limit at the lowest total
+cost. With Lagrange multiplier lam on the constraint, each item orders
+
+    Q_i = sqrt(2 * D_i * S_i / (h_i + 2 * lam * k * a_i))
+
+where a_i is the resource per unit and k is 1/2 for a limit on average
+inventory or 1 for a limit on the peak (all orders arriving at once).
+lam is the root of a decreasing convex function in one variable, found by
+safeguarded Newton iterations, and is the shadow price of the limit: the
+annual cost saved per extra unit of resource.
+"""
+
+import numpy as np
+
+from eoq_engine import total_cost_at_quantity
+
+CONSTRAINT_BASES = {'average': 0.5, 'peak': 1.0}
+
+
+def constrained_eoq(annual_demand, order_cost, holding_cost_per_unit, usage_per_unit, limit,
+                    safety_stock=0.0, basis='average', rtol=1e-10, max_iter=100):
+    """
+    Jointly optimal order quantities with sum(a * (k * Q + ss)) <= limit.
+
+    Item parameters are arrays with one element per item (or scalars).
+    Safety stock counts against the limit but is not adjusted. Returns a
+    dict with per-item 'order_qty' and 'total_cost_annual' (ordering plus
+    holding), the scalar 'usage' and 'shadow_price', the unconstrained
+    'unconstrained_cost' and the Newton 'iterations'. Raises ValueError if
+    the safety stock alone exceeds the limit.
+    """
+    if basis not in CONSTRAINT_BASES:
+        raise ValueError(f"basis must be one of {', '.join(CONSTRAINT_BASES)}")
+    k = CONSTRAINT_BASES[basis]
+
+    annual_demand, order_cost, holding_cost_per_unit, usage_per_unit, safety_stock = (
+        np.atleast_1d(a).astype(float) for a in np.broadcast_arrays(
+            annual_demand, order_cost, holding_cost_per_unit, usage_per_unit, safety_stock)
+    )
+    if np.any(usage_per_unit < 0):
+        raise ValueError("usage_per_unit must be non-negative")
+
+    capacity = limit - np.sum(usage_per_unit * safety_stock)
+    if capacity <= 0:
+        raise ValueError("safety stock alone exceeds the limit")
+
+    two_ds = 2 * annual_demand * order_cost
+    weight = k * usage_per_unit
+
+    def quantities(lam):
+        return np.sqrt(two_ds / (holding_cost_per_unit + 2 * lam * weight))
+
+    def excess(lam):
+        q = quantities(lam)
+        return np.dot(weight, q) - capacity, q
+
+    unconstrained_q = quantities(0.0)
+    unconstrained_cost = total_cost_at_quantity(unconstrained_q, annual_demand, order_cost,
+                                                holding_cost_per_unit, safety_stock)
+
+    lam, iterations = 0.0, 0
+    g, q = excess(lam)
+    if g > 0:
+        # g(lam) is decreasing and convex, so Newton steps from the left stay
+        # left of the root; the bracket only guards against rounding
+        lo, hi = 0.0, np.inf
+        while abs(g) > rtol * capacity and iterations < max_iter:
+            iterations += 1
+            if g > 0:
+                lo = lam
+            else:
+                hi = lam
+            slope = -np.dot(weight * weight, q / (holding_cost_per_unit + 2 * lam * weight))
+            step = lam - g / slope
+            if not lo < step < hi:
+                step = (lo + hi) / 2 if np.isfinite(hi) else 2 * lo + 1
+            lam = step
+            g, q = excess(lam)
+        if g > 0:
+            # Converged from above the limit; shrink by the residual so it holds
+            q = q * (capacity / (capacity + g))
+
+    return {
+        'order_qty': q,
+        'total_cost_annual': total_cost_at_quantity(q, annual_demand, order_cost,
+                                                    holding_cost_per_unit, safety_stock),
+        'unconstrained_cost': unconstrained_cost,
+        'usage': float(np.dot(weight, q) + np.dot(usage_per_unit, safety_stock)),
+        'shadow_price': lam,
+        'iterations': iterations,
+    }
@@ -0,0 +1,152 @@
+"""
+Quantity-discount (price-break) EOQ.
+
+Each SKU has a price schedule of tiers (min quantity, unit price). Under
+all-units discounts the tier price applies to every unit of the order;
+under incremental discounts it only applies to the units above the tier's
+break. Both are solved for every tier of every SKU at once: within a tier
+the annual cost is A / Q + B * Q + C, so the tier optimum is sqrt(A / B)
+clipped into the tier, and the cheapest tier wins.
+
+Schedules are arrays of shape (..., n_tiers). SKUs with fewer tiers are
+padded with breaks of inf and prices of nan.
+"""
+
+import numpy as np
+
+DISCOUNT_KINDS = ('all_units', 'incremental')
+
+DISCOUNT_COLUMNS = (
+    'order_qty', 'tier', 'unit_price', 'purchase_cost_annual',
+    'total_order_cost_annual', 'total_holding_cost_annual', 'total_cost_annual',
+)
+
+
+def _schedule(breaks, prices):
+    breaks = np.asarray(breaks, dtype=float)
+    prices = np.asarray(prices, dtype=float)
+    breaks, prices = np.broadcast_arrays(breaks, prices)
+    if breaks.ndim == 0 or breaks.shape[-1] == 0:
+        raise ValueError("price schedule needs at least one tier")
+
+    padded = np.isnan(prices)
+    if np.any(padded != np.isinf(breaks)):
+        raise ValueError("padded tiers need both break=inf and price=nan")
+    if np.any(padded[..., 0]):
+        raise ValueError("the first tier of every schedule must be set")
+    if np.any(breaks[..., 0] < 0) or np.any(prices[~padded] <= 0):
+        raise ValueError("breaks must be non-negative and prices positive")
+    with np.errstate(invalid='ignore'):
+        if np.any(np.diff(breaks, axis=-1) <= 0):
+            raise ValueError("breaks must be strictly increasing")
+        if np.any(np.diff(prices, axis=-1) > 0):
+            raise ValueError("prices must not increase with quantity")
+    return breaks, prices, padded
+
+
+def _tier_coefficients(annual_demand, order_cost, holding_rate, safety_stock, breaks, prices, kind):
+    """
+    A, B, C of the annual cost A / Q + B * Q + C within each tier.
+
+    With purchase cost C(Q) = R_j + p_j * (Q - b_j) for Q in tier j, the
+    fixed part F_j = R_j - p_j * b_j is zero for all-units discounts, and
+    annual purchase, ordering and holding cost (inventory valued at the
+    average unit cost C(Q) / Q) expand to that form.
+    """
+    if kind == 'all_units':
+        fixed = np.zeros_like(prices)
+    elif kind == 'incremental':
+        widths = np.diff(breaks, axis=-1)
+        with np.errstate(invalid='ignore'):
+            segment_costs = prices[..., :-1] * widths
+        cost_at_break = np.concatenate([
+            prices[..., :1] * breaks[..., :1],
+            prices[..., :1] * breaks[..., :1] + np.cumsum(segment_costs, axis=-1),
+        ], axis=-1)
+        with np.errstate(invalid='ignore'):
+            fixed = cost_at_break - prices * breaks
+    else:
+        raise ValueError(f"kind must be one of {', '.join(DISCOUNT_KINDS)}")
+
+    d = annual_demand[..., None]
+    i = holding_rate[..., None]
+    ss = safety_stock[..., None]
+    a = d * (order_cost[..., None] + fixed) + i * ss * fixed
+    b = i * prices / 2
+    c = d * prices + i * fixed / 2 + i * ss * prices
+    return a, b, c, fixed
+
+
+def solve_price_breaks(annual_demand, order_cost, holding_cost_pct, breaks, prices,
+                       kind='all_units', safety_stock=0.0):
+    """
+    Cost-minimizing order quantity under a price-break schedule.
+
+    Scalar inputs broadcast against the leading dimensions of `breaks` and
+    `prices` (one row per SKU). Holding cost is `holding_cost_pct` of the
+    average unit price paid, applied to cycle and safety stock. Returns a
+    dict keyed by DISCOUNT_COLUMNS; `tier` is the index of the winning tier
+    and `unit_price` the average price per unit at the chosen quantity.
+    """
+    breaks, prices, padded = _schedule(breaks, prices)
+    lead_shape = np.broadcast_shapes(breaks.shape[:-1], np.shape(annual_demand), np.shape(order_cost),
+                                     np.shape(holding_cost_pct), np.shape(safety_stock))
+    breaks = np.broadcast_to(breaks, lead_shape + breaks.shape[-1:])
+    prices = np.broadcast_to(prices, breaks.shape)
+    padded = np.broadcast_to(padded, breaks.shape)
+    annual_demand, order_cost, holding_rate, safety_stock = (
+        np.broadcast_to(np.asarray(a, dtype=float), lead_shape)
+        for a in (annual_demand, order_cost, np.asarray(holding_cost_pct, dtype=float) / 100, safety_stock)
+    )
+
+    a, b, c, fixed = _tier_coefficients(annual_demand, order_cost, holding_rate, safety_stock,
+                                        breaks, prices, kind)
+    upper = np.concatenate([breaks[..., 1:], np.full(lead_shape + (1,), np.inf)], axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        qty = np.clip(np.sqrt(a / b), breaks, upper)
+        cost = np.where(padded, np.inf, a / qty + b * qty + c)
+
+    tier = np.argmin(cost, axis=-1)
+
+    def pick(x):
+        return np.take_along_axis(x, tier[..., None], axis=-1)[..., 0]
+
+    order_qty = pick(qty)
+    unit_price = pick(prices) + pick(fixed) / order_qty
+    orders_per_year = annual_demand / order_qty
+    holding = holding_rate * unit_price * (order_qty / 2 + safety_stock)
+    return {
+        'order_qty': order_qty,
+        'tier': tier,
+        'unit_price': unit_price,
+        'purchase_cost_annual': annual_demand * unit_price,
+        'total_order_cost_annual': orders_per_year * order_cost,
+        'total_holding_cost_annual': holding,
+        'total_cost_annual': pick(cost),
+    }
+
+
+def price_break_cost(order_qty, annual_demand, order_cost, holding_cost_pct, breaks, prices,
+                     kind='all_units', safety_stock=0.0):
+    """
+    Annual purchase + ordering + holding cost of ordering `order_qty` under
+    one price schedule (1-D `breaks` and `prices`), element-wise over
+    `order_qty`. All-units schedules give a cost curve that drops at every
+    break; quantities below the first break cost nan.
+    """
+    breaks, prices, padded = _schedule(breaks, prices)
+    if breaks.ndim != 1:
+        raise ValueError("price_break_cost takes a single schedule")
+    breaks, prices = breaks[~padded], prices[~padded]
+    order_qty = np.asarray(order_qty, dtype=float)
+
+    scalar = np.asarray(0.0)
+    a, b, c, _ = _tier_coefficients(scalar + annual_demand, scalar + order_cost,
+                                    scalar + holding_cost_pct / 100, scalar + safety_stock,
+                                    breaks, prices, kind)
+    tier = np.searchsorted(breaks, order_qty, side='right') - 1
+    valid = tier >= 0
+    tier = np.maximum(tier, 0)
+    with np.errstate(divide='ignore'):
+        cost = a[tier] / order_qty + b[tier] * order_qty + c[tier]
+    return np.where(valid, cost, np.nan)
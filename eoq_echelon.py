@@ -0,0 +1,329 @@
+"""
+Multi-echelon safety stock placement (guaranteed-service model).
+
+Each node j of a supply network (e.g. DC -> regional warehouse -> store)
+has a replenishment time T_j and quotes its downstream nodes a service
+time S_j: orders are filled within S_j days. A node that receives its
+supplies after SI_j days (the longest service time of its upstream nodes)
+has to cover the demand of its net replenishment time
+
+    tau_j = SI_j + T_j - S_j >= 0
+
+with a safety stock of z * sigma_j * sqrt(tau_j), where sigma_j is the
+standard deviation of the node's daily demand, pooled over the nodes it
+serves. Customer-facing nodes quote a fixed maximum service time (0 by
+default). The single-echelon answer of the engine is the special case S = 0
+everywhere: every node covers its full replenishment time, which for a node
+without upstream nodes includes the outside supplier's service time.
+
+Service times are whole days and are optimized with the dynamic program
+of Graves & Willems (2000) for spanning trees. Nodes are eliminated leaf by
+leaf; each one leaves a cost function of its service time (or of its
+inbound service time) for the neighbour it is eliminated into, so the
+work is a few small (service time x inbound time) tables per node. All
+SKUs on the same network are optimized together in one pass, with a
+leading SKU axis on every array.
+
+The DP is exact when the network, taken as an undirected graph, has no
+cycles. That covers distribution networks (DC -> warehouses -> stores),
+serial lines and assembly trees; other networks raise ValueError.
+"""
+
+from collections import deque
+
+import numpy as np
+
+from eoq_engine import service_level_z
+
+ECHELON_COLUMNS = ('service_days', 'inbound_service_days', 'net_replenishment_days', 'pooled_daily_std_dev',
+                   'safety_stock', 'holding_cost_annual', 'single_echelon_safety_stock',
+                   'single_echelon_holding_cost_annual')
+
+
+def _network(n_nodes, edges):
+    """Adjacency, elimination order and parents for a forest; raises ValueError otherwise."""
+    upstream = [[] for _ in range(n_nodes)]
+    downstream = [[] for _ in range(n_nodes)]
+    root_of = list(range(n_nodes))
+
+    def find(node):
+        while root_of[node] != node:
+            root_of[node] = root_of[root_of[node]]
+            node = root_of[node]
+        return node
+
+    for supplier, customer in edges:
+        supplier, customer = int(supplier), int(customer)
+        if not (0 <= supplier < n_nodes and 0 <= customer < n_nodes) or supplier == customer:
+            raise ValueError(f"invalid edge {supplier} -> {customer} for {n_nodes} nodes")
+        a, b = find(supplier), find(customer)
+        if a == b:
+            raise ValueError("the network has a cycle (counting both directions); the guaranteed-service "
+                             "DP needs a tree, e.g. one supplier per node")
+        root_of[a] = b
+        upstream[customer].append(supplier)
+        downstream[supplier].append(customer)
+
+    # Eliminate leaves one by one; the neighbour left over is the parent
+    degree = [len(upstream[k]) + len(downstream[k]) for k in range(n_nodes)]
+    done = [False] * n_nodes
+    queue = deque(k for k in range(n_nodes) if degree[k] <= 1)
+    order, parent = [], [-1] * n_nodes
+    while queue:
+        k = queue.popleft()
+        done[k] = True
+        order.append(k)
+        for neighbour in upstream[k] + downstream[k]:
+            if not done[neighbour]:
+                parent[k] = neighbour
+                degree[neighbour] -= 1
+                if degree[neighbour] == 1:
+                    queue.append(neighbour)
+    return upstream, downstream, order, parent
+
+
+def _longest_inbound(upstream, downstream, lead_time, supply_service):
+    """Nodes in supply order and each node's longest replenishment time from the outside supplier."""
+    n_nodes = len(upstream)
+    longest = np.zeros(n_nodes, dtype=np.int64)
+    waiting = [len(upstream[k]) for k in range(n_nodes)]
+    queue = deque(k for k in range(n_nodes) if not waiting[k])
+    order = []
+    while queue:
+        k = queue.popleft()
+        order.append(k)
+        longest[k] = max((longest[i] for i in upstream[k]), default=supply_service) + lead_time[k]
+        for j in downstream[k]:
+            waiting[j] -= 1
+            if not waiting[j]:
+                queue.append(j)
+    return order, longest
+
+
+def _prefix_min_at(cost, x):
+    """min(cost[:, :x + 1]) per SKU for each x; the cost is flat beyond its last service time."""
+    prefix = np.minimum.accumulate(cost, axis=1)
+    return prefix[:, np.minimum(x, cost.shape[1] - 1)]
+
+
+def _suffix_min_at(cost, start, x):
+    """min(cost[:, x - start:]) per SKU for each x, for a cost over inbound times from `start`."""
+    suffix = np.minimum.accumulate(cost[:, ::-1], axis=1)[:, ::-1]
+    suffix = np.concatenate([suffix, np.full((len(cost), 1), np.inf)], axis=1)
+    return suffix[:, np.minimum(np.maximum(x - start, 0), cost.shape[1])]
+
+
+def guaranteed_service(edges, lead_time_days, holding_cost_per_unit, daily_std_dev, service_level,
+                       customer_service_days=0, supply_service_days=0):
+    """
+    Cost-optimal service times and safety stocks for a supply network.
+
+    Nodes are numbered 0..n_nodes-1; `edges` lists (supplier, customer)
+    node pairs. `lead_time_days` (whole days) is per node.
+    `holding_cost_per_unit` (annual) and `daily_std_dev` of the node's own
+    customer demand (0 for nodes without customers) are per node, or
+    (n_skus, n_nodes) for many SKUs on the same network; `service_level`
+    (%) is a scalar or per SKU. Nodes without downstream nodes quote
+    `customer_service_days`; nodes without upstream nodes are supplied
+    within `supply_service_days`.
+
+    Returns a dict with the ECHELON_COLUMNS arrays per node (per SKU and
+    node for SKU inputs) and the totals 'holding_cost_annual_total' and
+    'single_echelon_holding_cost_annual_total'.
+    """
+    lead_time = np.asarray(lead_time_days, dtype=float)
+    if lead_time.ndim != 1:
+        raise ValueError("lead_time_days must have one value per node")
+    if np.any(lead_time < 0) or np.any(lead_time != np.round(lead_time)):
+        raise ValueError("lead_time_days must be whole, non-negative days")
+    lead_time = lead_time.astype(np.int64)
+    n_nodes = len(lead_time)
+    holding = np.asarray(holding_cost_per_unit, dtype=float)
+    own_std = np.asarray(daily_std_dev, dtype=float)
+    z = service_level_z(service_level)
+    single_sku = holding.ndim < 2 and own_std.ndim < 2 and z.ndim == 0
+    n_skus = max(len(holding) if holding.ndim == 2 else 1, len(own_std) if own_std.ndim == 2 else 1, z.size)
+    holding = np.broadcast_to(holding, (n_skus, n_nodes))
+    own_std = np.broadcast_to(own_std, (n_skus, n_nodes))
+    z = np.broadcast_to(z, (n_skus,))
+    if customer_service_days < 0 or supply_service_days < 0:
+        raise ValueError("service times must be non-negative")
+    customer_service_days, supply_service_days = int(customer_service_days), int(supply_service_days)
+
+    upstream, downstream, order, parent = _network(n_nodes, edges)
+    supply_order, longest = _longest_inbound(upstream, downstream, lead_time, supply_service_days)
+
+    # Demand pools upward: a node's variance is its own plus that of every node it supplies
+    variance = own_std ** 2
+    for k in supply_order[::-1]:
+        for j in downstream[k]:
+            variance[:, k] += variance[:, j]
+    pooled_std = np.sqrt(variance)
+    weight = holding * z[:, None] * pooled_std
+
+    # Ranges of the outbound service time S and inbound service time SI per node
+    s_max = np.where([not downstream[k] for k in range(n_nodes)],
+                     np.minimum(customer_service_days, longest), longest)
+    si_min = np.where([not upstream[k] for k in range(n_nodes)], supply_service_days, 0)
+    si_max = longest - lead_time
+
+    # For a node eliminated into a downstream parent: cost by S, best SI per S.
+    # Into an upstream parent: cost by SI (from si_min), best S per SI.
+    cost_of, best_of = {}, {}
+
+    def table(k):
+        s = np.arange(s_max[k] + 1)
+        si = np.arange(si_min[k], si_max[k] + 1)
+        tau = si[None, :] + lead_time[k] - s[:, None]
+        with np.errstate(invalid='ignore'):
+            cost = np.where(tau >= 0, weight[:, k, None, None] * np.sqrt(np.maximum(tau, 0)), np.inf)
+        for i in upstream[k]:
+            if parent[i] == k:
+                cost = cost + _prefix_min_at(cost_of[i], si)[:, None, :]
+        for j in downstream[k]:
+            if parent[j] == k:
+                cost = cost + _suffix_min_at(cost_of[j], si_min[j], s)[:, :, None]
+        return cost
+
+    roots = []
+    for k in order:
+        cost = table(k)
+        if parent[k] < 0:
+            roots.append(k)
+            best_of[k] = cost
+        elif parent[k] in downstream[k]:
+            best_of[k] = cost.argmin(axis=2)
+            cost_of[k] = cost.min(axis=2)
+        else:
+            best_of[k] = cost.argmin(axis=1)
+            cost_of[k] = cost.min(axis=1)
+
+    # Walk back from the roots, fixing each node's service times
+    service = np.zeros((n_skus, n_nodes), dtype=np.int64)
+    inbound = np.zeros((n_skus, n_nodes), dtype=np.int64)
+    rows = np.arange(n_skus)
+    for k in roots:
+        flat = best_of[k].reshape(n_skus, -1).argmin(axis=1)
+        service[:, k], si_index = np.unravel_index(flat, best_of[k].shape[1:])
+        inbound[:, k] = si_index + si_min[k]
+    for k in order[::-1]:
+        for i in upstream[k]:
+            if parent[i] == k:
+                # S_i <= SI_k, cheapest first
+                grid = np.arange(cost_of[i].shape[1])
+                masked = np.where(grid[None, :] <= inbound[:, k, None], cost_of[i], np.inf)
+                service[:, i] = masked.argmin(axis=1)
+                inbound[:, i] = best_of[i][rows, service[:, i]] + si_min[i]
+        for j in downstream[k]:
+            if parent[j] == k:
+                # SI_j >= S_k, cheapest first
+                grid = np.arange(si_min[j], si_max[j] + 1)
+                masked = np.where(grid[None, :] >= service[:, k, None], cost_of[j], np.inf)
+                si_index = masked.argmin(axis=1)
+                inbound[:, j] = si_index + si_min[j]
+                service[:, j] = best_of[j][rows, si_index]
+
+    # The DP lets SI exceed the slowest supplier; the actual inbound time is that maximum
+    for k in range(n_nodes):
+        if upstream[k]:
+            inbound[:, k] = service[:, upstream[k]].max(axis=1)
+        else:
+            inbound[:, k] = supply_service_days
+    net = np.maximum(inbound + lead_time - service, 0)
+    safety_stock = z[:, None] * pooled_std * np.sqrt(net)
+    # S = 0 everywhere: inbound service is 0, except from the outside supplier
+    single_net = lead_time + np.where([not upstream[k] for k in range(n_nodes)], supply_service_days, 0)
+    single_safety_stock = z[:, None] * pooled_std * np.sqrt(single_net)
+    result = {
+        'service_days': service,
+        'inbound_service_days': inbound,
+        'net_replenishment_days': net,
+        'pooled_daily_std_dev': pooled_std,
+        'safety_stock': safety_stock,
+        'holding_cost_annual': holding * safety_stock,
+        'single_echelon_safety_stock': single_safety_stock,
+        'single_echelon_holding_cost_annual': holding * single_safety_stock,
+    }
+    result['holding_cost_annual_total'] = result['holding_cost_annual'].sum(axis=1)
+    result['single_echelon_holding_cost_annual_total'] = result['single_echelon_holding_cost_annual'].sum(axis=1)
+    if single_sku:
+        result = {name: values[0] for name, values in result.items()}
+    return result
+
+
+def echelon_frame(nodes, service_level, sku_column='sku', customer_service_days=0, supply_service_days=0):
+    """
+    guaranteed_service for a node table: one row per node (and SKU) with
+    columns node, upstream (empty for nodes supplied from outside) and
+    lead_time_days, holding_cost_per_unit or unit_cost and
+    holding_cost_pct, and annual_demand and demand_variability for nodes
+    with customers. With a `sku_column`, every SKU must have the same
+    nodes, upstream nodes and lead times. A row names one upstream node, so
+    the table describes distribution networks and serial lines; an
+    assembly node with several suppliers raises ValueError (pass its edges
+    to guaranteed_service instead).
+
+    Returns (plan, totals): the rows with the ECHELON_COLUMNS appended, and
+    the network holding cost against the single-echelon one per SKU.
+    """
+    import pandas as pd
+
+    from eoq_engine import DAYS_PER_YEAR
+
+    missing = [col for col in ('node', 'upstream', 'lead_time_days') if col not in nodes.columns]
+    if missing:
+        raise ValueError(f"missing network columns: {', '.join(missing)}")
+    if nodes.empty:
+        raise ValueError("the node table has no rows")
+    frame = nodes.copy()
+    if sku_column not in frame.columns:
+        frame[sku_column] = ''
+    frame['node'] = frame['node'].astype(str)
+    frame['upstream'] = frame['upstream'].fillna('').astype(str)
+    if 'holding_cost_per_unit' not in frame.columns:
+        if not {'unit_cost', 'holding_cost_pct'} <= set(frame.columns):
+            raise ValueError("need holding_cost_per_unit, or unit_cost and holding_cost_pct")
+        frame['holding_cost_per_unit'] = frame['unit_cost'] * frame['holding_cost_pct'] / 100
+    demand = frame['annual_demand'].fillna(0) if 'annual_demand' in frame.columns else 0.0
+    variability = frame['demand_variability'].fillna(0) if 'demand_variability' in frame.columns else 0.0
+    frame['_daily_std_dev'] = demand / DAYS_PER_YEAR * variability / 100
+
+    frame = frame.sort_values([sku_column, 'node'], kind='stable').reset_index(drop=True)
+    skus = frame[sku_column].unique()
+    network = frame[frame[sku_column] == skus[0]]
+    labels = network['node'].tolist()
+    if len(set(labels)) != len(labels):
+        repeated = network.loc[network['node'].duplicated(), 'node'].iloc[0]
+        raise ValueError(f"node {repeated} appears in several rows; each node must appear once per SKU with "
+                         "one upstream node, so assembly nodes with several suppliers are not supported here")
+    shape = (len(skus), len(labels))
+    if len(frame) != shape[0] * shape[1]:
+        raise ValueError("every SKU must have the same nodes")
+    for col in ('node', 'upstream', 'lead_time_days'):
+        values = frame[col].to_numpy().reshape(shape)
+        if not (values == values[0]).all():
+            raise ValueError(f"every SKU must have the same {col} per node")
+
+    index = {label: k for k, label in enumerate(labels)}
+    unknown = sorted(set(network['upstream']) - set(index) - {''})
+    if unknown:
+        raise ValueError(f"unknown upstream nodes: {', '.join(unknown)}")
+    edges = [(index[up], index[node]) for node, up in zip(network['node'], network['upstream']) if up]
+
+    result = guaranteed_service(
+        edges, network['lead_time_days'].to_numpy(),
+        frame['holding_cost_per_unit'].to_numpy(dtype=float).reshape(shape),
+        frame['_daily_std_dev'].to_numpy(dtype=float).reshape(shape),
+        np.full(len(skus), service_level, dtype=float), customer_service_days, supply_service_days,
+    )
+    plan = frame.drop(columns='_daily_std_dev')
+    for name in ECHELON_COLUMNS:
+        plan[name] = result[name].ravel()
+    totals = pd.DataFrame({
+        sku_column: skus,
+        'holding_cost_annual': result['holding_cost_annual_total'],
+        'single_echelon_holding_cost_annual': result['single_echelon_holding_cost_annual_total'],
+    })
+    if sku_column not in nodes.columns:
+        plan, totals = plan.drop(columns=sku_column), totals.drop(columns=sku_column)
+    return plan, totals
@@ -0,0 +1,219 @@
+"""
+Vectorized EOQ engine.
+
+All inventory metrics of the calculator as array operations, so one call
+covers a single item from the sidebar or a whole SKU master.
+"""
+
+import numpy as np
+
+INPUT_COLUMNS = (
+    'annual_demand', 'unit_cost', 'order_cost', 'holding_cost_pct',
+    'lead_time_days', 'service_level', 'demand_variability',
+)
+
+METRIC_COLUMNS = (
+    'holding_cost_per_unit', 'eoq', 'daily_demand', 'z_score',
+    'daily_std_dev', 'lead_time_demand_std', 'safety_stock',
+    'average_lead_time_demand', 'reorder_point', 'orders_per_year',
+    'days_between_orders', 'total_order_cost_annual', 'average_inventory',
+    'total_holding_cost_annual', 'total_inventory_cost_annual',
+)
+
+DAYS_PER_YEAR = 365
+
+# Bump whenever a formula changes, so stored results (eoq_store) are recomputed
+ENGINE_VERSION = 1
+
+# Wichura (1988), algorithm AS 241 (PPND16): rational approximations of the
+# inverse normal CDF accurate to about 1e-16, evaluated with Horner's rule.
+_PPF_CENTRAL = (
+    (3.3871328727963666080e0, 1.3314166789178437745e+2, 1.9715909503065514427e+3,
+     1.3731693765509461125e+4, 4.5921953931549871457e+4, 6.7265770927008700853e+4,
+     3.3430575583588128105e+4, 2.5090809287301226727e+3),
+    (1.0, 4.2313330701600911252e+1, 6.8718700749205790830e+2, 5.3941960214247511077e+3,
+     2.1213794301586595867e+4, 3.9307895800092710610e+4, 2.8729085735721942674e+4,
+     5.2264952788528545610e+3),
+)
+_PPF_INTERMEDIATE = (
+    (1.42343711074968357734e0, 4.63033784615654529590e0, 5.76949722146069140550e0,
+     3.64784832476320460504e0, 1.27045825245236838258e0, 2.41780725177450611770e-1,
+     2.27238449892691845833e-2, 7.74545014278341407640e-4),
+    (1.0, 2.05319162663775882187e0, 1.67638483018380384940e0, 6.89767334985100004550e-1,
+     1.48103976427480074590e-1, 1.51986665636164571966e-2, 5.47593808499534494600e-4,
+     1.05075007164441684324e-9),
+)
+_PPF_TAIL = (
+    (6.65790464350110377720e0, 5.46378491116411436990e0, 1.78482653991729133580e0,
+     2.96560571828504891230e-1, 2.65321895265761230930e-2, 1.24266094738807843860e-3,
+     2.71155556874348757815e-5, 2.01033439929228813265e-7),
+    (1.0, 5.99832206555887937690e-1, 1.36929880922735805310e-1, 1.48753612908506148525e-2,
+     7.86869131145613259100e-4, 1.84631831751005468180e-5, 1.42151175831644588870e-7,
+     2.04426310338993978564e-15),
+)
+
+
+def _rational(x, coefficients):
+    numerator, denominator = coefficients
+    num = np.zeros_like(x)
+    den = np.zeros_like(x)
+    for a, b in zip(reversed(numerator), reversed(denominator)):
+        num = num * x + a
+        den = den * x + b
+    return num / den
+
+
+def norm_ppf(p):
+    """Inverse standard normal CDF for probabilities in (0, 1), element-wise."""
+    p = np.asarray(p, dtype=float)
+    q = p - 0.5
+    central = np.abs(q) <= 0.425
+    if np.all(central):
+        return (q * _rational(0.180625 - q * q, _PPF_CENTRAL))[()]
+
+    z = np.empty_like(q)
+    qc = q[central]
+    z[central] = qc * _rational(0.180625 - qc * qc, _PPF_CENTRAL)
+
+    tail = ~central
+    pt = p[tail]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = np.sqrt(-np.log(np.minimum(pt, 1 - pt)))
+        zt = np.where(r <= 5, _rational(r - 1.6, _PPF_INTERMEDIATE), _rational(r - 5, _PPF_TAIL))
+    zt = np.where(np.isinf(r), np.inf, zt)
+    z[tail] = np.copysign(zt, q[tail])
+    return z[()]
+
+
+def service_level_z(service_level):
+    """z-score for service levels given in percent, element-wise."""
+    levels = np.asarray(service_level, dtype=float)
+    if not np.all((levels > 0) & (levels < 100)):
+        raise ValueError("service_level must be strictly between 0 and 100 (%)")
+    return norm_ppf(levels / 100)
+
+
+def calculate(annual_demand, unit_cost, order_cost, holding_cost_pct,
+              lead_time_days, service_level, demand_variability):
+    """
+    Compute every EOQ metric in one broadcast pass.
+
+    Inputs may be scalars or equally shaped (broadcastable) arrays, one
+    element per SKU. Returns a dict keyed by METRIC_COLUMNS.
+    """
+    annual_demand = np.asarray(annual_demand, dtype=float)
+    unit_cost = np.asarray(unit_cost, dtype=float)
+    order_cost = np.asarray(order_cost, dtype=float)
+    lead_time_days = np.asarray(lead_time_days, dtype=float)
+
+    holding_cost_per_unit = unit_cost * (np.asarray(holding_cost_pct, dtype=float) / 100)
+    eoq = np.sqrt((2 * annual_demand * order_cost) / holding_cost_per_unit)
+    daily_demand = annual_demand / DAYS_PER_YEAR
+    z_score = service_level_z(service_level)
+
+    daily_std_dev = daily_demand * (np.asarray(demand_variability, dtype=float) / 100)
+    lead_time_demand_std = daily_std_dev * np.sqrt(lead_time_days)
+    safety_stock = z_score * lead_time_demand_std
+    average_lead_time_demand = daily_demand * lead_time_days
+    reorder_point = average_lead_time_demand + safety_stock
+
+    orders_per_year = annual_demand / eoq
+    days_between_orders = DAYS_PER_YEAR / orders_per_year
+    total_order_cost_annual = orders_per_year * order_cost
+    average_inventory = (eoq / 2) + safety_stock
+    total_holding_cost_annual = average_inventory * holding_cost_per_unit
+    total_inventory_cost_annual = total_order_cost_annual + total_holding_cost_annual
+
+    return {
+        'holding_cost_per_unit': holding_cost_per_unit,
+        'eoq': eoq,
+        'daily_demand': daily_demand,
+        'z_score': z_score,
+        'daily_std_dev': daily_std_dev,
+        'lead_time_demand_std': lead_time_demand_std,
+        'safety_stock': safety_stock,
+        'average_lead_time_demand': average_lead_time_demand,
+        'reorder_point': reorder_point,
+        'orders_per_year': orders_per_year,
+        'days_between_orders': days_between_orders,
+        'total_order_cost_annual': total_order_cost_annual,
+        'average_inventory': average_inventory,
+        'total_holding_cost_annual': total_holding_cost_annual,
+        'total_inventory_cost_annual': total_inventory_cost_annual,
+    }
+
+
+def total_cost_at_quantity(order_qty, annual_demand, order_cost, holding_cost_per_unit, safety_stock):
+    """Annual ordering + holding cost when ordering `order_qty` instead of the EOQ, element-wise."""
+    order_qty = np.asarray(order_qty, dtype=float)
+    return (annual_demand / order_qty) * order_cost + ((order_qty / 2) + safety_stock) * holding_cost_per_unit
+
+
+def calculate_frame(df):
+    """
+    Compute EOQ metrics for a DataFrame with one row per SKU.
+
+    The frame needs every column in INPUT_COLUMNS; the metrics are
+    appended as new columns to a copy of it.
+    """
+    missing = [col for col in INPUT_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"missing input columns: {', '.join(missing)}")
+
+    results = calculate(**{col: df[col].to_numpy() for col in INPUT_COLUMNS})
+    out = df.copy()
+    for name in METRIC_COLUMNS:
+        out[name] = np.broadcast_to(results[name], len(df))
+    return out
+
+
+def inventory_sawtooth(order_qty, safety_stock, daily_demand, lead_time_days, horizon_days):
+    """
+    Breakpoints of the on-hand inventory sawtooth for one or more scenarios.
+
+    On-hand stock follows ss + Q - d * ((t - L) mod T) with cycle T = Q / d:
+    it peaks at Q + ss when an order arrives (first at t = L mod T), falls
+    linearly and crosses the reorder point d * L + ss, T - L days after each
+    arrival (when L >= T the trigger is on inventory position and coincides
+    with the arrival on the on-hand curve). Only those points are emitted — start, trough and peak at every
+    arrival, each reorder trigger, end of horizon — so a straight-line plot
+    through them is exact for any horizon.
+
+    Parameters broadcast against each other, one element per scenario.
+    Returns (times, levels), both shaped (n_scenarios, n_points) with the
+    same number of points per row; points past the horizon collapse onto
+    the final one.
+    """
+    order_qty, safety_stock, daily_demand, lead_time_days, horizon_days = (
+        np.atleast_1d(a).astype(float) for a in np.broadcast_arrays(
+            order_qty, safety_stock, daily_demand, lead_time_days, horizon_days)
+    )
+    cycle = order_qty / daily_demand
+    peak = safety_stock + order_qty
+
+    def level_at(t):
+        return peak[:, None] - daily_demand[:, None] * np.mod(t - lead_time_days[:, None], cycle[:, None])
+
+    n_cycles = int(np.ceil(np.max(horizon_days / cycle))) + 1
+    arrivals = (np.mod(lead_time_days, cycle)[:, None]
+                + cycle[:, None] * np.arange(n_cycles)[None, :])
+    trigger_offset = np.clip(cycle - lead_time_days, 0, cycle)
+    triggers = arrivals + trigger_offset[:, None]
+
+    n = len(cycle)
+    event_times = np.stack([arrivals, arrivals, triggers], axis=2).reshape(n, -1)
+    event_levels = np.stack([
+        np.broadcast_to(safety_stock[:, None], arrivals.shape),
+        np.broadcast_to(peak[:, None], arrivals.shape),
+        np.broadcast_to((peak - daily_demand * trigger_offset)[:, None], arrivals.shape),
+    ], axis=2).reshape(n, -1)
+
+    start = np.zeros((n, 1))
+    end = horizon_days[:, None]
+    times = np.concatenate([start, event_times, end], axis=1)
+    levels = np.concatenate([level_at(start), event_levels, level_at(end)], axis=1)
+
+    past_horizon = times > end
+    times = np.where(past_horizon, end, times)
+    levels = np.where(past_horizon, level_at(end), levels)
+    return times, levels
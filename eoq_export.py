@@ -0,0 +1,132 @@
+"""
+Typed result export.
+
+Results stay numeric from the engine to the file: Parquet, Arrow IPC
+(loadable zero-copy with a memory map) or a plain CSV of unformatted
+numbers. Formatting is left to whoever displays the data. Files are
+written chunk by chunk, so a portfolio never has to be in memory at once.
+"""
+
+import io
+import os
+
+# file extension and MIME type per format
+EXPORT_FORMATS = {
+    'parquet': ('.parquet', 'application/vnd.apache.parquet'),
+    'arrow': ('.arrow', 'application/vnd.apache.arrow.file'),
+    'csv': ('.csv', 'text/csv'),
+}
+
+
+class ResultWriter:
+    """
+    Append result chunks to a Parquet, Arrow IPC or CSV file.
+
+    `sink` is a path, whose extension picks the format unless `file_format`
+    is given, or a binary file-like object. A pyarrow `schema` fixes the
+    columns and types up front; otherwise the first chunk does. A later
+    chunk whose column types differ is cast to it where no value changes
+    (e.g. integers into a float column, an all-missing column into any
+    type); otherwise write raises ValueError naming the column. Closing a
+    writer that got no chunks still writes a file: the schema's columns
+    (if known) and no rows.
+    """
+
+    def __init__(self, sink, file_format=None, schema=None):
+        # Imported here so the formats table can be imported without pandas
+        from eoq_batch import detect_format
+
+        self.sink = sink
+        self.file_format = file_format or detect_format(sink)
+        if self.file_format not in EXPORT_FORMATS:
+            raise ValueError(f"unsupported export format: {self.file_format}")
+        self._writer = None
+        self._schema = schema
+        self._csv = None
+
+    def write(self, chunk):
+        if self.file_format == 'csv':
+            if self._csv is None:
+                self._open_csv()
+                chunk.to_csv(self._csv, index=False)
+            else:
+                chunk.to_csv(self._csv, index=False, header=False)
+            return
+
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if self._schema is not None and not table.schema.equals(self._schema):
+            table = self._conform(table)
+        if self._writer is None:
+            self._open_table(table.schema)
+        self._writer.write_table(table)
+
+    def _open_csv(self):
+        is_path = isinstance(self.sink, (str, os.PathLike))
+        self._csv = open(os.fspath(self.sink), 'wb') if is_path else self.sink
+
+    def _open_table(self, schema):
+        import pyarrow as pa
+
+        self._schema = schema
+        if self.file_format == 'parquet':
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(self.sink, schema)
+        else:
+            self._writer = pa.ipc.new_file(self.sink, schema)
+
+    def _conform(self, table):
+        """`table` with the columns and types of the schema, cast without losing values."""
+        import pyarrow as pa
+
+        if set(table.column_names) != set(self._schema.names):
+            raise ValueError(f"chunk columns {table.column_names} differ from the first chunk's {self._schema.names}")
+        columns = []
+        for field in self._schema:
+            column = table[field.name]
+            if column.type != field.type:
+                try:
+                    column = column.cast(field.type, safe=True)
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                    raise ValueError(
+                        f"column {field.name!r} is {column.type} in this chunk but {field.type} in the first "
+                        f"one; give it one type for the whole file (e.g. read it as text)") from None
+            columns.append(column)
+        return pa.Table.from_arrays(columns, schema=self._schema)
+
+    def close(self):
+        if self._writer is None and self._csv is None:
+            self._write_empty()
+        if self._writer is not None:
+            self._writer.close()
+        if self._csv is not None and self._csv is not self.sink:
+            self._csv.close()
+
+    def _write_empty(self):
+        """Open the file without rows, with the schema's columns if there is one."""
+        import pyarrow as pa
+
+        schema = self._schema if self._schema is not None else pa.schema([])
+        if self.file_format == 'csv':
+            self._open_csv()
+            if schema.names:
+                schema.empty_table().to_pandas().to_csv(self._csv, index=False)
+        else:
+            self._open_table(schema)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def export_bytes(chunks, file_format):
+    """The whole file for an iterable of result chunks, e.g. for a download button."""
+    buffer = io.BytesIO()
+    with ResultWriter(buffer, file_format) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return buffer.getvalue()
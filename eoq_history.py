@@ -0,0 +1,187 @@
+"""
+Demand statistics from daily sales history.
+
+Sales files have one row per sale or per SKU and day (date, quantity);
+rows of the same SKU and day are totalled, so each day counts once, and
+days without sales may be left out and are filled in as zeros. Files are
+read in chunks, so their size is bounded by disk rather than memory: each
+chunk is reduced to a count, mean and sum of squared deviations per SKU
+and merged into the running totals with the pairwise update of Chan et
+al., which stays accurate where a running sum of squares would cancel.
+
+A SKU's latest day may continue in the next chunk, so its total is held
+back until a later day shows up. A day that comes back after a later one
+cannot be told apart from a repeated day, so across chunks each SKU's rows
+must come in date order, as in a file sorted by date or by SKU and date.
+
+The result feeds the engine directly: `annual_demand` and
+`demand_variability` (coefficient of variation of daily demand, %) are
+the engine's input columns.
+"""
+
+import numpy as np
+import pandas as pd
+
+from eoq_batch import DEFAULT_CHUNKSIZE, detect_format, read_sku_chunks
+from eoq_engine import DAYS_PER_YEAR
+
+_NO_DAY = np.iinfo(np.int64).min
+HISTORY_COLUMNS = ('days', 'first_date', 'mean_daily', 'std_daily', 'annual_demand', 'demand_variability')
+
+
+def _merge(count, mean, m2, n, chunk_mean, chunk_m2):
+    """Chan et al. pairwise update of (count, mean, M2) with another group's."""
+    total = count + n
+    delta = chunk_mean - mean
+    with np.errstate(invalid='ignore', divide='ignore'):
+        share = np.where(total > 0, n / total, 0.0)
+    return total, mean + delta * share, m2 + chunk_m2 + delta * delta * count * share
+
+
+class DemandAccumulator:
+    """
+    Running per-SKU count, mean and M2 of daily demand over any number of
+    chunks, plus each SKU's latest day and its total so far.
+    """
+
+    def __init__(self):
+        self.skus = pd.Index([], dtype=object)
+        self.count = np.zeros(0)
+        self.mean = np.zeros(0)
+        self.m2 = np.zeros(0)
+        self.first_day = np.zeros(0, dtype=np.int64)
+        self.pending_day = np.zeros(0, dtype=np.int64)
+        self.pending_qty = np.zeros(0)
+        self.last_day = None
+
+    def _codes(self, labels):
+        """Running index of each of the (unique) labels, adding new SKUs."""
+        codes = self.skus.get_indexer(labels)
+        new = codes < 0
+        if new.any():
+            grow = int(new.sum())
+            self.skus = self.skus.append(labels[new])
+            self.count = np.concatenate([self.count, np.zeros(grow)])
+            self.mean = np.concatenate([self.mean, np.zeros(grow)])
+            self.m2 = np.concatenate([self.m2, np.zeros(grow)])
+            self.first_day = np.concatenate([self.first_day, np.full(grow, np.iinfo(np.int64).max)])
+            self.pending_day = np.concatenate([self.pending_day, np.full(grow, _NO_DAY)])
+            self.pending_qty = np.concatenate([self.pending_qty, np.zeros(grow)])
+            codes[new] = np.arange(len(self.skus) - grow, len(self.skus))
+        return codes
+
+    def update(self, skus, days, quantities):
+        """Add one chunk: SKU labels, days (datetime64[D] or day numbers) and quantities."""
+        quantities = np.asarray(quantities, dtype=float)
+        if len(quantities) == 0:
+            return
+        if np.any(np.isnan(quantities)):
+            raise ValueError("sales quantities must not be missing")
+        days = np.asarray(days).astype('datetime64[D]').astype(np.int64)
+
+        # Only the chunk's distinct SKUs are looked up in the running index
+        local, labels = pd.factorize(skus)
+        touched = self._codes(pd.Index(labels, dtype=object).astype(str))
+        codes = touched[local]
+        first_day = np.full(len(labels), np.iinfo(np.int64).max)
+        np.minimum.at(first_day, local, days)
+        pending = self.pending_day[touched] != _NO_DAY
+        late = touched[pending & (first_day < self.pending_day[touched])]
+        if late.size:
+            raise ValueError(f"sales of SKU {self.skus[late[0]]} go back to an earlier date in a later chunk; "
+                             "sort the sales file by date")
+        held = touched[pending]
+
+        # Daily totals per SKU, including the days held back from earlier chunks;
+        # keys sort by SKU, then day
+        all_days = np.r_[days, self.pending_day[held]]
+        first, span = all_days.min(), all_days.max() - all_days.min() + 1
+        keys, inverse = np.unique(np.r_[codes, held] * span + (all_days - first), return_inverse=True)
+        totals = np.bincount(inverse, weights=np.r_[quantities, self.pending_qty[held]])
+        day_codes = keys // span
+        latest = np.r_[day_codes[1:] != day_codes[:-1], True]
+        self.pending_day[day_codes[latest]] = keys[latest] % span + first
+        self.pending_qty[day_codes[latest]] = totals[latest]
+        self._add(day_codes[~latest], totals[~latest])
+
+        self.first_day[touched] = np.minimum(self.first_day[touched], first_day)
+        last = days.max()
+        self.last_day = last if self.last_day is None else max(self.last_day, last)
+
+    def _add(self, codes, quantities):
+        """Merge daily totals into the running statistics, two-pass within the group."""
+        if len(codes) == 0:
+            return
+        touched, local = np.unique(codes, return_inverse=True)
+        n = np.bincount(local).astype(float)
+        group_mean = np.bincount(local, weights=quantities) / n
+        group_m2 = np.bincount(local, weights=(quantities - group_mean[local]) ** 2)
+        self.count[touched], self.mean[touched], self.m2[touched] = _merge(
+            self.count[touched], self.mean[touched], self.m2[touched], n, group_mean, group_m2)
+
+    def result(self, zero_fill=True):
+        """
+        DataFrame of HISTORY_COLUMNS indexed by SKU.
+
+        With `zero_fill`, every day from a SKU's first sale to the last date
+        in the history counts, days without a row as zero demand; otherwise
+        only the days with rows are used.
+        """
+        held = (self.pending_day != _NO_DAY).astype(float)
+        count, mean, m2 = _merge(self.count, self.mean, self.m2, held, self.pending_qty, 0.0)
+        if zero_fill and len(count):
+            days = (self.last_day - self.first_day + 1).astype(float)
+            count, mean, m2 = _merge(count, mean, m2, days - count, 0.0, 0.0)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(np.where(count > 1, m2 / (count - 1), 0.0))
+            variability = np.where(mean > 0, std / mean * 100, 0.0)
+        return pd.DataFrame({
+            'days': count.astype(np.int64),
+            'first_date': self.first_day.astype('datetime64[D]'),
+            'mean_daily': mean,
+            'std_daily': std,
+            'annual_demand': mean * DAYS_PER_YEAR,
+            'demand_variability': variability,
+        }, index=self.skus.rename('sku'))
+
+
+def read_history(source, file_format=None, sku_column='sku', date_column='date', quantity_column='quantity',
+                 zero_fill=True, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Per-SKU demand statistics from a CSV or Parquet sales file, one chunk at a time.
+
+    `source` is a path or a binary file-like object; the format defaults to
+    the file extension. Only the three named columns are read. Returns the
+    frame of DemandAccumulator.result.
+    """
+    if file_format is None:
+        file_format = detect_format(source)
+    columns = [sku_column, date_column, quantity_column]
+    accumulator = DemandAccumulator()
+    for chunk in read_sku_chunks(source, file_format, chunksize, columns=columns, text_columns=(sku_column,)):
+        accumulator.update(chunk[sku_column],
+                           pd.to_datetime(chunk[date_column]).to_numpy(),
+                           chunk[quantity_column].to_numpy())
+    return accumulator.result(zero_fill)
+
+
+def apply_history(skus, history, sku_column='sku', defaults=None):
+    """
+    Copy of `skus` with annual_demand and demand_variability taken from
+    `history` (see read_history) for every SKU it covers. Other SKUs keep
+    their own values, or take them from `defaults` if the file has no such
+    column; raises ValueError if that leaves a SKU without a value.
+    """
+    if sku_column not in skus.columns:
+        raise ValueError(f"missing SKU column: {sku_column}")
+    defaults = defaults or {}
+    out = skus.copy()
+    matched = history.reindex(out[sku_column].astype(str).to_numpy())
+    for col in ('annual_demand', 'demand_variability'):
+        fallback = out[col].to_numpy(dtype=float) if col in out.columns else defaults.get(col, np.nan)
+        values = np.where(np.isnan(matched[col].to_numpy()), fallback, matched[col].to_numpy())
+        if np.any(np.isnan(values)):
+            raise ValueError(f"no history and no {col} for some SKUs")
+        out[col] = values
+    return out
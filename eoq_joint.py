@@ -0,0 +1,247 @@
+"""
+Joint replenishment of SKUs that share a supplier.
+
+Every order to a supplier pays one major cost S plus a minor cost s_i for
+each item on it. Items are ordered on a common base cycle T, item i every
+k_i cycles, for an annual cost of
+
+    C(T) = S / T + sum(min_k s_i / (k * T) + h_i * D_i * k * T / 2)
+
+For a given T each item's best multiple has a closed form, so C(T) costs
+one pass over the items. The base cycle is searched on a log grid below
+the all-items-every-cycle cycle, refined by golden section, and finished
+with the classic alternation (best T for the multiples, best multiples for
+T) until the cost stops falling. All suppliers are searched together, with
+per-supplier sums done by np.bincount, so suppliers with thousands of
+items cost no more than a few dozen passes over the item arrays.
+
+C(T) is piecewise, with a break wherever an item's best multiple changes,
+so that search can stop in a local minimum (about 1% above the optimum at
+worst in tests). It is followed by an exact sweep. Every item's cost is at
+least sqrt(2 s_i h_i D_i) whatever T is, so with the cost U found so far
+the optimum lies in
+
+    S / (U - sum(sqrt(2 s_i h_i D_i))) <= T <= k = 1 cycle
+
+Between consecutive breakpoints in that range, the multiples are fixed
+and C(T) = A / T + B T, whose minimum has a closed form. The sweep walks the
+breakpoints in order, updates A and B with cumulative sums, and takes the
+best piece. That is the exact optimum for suppliers with a major cost.
+Without one, the items are independent, the cost falls towards its bound as
+T shrinks, and the search result stands.
+"""
+
+import numpy as np
+
+from eoq_engine import DAYS_PER_YEAR
+
+DEFAULT_MAX_ITER = 100
+
+_GRID_POINTS = 16
+_GRID_SPAN = 1e-4  # smallest base cycle searched, relative to the k = 1 cycle
+_GOLDEN = (np.sqrt(5) - 1) / 2
+_MAX_BREAKPOINTS = 2_000_000  # per sweep; suppliers are swept in batches up to this size
+
+
+def _best_multiple(minor_cost, demand_holding, base_cycle):
+    """Smallest integer k >= 1 with k * (k + 1) >= 2 s / (h D T^2), the optimum for fixed T."""
+    x = 2 * minor_cost / (demand_holding * base_cycle ** 2)
+    return np.maximum(np.ceil((np.sqrt(1 + 4 * x) - 1) / 2), 1)
+
+
+def _sweep_breakpoints(codes, minor_cost, demand_holding, major, lower, upper, first, last):
+    """
+    Exact best base cycle in [lower, upper] per supplier, for the items'
+    best multiples running from first (at upper) to last (at lower).
+    """
+    n_suppliers = len(major)
+    counts = (last - first).astype(np.int64)
+    item = np.repeat(np.arange(len(codes)), counts)
+    step = np.arange(len(item)) - np.repeat(np.cumsum(counts) - counts, counts)
+    k = first[item] + step
+    # The multiple of `item` goes from k to k + 1 as T falls below the breakpoint
+    breakpoint = np.sqrt(2 * minor_cost[item] / (demand_holding[item] * k * (k + 1)))
+    supplier = codes[item].astype(np.int32)
+    # By supplier, falling T within one; a stable sort on small ints is a radix sort
+    order = np.argsort(-breakpoint)
+    order = order[np.argsort(supplier[order], kind='stable')]
+    item, k, breakpoint, supplier = item[order], k[order], breakpoint[order], supplier[order]
+
+    # Pieces in falling T: the one at `upper`, then one after every breakpoint
+    base_a = major + np.bincount(codes, weights=minor_cost / first, minlength=n_suppliers)
+    base_b = np.bincount(codes, weights=demand_holding * first / 2, minlength=n_suppliers)
+    delta_a = minor_cost[item] / (k + 1) - minor_cost[item] / k
+    delta_b = demand_holding[item] / 2
+    per_supplier = np.bincount(supplier, minlength=n_suppliers)
+    offsets = np.repeat(np.cumsum(per_supplier) - per_supplier, per_supplier)
+    cum_a, cum_b = np.cumsum(delta_a), np.cumsum(delta_b)
+    # Segmented cumulative sums: subtract everything before the supplier's first breakpoint
+    before_a = np.r_[0.0, cum_a][offsets]
+    before_b = np.r_[0.0, cum_b][offsets]
+    is_last = np.r_[supplier[1:] != supplier[:-1], True] if len(supplier) else np.zeros(0, bool)
+    next_breakpoint = np.where(is_last, lower[supplier], np.r_[breakpoint[1:], 0.0])
+    first_breakpoint = np.full(n_suppliers, -np.inf)
+    np.maximum.at(first_breakpoint, supplier, breakpoint)
+
+    piece_supplier = np.r_[np.arange(n_suppliers), supplier]
+    piece_a = np.r_[base_a, base_a[supplier] + cum_a - before_a]
+    piece_b = np.r_[base_b, base_b[supplier] + cum_b - before_b]
+    piece_hi = np.r_[upper, breakpoint]
+    piece_lo = np.r_[np.maximum(first_breakpoint, lower), next_breakpoint]
+    cycle = np.clip(np.sqrt(piece_a / piece_b), piece_lo, piece_hi)
+    cost = piece_a / cycle + piece_b * cycle
+
+    order = np.lexsort((cost, piece_supplier))
+    chosen = order[np.r_[True, piece_supplier[order][1:] != piece_supplier[order][:-1]]]
+    best = np.empty(n_suppliers)
+    best[piece_supplier[chosen]] = cycle[chosen]
+    return best
+
+
+def joint_replenishment(supplier, annual_demand, holding_cost_per_unit, major_cost, minor_cost,
+                        safety_stock=0.0, max_iter=DEFAULT_MAX_ITER, rtol=1e-9):
+    """
+    Base cycle per supplier and order multiple per item.
+
+    `supplier` holds one label per item; `major_cost` is given per item but
+    must be the same for all items of a supplier. Returns (items, suppliers):
+    per-item arrays 'multiple', 'order_qty', 'cycle_days' and
+    'independent_qty' (own EOQ paying S + s_i per order), and per-supplier
+    arrays 'supplier', 'items', 'base_cycle_days', 'joint_cost_annual' and
+    'independent_cost_annual', both costs including safety stock holding.
+    """
+    labels, codes = np.unique(np.asarray(supplier), return_inverse=True)
+    codes = codes.ravel()
+    n, n_suppliers = len(codes), len(labels)
+    annual_demand, holding_cost_per_unit, major_cost, minor_cost, safety_stock = (
+        np.broadcast_to(np.asarray(a, dtype=float), (n,))
+        for a in (annual_demand, holding_cost_per_unit, major_cost, minor_cost, safety_stock)
+    )
+
+    major = np.zeros(n_suppliers)
+    major[codes] = major_cost
+    if not np.allclose(major[codes], major_cost):
+        raise ValueError("major_cost must be the same for all items of a supplier")
+
+    def per_supplier(weights):
+        return np.bincount(codes, weights=weights, minlength=n_suppliers)
+
+    demand_holding = annual_demand * holding_cost_per_unit
+
+    def cost_at(multiple, base_cycle):
+        item_cycle = multiple * base_cycle[codes]
+        return major / base_cycle + per_supplier(minor_cost / item_cycle + demand_holding * item_cycle / 2)
+
+    def cost_at_cycle(log_cycle):
+        base_cycle = np.exp(log_cycle)
+        return cost_at(_best_multiple(minor_cost, demand_holding, base_cycle[codes]), base_cycle)
+
+    def best_cycle(multiple):
+        return np.sqrt(2 * (major + per_supplier(minor_cost / multiple)) / per_supplier(demand_holding * multiple))
+
+    # Larger multiples only shorten the optimal base cycle, so the k = 1
+    # cycle bounds the search from above
+    top = np.log(best_cycle(np.ones(n)))
+    grid = top + np.linspace(np.log(_GRID_SPAN), 0, _GRID_POINTS)[:, None]
+    best = np.argmin([cost_at_cycle(log_cycle) for log_cycle in grid], axis=0)
+    columns = np.arange(n_suppliers)
+    lo = grid[np.maximum(best - 1, 0), columns]
+    hi = grid[np.minimum(best + 1, _GRID_POINTS - 1), columns]
+
+    # Golden section on log T inside the bracket around the best grid point
+    x1, x2 = hi - _GOLDEN * (hi - lo), lo + _GOLDEN * (hi - lo)
+    f1, f2 = cost_at_cycle(x1), cost_at_cycle(x2)
+    while n_suppliers and np.max(hi - lo) > rtol:
+        left = f1 < f2
+        lo, hi = np.where(left, lo, x1), np.where(left, x2, hi)
+        probe = np.where(left, hi - _GOLDEN * (hi - lo), lo + _GOLDEN * (hi - lo))
+        f_probe = cost_at_cycle(probe)
+        x1, x2 = np.where(left, probe, x2), np.where(left, x1, probe)
+        f1, f2 = np.where(left, f_probe, f2), np.where(left, f1, f_probe)
+
+    # Polish: alternate best cycle and best multiples while the cost falls;
+    # a supplier is frozen once a round no longer lowers its cost
+    multiple = _best_multiple(minor_cost, demand_holding, np.exp((lo + hi) / 2)[codes])
+    base_cycle = best_cycle(multiple)
+    cost = cost_at(multiple, base_cycle)
+    for _ in range(max_iter):
+        updated = _best_multiple(minor_cost, demand_holding, base_cycle[codes])
+        new_cycle = best_cycle(updated)
+        new_cost = cost_at(updated, new_cycle)
+        improved = new_cost < cost * (1 - rtol)
+        if not improved.any():
+            break
+        multiple = np.where(improved[codes], updated, multiple)
+        base_cycle = np.where(improved, new_cycle, base_cycle)
+        cost = np.where(improved, new_cost, cost)
+
+    # Exact sweep over the breakpoints between the lower bound and the k = 1 cycle
+    gap = cost - per_supplier(np.sqrt(2 * minor_cost * demand_holding))
+    sweep = (major > 0) & (gap > cost * rtol)
+    upper = np.exp(top)
+    lower = np.where(sweep, major / np.where(sweep, gap, 1), upper)
+    first = _best_multiple(minor_cost, demand_holding, upper[codes])
+    last = np.where(sweep[codes], _best_multiple(minor_cost, demand_holding, lower[codes]), first)
+    breakpoints = per_supplier(last - first)
+    batch = np.floor(np.cumsum(breakpoints) / _MAX_BREAKPOINTS)
+    for number in np.unique(batch[sweep]):
+        suppliers_in = sweep & (batch == number)
+        items_in = suppliers_in[codes]
+        in_batch = np.flatnonzero(suppliers_in)
+        local = np.searchsorted(in_batch, codes[items_in])
+        swept = _sweep_breakpoints(local, minor_cost[items_in], demand_holding[items_in], major[in_batch],
+                                   lower[in_batch], upper[in_batch], first[items_in], last[items_in])
+        candidate = base_cycle.copy()
+        candidate[in_batch] = swept
+        updated = _best_multiple(minor_cost, demand_holding, candidate[codes])
+        new_cost = cost_at(updated, candidate)
+        improved = suppliers_in & (new_cost < cost)
+        multiple = np.where(improved[codes], updated, multiple)
+        base_cycle = np.where(improved, candidate, base_cycle)
+        cost = np.where(improved, new_cost, cost)
+
+    safety_holding = per_supplier(safety_stock * holding_cost_per_unit)
+    independent_order_cost = major[codes] + minor_cost
+    independent_cost = per_supplier(np.sqrt(2 * independent_order_cost * demand_holding)) + safety_holding
+    item_cycle = multiple * base_cycle[codes]
+
+    items = {
+        'multiple': multiple.astype(np.int64),
+        'order_qty': annual_demand * item_cycle,
+        'cycle_days': item_cycle * DAYS_PER_YEAR,
+        'independent_qty': np.sqrt(2 * annual_demand * independent_order_cost / holding_cost_per_unit),
+    }
+    suppliers = {
+        'supplier': labels,
+        'items': np.bincount(codes, minlength=n_suppliers),
+        'base_cycle_days': base_cycle * DAYS_PER_YEAR,
+        'joint_cost_annual': cost + safety_holding,
+        'independent_cost_annual': independent_cost,
+    }
+    return items, suppliers
+
+
+def joint_frame(skus, supplier_column='supplier', major_cost_column='major_order_cost'):
+    """
+    Joint replenishment for a frame of engine results (see calculate_frame).
+
+    `order_cost` is taken as the minor cost per item and line. Returns a
+    copy of `skus` with joint_multiple, joint_order_qty and joint_cycle_days
+    added, and a frame with one row per supplier.
+    """
+    import pandas as pd
+
+    missing = [col for col in (supplier_column, major_cost_column) if col not in skus.columns]
+    if missing:
+        raise ValueError(f"missing joint replenishment columns: {', '.join(missing)}")
+
+    items, suppliers = joint_replenishment(
+        skus[supplier_column].to_numpy(), skus['annual_demand'].to_numpy(),
+        skus['holding_cost_per_unit'].to_numpy(), skus[major_cost_column].to_numpy(),
+        skus['order_cost'].to_numpy(), skus['safety_stock'].to_numpy(),
+    )
+    out = skus.copy()
+    out['joint_multiple'] = items['multiple']
+    out['joint_order_qty'] = items['order_qty']
+    out['joint_cycle_days'] = items['cycle_days']
+    return out, pd.DataFrame(suppliers)
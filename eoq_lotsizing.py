@@ -0,0 +1,203 @@
+"""
+Dynamic lot sizing for time-varying demand.
+
+Demand is a vector of per-period quantities, or a (n_skus, n_periods)
+array to plan many SKUs at once; order and holding costs are per order and
+per unit and period. Orders arrive at the start of their period, nothing
+may be short, and holding is charged on end-of-period stock.
+
+Wagner-Whitin is solved exactly in O(n_periods) per SKU. With cumulative
+demand D_t and W_t = sum(k * d_k), the cost of covering periods j..t with
+one order in j is S + h * ((W_t - W_{j-1}) - j * (D_t - D_{j-1})), so
+
+    F(t) = h * W_t + min_j (F(j-1) + S - h * W_{j-1} + h * j * D_{j-1}) - h * j * D_t
+
+is the lower envelope of lines with slope -h * j queried at D_t. Slopes
+fall and queries rise, so a monotone deque (convex hull trick) finds every
+minimum in amortized constant time. All SKUs step through the periods
+together with one deque per SKU held in 2-D arrays.
+"""
+
+import numpy as np
+
+PLAN_COLUMNS = ('orders', 'setup_cost', 'holding_cost', 'total_cost')
+
+
+def _as_batch(demand, order_cost, holding_cost):
+    demand = np.asarray(demand, dtype=float)
+    single = demand.ndim == 1
+    demand = np.atleast_2d(demand)
+    if demand.ndim != 2:
+        raise ValueError("demand must be a vector or an (n_skus, n_periods) array")
+    if np.any(demand < 0):
+        raise ValueError("demand must be non-negative")
+    n = demand.shape[0]
+    order_cost = np.broadcast_to(np.asarray(order_cost, dtype=float), (n,))
+    holding_cost = np.broadcast_to(np.asarray(holding_cost, dtype=float), (n,))
+    if np.any(holding_cost <= 0):
+        raise ValueError("holding_cost must be positive")
+    return demand, order_cost, holding_cost, single
+
+
+def plan_cost(demand, orders, order_cost, holding_cost):
+    """
+    Setup, holding and total cost of an order plan, per SKU.
+
+    Returns a dict keyed by PLAN_COLUMNS, including the plan itself. Raises
+    ValueError if the plan runs short in any period.
+    """
+    demand, order_cost, holding_cost, single = _as_batch(demand, order_cost, holding_cost)
+    orders = np.broadcast_to(np.asarray(orders, dtype=float), demand.shape)
+    stock = np.cumsum(orders - demand, axis=1)
+    if np.any(stock < -1e-9 * np.maximum(demand.sum(axis=1, keepdims=True), 1)):
+        raise ValueError("order plan does not cover demand")
+
+    setup = order_cost * np.count_nonzero(orders > 0, axis=1)
+    holding = holding_cost * np.maximum(stock, 0).sum(axis=1)
+    plan = {
+        'orders': orders,
+        'setup_cost': setup,
+        'holding_cost': holding,
+        'total_cost': setup + holding,
+    }
+    return {name: value[0] for name, value in plan.items()} if single else plan
+
+
+def wagner_whitin(demand, order_cost, holding_cost):
+    """Cost-optimal order plan (Wagner-Whitin) per SKU; see plan_cost for the result."""
+    demand, order_cost, holding_cost, single = _as_batch(demand, order_cost, holding_cost)
+    n, periods = demand.shape
+    rows = np.arange(n)
+
+    # 1-based periods: index 0 holds the empty prefix
+    t_index = np.arange(periods + 1)
+    cum_demand = np.zeros((n, periods + 1))
+    cum_weighted = np.zeros((n, periods + 1))
+    np.cumsum(demand, axis=1, out=cum_demand[:, 1:])
+    np.cumsum(demand * t_index[1:], axis=1, out=cum_weighted[:, 1:])
+
+    best = np.zeros((n, periods + 1))
+    intercept = np.zeros((n, periods + 1))
+    pred = np.zeros((n, periods + 1), dtype=np.int64)
+    h = holding_cost
+
+    deque = np.zeros((n, periods), dtype=np.int64)
+    head = np.zeros(n, dtype=np.int64)
+    tail = np.zeros(n, dtype=np.int64)
+
+    def value(line, x):
+        return intercept[rows, line] - h * line * x
+
+    for t in range(1, periods + 1):
+        # Line t: an order placed in period t
+        intercept[:, t] = (best[:, t - 1] + order_cost - h * cum_weighted[:, t - 1]
+                           + h * t * cum_demand[:, t - 1])
+
+        # Drop tail lines the new one makes redundant: l2 is dominated if
+        # l1 and t intersect no later than l1 and l2 (slopes are -h * j)
+        while True:
+            l1 = deque[rows, np.maximum(tail - 2, 0)]
+            l2 = deque[rows, np.maximum(tail - 1, 0)]
+            drop = (tail - head >= 2) & (
+                (intercept[:, t] - intercept[rows, l1]) * (l2 - l1)
+                <= (intercept[rows, l2] - intercept[rows, l1]) * (t - l1)
+            )
+            if not drop.any():
+                break
+            tail -= drop
+        deque[rows, tail] = t
+        tail += 1
+
+        # Queries D_t only grow, so lines at the head never come back
+        x = cum_demand[:, t]
+        while True:
+            first = deque[rows, head]
+            second = deque[rows, np.minimum(head + 1, periods - 1)]
+            advance = (tail - head >= 2) & (value(second, x) <= value(first, x))
+            if not advance.any():
+                break
+            head += advance
+
+        j = deque[rows, head]
+        # Leading periods without demand need no order at all
+        no_demand = x == 0
+        pred[:, t] = np.where(no_demand, t, j)
+        best[:, t] = np.where(no_demand, 0.0, h * cum_weighted[:, t] + value(j, x))
+
+    # Walk the predecessors back from the last period
+    orders = np.zeros((n, periods))
+    t = np.full(n, periods)
+    active = t > 0
+    while active.any():
+        r = rows[active]
+        j = pred[r, t[r]]
+        orders[r, j - 1] = cum_demand[r, t[r]] - cum_demand[r, j - 1]
+        t[r] = j - 1
+        active = t > 0
+
+    return plan_cost(demand[0] if single else demand, orders[0] if single else orders,
+                     order_cost, holding_cost)
+
+
+def silver_meal(demand, order_cost, holding_cost):
+    """
+    Silver-Meal heuristic: extend each order while the cost per period it
+    covers keeps falling. One pass over the periods, all SKUs together.
+    """
+    demand, order_cost, holding_cost, single = _as_batch(demand, order_cost, holding_cost)
+    n, periods = demand.shape
+    rows = np.arange(n)
+
+    orders = np.zeros((n, periods))
+    start = np.zeros(n, dtype=np.int64)
+    run_cost = np.zeros(n)
+    active = np.zeros(n, dtype=bool)
+    for t in range(periods):
+        d = demand[:, t]
+        covered = t - start
+        extended = run_cost + holding_cost * covered * d
+        with np.errstate(divide='ignore', invalid='ignore'):
+            worse = extended / (covered + 1) > run_cost / covered
+        new_order = (~active & (d > 0)) | (active & worse)
+
+        start = np.where(new_order, t, start)
+        run_cost = np.where(new_order, order_cost, np.where(active, extended, run_cost))
+        active |= new_order
+        orders[rows[active], start[active]] += d[active]
+
+    return plan_cost(demand[0] if single else demand, orders[0] if single else orders,
+                     order_cost, holding_cost)
+
+
+def eoq_policy(demand, order_cost, holding_cost, order_cycle=None):
+    """
+    EOQ on the same demand, as a fixed order cycle (periodic order
+    quantity): every `order_cycle` periods, order what those periods need.
+    The default cycle is the EOQ of the mean demand per period in whole
+    periods, so seasonal demand changes the lot size but not the timing.
+    """
+    demand, order_cost, holding_cost, single = _as_batch(demand, order_cost, holding_cost)
+    n, periods = demand.shape
+    if order_cycle is None:
+        mean_demand = demand.mean(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            order_cycle = np.sqrt(2 * order_cost / (mean_demand * holding_cost))
+    order_cycle = np.broadcast_to(np.asarray(order_cycle, dtype=float), (n,))
+    order_cycle = np.clip(np.nan_to_num(np.round(order_cycle), nan=periods), 1, periods).astype(np.int64)
+
+    cum_demand = np.zeros((n, periods + 1))
+    np.cumsum(demand, axis=1, out=cum_demand[:, 1:])
+    t = np.arange(periods)
+    starts = t % order_cycle[:, None] == 0
+    ends = np.minimum(t + order_cycle[:, None], periods)
+    orders = np.where(starts, np.take_along_axis(cum_demand, ends, axis=1) - cum_demand[:, :-1], 0.0)
+
+    return plan_cost(demand[0] if single else demand, orders[0] if single else orders,
+                     order_cost, holding_cost)
+
+
+LOT_SIZING_METHODS = {
+    'wagner_whitin': wagner_whitin,
+    'silver_meal': silver_meal,
+    'eoq': eoq_policy,
+}
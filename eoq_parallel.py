@@ -0,0 +1,178 @@
+"""
+Deterministic parallel Monte Carlo over a portfolio of SKUs.
+
+Every SKU's (Q, reorder point) policy is simulated with eoq_simulation,
+with random numbers from its own streams: paths are drawn in chunks of
+`chunk_paths`, and chunk c of SKU i uses
+
+    np.random.SeedSequence(seed, spawn_key=(i, c))
+
+which depends on nothing but the root seed and the indices. Paths are
+independent of each other in the simulation, so results are
+bit-identical whichever process computes them, how SKUs are grouped into
+tasks and how many workers there are.
+
+Workers get SKU ranges. Policy inputs and per-SKU results live in
+shared-memory arrays that the workers attach to once; a task is just its
+(start, stop) pair, and nothing but that crosses the process boundary.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from eoq_engine import DAYS_PER_YEAR
+from eoq_simulation import DEFAULT_CHUNK_PATHS, RESULT_COLUMNS, sample_paths, simulate_paths
+
+POLICY_COLUMNS = ('order_qty', 'reorder_point', 'daily_demand', 'daily_std_dev', 'lead_time_days',
+                  'holding_cost_per_unit', 'order_cost', 'lead_time_std')
+SUMMARY_COLUMNS = RESULT_COLUMNS + ('total_cost_p5', 'total_cost_p95')
+
+DEFAULT_BATCH_PATHS = 16_384  # paths stepped through time together
+_TASKS_PER_WORKER = 8
+
+# Views of the shared arrays in a worker process, set by _attach_worker
+_worker = {}
+
+
+def sku_rng(seed, sku, chunk):
+    """Generator for path chunk `chunk` of SKU number `sku`."""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(sku, chunk)))
+
+
+def _simulate_range(policies, out, start, stop, n_paths, horizon_days, seed, chunk_paths, batch_paths):
+    """Summaries of SKUs start..stop-1 into out[start:stop]; rows of `policies` follow POLICY_COLUMNS."""
+    col = {name: policies[start:stop, j] for j, name in enumerate(POLICY_COLUMNS)}
+    initial_inventory = col['order_qty'] + col['reorder_point'] - col['daily_demand'] * col['lead_time_days']
+    results = {name: np.empty((stop - start, n_paths)) for name in RESULT_COLUMNS}
+
+    # (SKU, chunk) units, batched so one simulate_paths call steps many SKUs at once
+    units = [(i, c) for i in range(stop - start) for c in range(math.ceil(n_paths / chunk_paths))]
+    batch, batch_rows = [], 0
+    for index, (i, c) in enumerate(units):
+        size = min(chunk_paths, n_paths - c * chunk_paths)
+        batch.append((i, c, size))
+        batch_rows += size
+        if batch_rows < batch_paths and index + 1 < len(units):
+            continue
+
+        demand, lead_times = zip(*(
+            sample_paths(sku_rng(seed, start + i, c), size, horizon_days, col['daily_demand'][i],
+                         col['daily_std_dev'][i], col['lead_time_days'][i], col['lead_time_std'][i])
+            for i, c, size in batch
+        ))
+        rows = np.repeat([i for i, _, _ in batch], [size for _, _, size in batch])
+        simulated = simulate_paths(np.concatenate(demand), np.concatenate(lead_times), col['order_qty'][rows],
+                                   col['reorder_point'][rows], initial_inventory[rows],
+                                   col['holding_cost_per_unit'][rows], col['order_cost'][rows])
+        offset = 0
+        for i, c, size in batch:
+            for name in RESULT_COLUMNS:
+                results[name][i, c * chunk_paths:c * chunk_paths + size] = simulated[name][offset:offset + size]
+            offset += size
+        batch, batch_rows = [], 0
+
+    for j, name in enumerate(RESULT_COLUMNS):
+        out[start:stop, j] = results[name].mean(axis=1)
+    p5, p95 = np.percentile(results['total_cost'], [5, 95], axis=1)
+    out[start:stop, len(RESULT_COLUMNS)] = p5
+    out[start:stop, len(RESULT_COLUMNS) + 1] = p95
+    return stop - start
+
+
+def _attach(name):
+    from multiprocessing import shared_memory
+
+    # The creating process unlinks the blocks; workers only attach
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13: workers share the creator's resource tracker
+        return shared_memory.SharedMemory(name=name)
+
+
+def _attach_worker(policies_name, out_name, n_skus, settings):
+    policies_block, out_block = _attach(policies_name), _attach(out_name)
+    _worker.update(
+        blocks=(policies_block, out_block),
+        policies=np.ndarray((n_skus, len(POLICY_COLUMNS)), dtype=np.float64, buffer=policies_block.buf),
+        out=np.ndarray((n_skus, len(SUMMARY_COLUMNS)), dtype=np.float64, buffer=out_block.buf),
+        settings=settings,
+    )
+
+
+def _run_task(start, stop):
+    return _simulate_range(_worker['policies'], _worker['out'], start, stop, *_worker['settings'])
+
+
+def simulate_portfolio(policies, n_paths=1_000, horizon_days=DAYS_PER_YEAR, seed=0, workers=1,
+                       chunk_paths=DEFAULT_CHUNK_PATHS, batch_paths=DEFAULT_BATCH_PATHS):
+    """
+    Simulate `n_paths` paths of every SKU's policy and summarize them per SKU.
+
+    `policies` maps POLICY_COLUMNS to one value per SKU (a dict of arrays
+    or a DataFrame; lead_time_std may be left out). Returns a dict of
+    per-SKU arrays keyed by SUMMARY_COLUMNS: the mean of each simulated
+    result and the 5th and 95th percentile of total cost. The same seed,
+    n_paths and chunk_paths give the same results for any `workers`.
+    """
+    if n_paths < 1 or chunk_paths < 1:
+        raise ValueError("n_paths and chunk_paths must be at least 1")
+    columns = []
+    for name in POLICY_COLUMNS:
+        if name in policies:
+            columns.append(np.asarray(policies[name], dtype=float))
+        elif name == 'lead_time_std':
+            columns.append(np.zeros(1))
+        else:
+            raise ValueError(f"missing policy column: {name}")
+    n_skus = max(len(np.atleast_1d(values)) for values in columns)
+    settings = (n_paths, horizon_days, seed, chunk_paths, batch_paths)
+
+    size = max(1, math.ceil(n_skus / (max(workers, 1) * _TASKS_PER_WORKER)))
+    tasks = [(start, min(start + size, n_skus)) for start in range(0, n_skus, size)]
+    if workers <= 1 or len(tasks) <= 1:
+        policy_array = np.column_stack([np.broadcast_to(values, (n_skus,)) for values in columns])
+        out = np.empty((n_skus, len(SUMMARY_COLUMNS)))
+        for start, stop in tasks:
+            _simulate_range(policy_array, out, start, stop, *settings)
+        return {name: out[:, j] for j, name in enumerate(SUMMARY_COLUMNS)}
+
+    from multiprocessing import shared_memory
+
+    policies_block = shared_memory.SharedMemory(create=True, size=max(n_skus * len(POLICY_COLUMNS) * 8, 1))
+    out_block = shared_memory.SharedMemory(create=True, size=max(n_skus * len(SUMMARY_COLUMNS) * 8, 1))
+    policy_array = None
+    try:
+        policy_array = np.ndarray((n_skus, len(POLICY_COLUMNS)), dtype=np.float64, buffer=policies_block.buf)
+        for j, values in enumerate(columns):
+            policy_array[:, j] = values
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_worker,
+                                 initargs=(policies_block.name, out_block.name, n_skus, settings)) as pool:
+            for future in [pool.submit(_run_task, start, stop) for start, stop in tasks]:
+                future.result()
+        out = np.ndarray((n_skus, len(SUMMARY_COLUMNS)), dtype=np.float64, buffer=out_block.buf).copy()
+    finally:
+        del policy_array  # views of a block must be gone before it is closed
+        for block in (policies_block, out_block):
+            block.close()
+            block.unlink()
+    return {name: out[:, j] for j, name in enumerate(SUMMARY_COLUMNS)}
+
+
+def simulate_frame(df, **kwargs):
+    """
+    simulate_portfolio for the engine's results (calculate_frame output):
+    each SKU's EOQ and reorder point. Appends the summaries as sim_* columns
+    to a copy of `df`; keyword arguments go to simulate_portfolio.
+    """
+    policies = {name: df[name].to_numpy(dtype=float) for name in POLICY_COLUMNS
+                if name not in ('order_qty', 'lead_time_std')}
+    policies['order_qty'] = df['eoq'].to_numpy(dtype=float)
+    if 'lead_time_std' in df.columns:
+        policies['lead_time_std'] = df['lead_time_std'].to_numpy(dtype=float)
+    summary = simulate_portfolio(policies, **kwargs)
+    out = df.copy()
+    for name in SUMMARY_COLUMNS:
+        out[f'sim_{name}'] = summary[name]
+    return out
@@ -0,0 +1,319 @@
+"""
+Simulation-based search for (s, S) and (R, s, S) replenishment policies.
+
+Every R days (every day for R = 1, the continuous-review min-max policy)
+inventory position is reviewed, and if it is at or below the reorder level
+s an order brings it back up to S. For every SKU the optimizer looks for
+the cheapest (R, s, S) whose simulated fill rate meets a target.
+
+Candidates are evaluated by Monte Carlo with common random numbers: all
+candidates of a SKU are stepped through the same demand and lead time
+paths, drawn from the SKU's streams in eoq_parallel. Differences between
+candidates are therefore differences between policies rather than between
+samples, and the current EOQ / reorder point policy is simulated on the same
+paths as a baseline.
+
+The search space is one column per review period R and order size S - s
+(multiples of the EOQ); within a column s is searched rather than scanned:
+
+- Fill rate rises with s, so the smallest s meeting the target is found
+  by bisection on whole units. The first round evaluates a bracket of
+  2 standard deviations of demand over R + lead time, starting one below
+  its mean; an end that is not yet shown steps outwards with doubling
+  steps. A column is dropped when the cap of mean + 4 standard deviations
+  misses the target.
+- Cost also rises with s, so the cost at the highest s known to miss the
+  target is a lower bound for the column. A column is dropped as soon as
+  that bound reaches the cheapest feasible policy found for the SKU.
+
+Each round evaluates the remaining columns of many SKUs in one vectorized
+simulation, so the daily loop runs over as many rows as a round holds.
+SKUs are independent, so the search runs over a process pool and gives
+the same result for any number of workers.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from eoq_engine import DAYS_PER_YEAR
+from eoq_parallel import POLICY_COLUMNS, sku_rng
+from eoq_simulation import DEFAULT_CHUNK_PATHS, RESULT_COLUMNS, sample_paths, simulate_paths
+
+OPTIMIZED_COLUMNS = ('review_days', 'reorder_level', 'order_up_to', 'fill_rate', 'ordering_cost',
+                     'holding_cost', 'total_cost', 'evaluated')
+DEFAULT_REVIEW_PERIODS = (1, 7)
+DEFAULT_ORDER_FACTORS = (0.25, 0.35, 0.5, 0.71, 1.0, 1.41, 2.0, 2.83, 4.0)  # S - s as multiples of the EOQ
+_UPPER_BOUND_SIGMAS = 4
+_BRACKET_SIGMAS = 2
+_TASKS_PER_WORKER = 2
+DEFAULT_ROUND_ROWS = 1 << 16  # simulated rows per bisection round of a task
+
+
+def simulate_review(demand, lead_times, paths, review_days, reorder_level, order_up_to,
+                    holding_cost_per_unit, order_cost):
+    """
+    Step rows of (R, s, S) policies through sampled demand paths.
+
+    Row k follows demand[paths[k]] and lead_times[paths[k]], so many
+    policies can share the same paths. Policy and cost parameters are
+    scalars or one value per row. Every row starts with S on hand and
+    nothing on order; unmet demand is lost and costs are annualized as in
+    eoq_simulation.simulate_paths. Returns a dict of per-row arrays keyed by
+    RESULT_COLUMNS.
+    """
+    n_rows, horizon = len(paths), demand.shape[1]
+    review_days = np.broadcast_to(np.asarray(review_days, dtype=np.int64), (n_rows,))
+    reorder_level = np.broadcast_to(np.asarray(reorder_level, dtype=float), (n_rows,))
+    order_up_to = np.broadcast_to(np.asarray(order_up_to, dtype=float), (n_rows,))
+    demand_by_day = np.ascontiguousarray(demand.T)
+    reviewed_daily = bool(np.all(review_days == 1))
+
+    # Orders arrive within max(lead time) days, so a ring of that many slots holds the
+    # pipeline; one slot per row is contiguous, so a day's arrivals are one vector
+    slots = int(lead_times.max()) + 1
+    pipeline = np.zeros((slots, n_rows))
+    on_hand = order_up_to.copy()
+    position = on_hand.copy()
+    served_total = np.zeros(n_rows)
+    stockout_days = np.zeros(n_rows, dtype=np.int64)
+    orders = np.zeros(n_rows, dtype=np.int64)
+    inventory_sum = np.zeros(n_rows)
+    today = np.empty(n_rows)
+    served = np.empty(n_rows)
+    short = np.empty(n_rows, dtype=bool)
+
+    for t in range(horizon):
+        arriving = pipeline[t % slots]
+        on_hand += arriving
+        arriving[:] = 0
+        np.take(demand_by_day[t], paths, out=today)
+        np.less(on_hand, today, out=short)
+        stockout_days += short
+        np.minimum(on_hand, today, out=served)
+        on_hand -= served
+        position -= served
+        served_total += served
+        inventory_sum += on_hand
+
+        reorder = np.flatnonzero(position <= reorder_level)
+        if reorder.size and not reviewed_daily:
+            reorder = reorder[(t + 1) % review_days[reorder] == 0]
+        if reorder.size:
+            arrival = (t + lead_times[paths[reorder], t]) % slots
+            qty = order_up_to[reorder] - position[reorder]
+            pipeline[arrival, reorder] += qty
+            position[reorder] += qty
+            orders[reorder] += 1
+
+    years = horizon / DAYS_PER_YEAR
+    total_demand = demand.sum(axis=1)[paths]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fill_rate = np.where(total_demand > 0, served_total / total_demand, 1.0)
+    ordering_cost = orders * order_cost / years
+    holding_cost = inventory_sum / horizon * holding_cost_per_unit
+    return {
+        'fill_rate': fill_rate,
+        'stockout_days': stockout_days,
+        'ordering_cost': ordering_cost,
+        'holding_cost': holding_cost,
+        'total_cost': ordering_cost + holding_cost,
+    }
+
+
+def _optimize_skus(policies, sku_numbers, settings):
+    """
+    Search the SKUs of `policies`, whose rows follow POLICY_COLUMNS and are
+    the portfolio's SKUs `sku_numbers`; returns (optimized, baseline) arrays
+    of OPTIMIZED_COLUMNS and RESULT_COLUMNS per SKU.
+    """
+    target, review_periods, order_factors, n_paths, horizon_days, seed, chunk_paths = settings
+    n = len(policies)
+    col = {name: policies[:, j] for j, name in enumerate(POLICY_COLUMNS)}
+
+    # The same paths for the baseline and every candidate of a SKU
+    demand, lead_times = [], []
+    for i in range(n):
+        for c in range(math.ceil(n_paths / chunk_paths)):
+            d, lt = sample_paths(sku_rng(seed, sku_numbers[i], c),
+                                 min(chunk_paths, n_paths - c * chunk_paths), horizon_days,
+                                 col['daily_demand'][i], col['daily_std_dev'][i],
+                                 col['lead_time_days'][i], col['lead_time_std'][i])
+            demand.append(d)
+            lead_times.append(lt)
+    demand, lead_times = np.concatenate(demand), np.concatenate(lead_times)
+    path_sku = np.repeat(np.arange(n), n_paths)
+
+    initial_inventory = col['order_qty'] + col['reorder_point'] - col['daily_demand'] * col['lead_time_days']
+    simulated = simulate_paths(demand, lead_times, col['order_qty'][path_sku], col['reorder_point'][path_sku],
+                               initial_inventory[path_sku], col['holding_cost_per_unit'][path_sku],
+                               col['order_cost'][path_sku])
+    baseline = np.column_stack([simulated[name].reshape(n, n_paths).mean(axis=1) for name in RESULT_COLUMNS])
+
+    def evaluate(sku, review, level, up_to):
+        """Mean simulated results of candidates, one per entry of the arguments."""
+        rows = np.repeat(np.arange(len(sku)), n_paths)
+        paths = sku[rows] * n_paths + np.tile(np.arange(n_paths), len(sku))
+        result = simulate_review(demand, lead_times, paths, review[rows], level[rows], up_to[rows],
+                                 col['holding_cost_per_unit'][sku][rows], col['order_cost'][sku][rows])
+        return {name: result[name].reshape(len(sku), n_paths).mean(axis=1) for name in RESULT_COLUMNS}
+
+    # Columns: one per SKU, review period and order size
+    review_grid, factor_grid = np.meshgrid(review_periods, order_factors, indexing='ij')
+    sku = np.repeat(np.arange(n), review_grid.size)
+    review = np.tile(review_grid.ravel(), n).astype(np.int64)
+    size = np.maximum(np.rint(col['order_qty'][sku] * np.tile(factor_grid.ravel(), n)), 1)
+    protection = col['lead_time_days'][sku] + review
+    demand_sigma = np.sqrt(protection * col['daily_std_dev'][sku] ** 2
+                           + (col['daily_demand'][sku] * col['lead_time_std'][sku]) ** 2)
+    mean_demand = col['daily_demand'][sku] * protection
+    cap = np.ceil(mean_demand + _UPPER_BOUND_SIGMAS * demand_sigma)
+    # Bracket the smallest feasible s around mean demand over R + lead time; lo = -1 and
+    # hi = cap + 1 mark ends not yet shown to miss or meet the target
+    lo = np.full(len(sku), -1.0)
+    hi = cap + 1
+    lo_cost = np.full(len(sku), -np.inf)
+    step = np.maximum(np.ceil(_BRACKET_SIGMAS * demand_sigma), 1)
+    guess = np.clip(np.floor(mean_demand - demand_sigma), 0, cap)
+
+    cost = OPTIMIZED_COLUMNS.index('total_cost')
+    best = np.full((n, len(OPTIMIZED_COLUMNS)), np.nan)
+    best[:, cost] = np.inf
+    evaluated = np.zeros(n)
+
+    def record(candidates, level, result):
+        """
+        Count the candidates and keep each SKU's cheapest one meeting the
+        target; returns the feasible mask.
+        """
+        feasible = result['fill_rate'] >= target
+        evaluated[:] += np.bincount(sku[candidates], minlength=n)
+        for k in np.flatnonzero(feasible):
+            i, j = sku[candidates[k]], candidates[k]
+            if result['total_cost'][k] < best[i, cost]:
+                best[i, :cost + 1] = (review[j], level[k], level[k] + size[j], result['fill_rate'][k],
+                                      result['ordering_cost'][k], result['holding_cost'][k],
+                                      result['total_cost'][k])
+        return feasible
+
+    def narrow(candidates, level):
+        """
+        Evaluate `level` for the candidate columns and move their bracket
+        ends; a column's levels come in ascending order, so its last miss is
+        its highest.
+        """
+        result = evaluate(sku[candidates], review[candidates], level, level + size[candidates])
+        feasible = record(candidates, level, result)
+        np.minimum.at(hi, candidates[feasible], level[feasible])
+        lo[candidates[~feasible]] = level[~feasible]
+        lo_cost[candidates[~feasible]] = result['total_cost'][~feasible]
+
+    # First round: both ends of the initial bracket of every column
+    columns = np.arange(len(sku))
+    narrow(np.r_[columns, columns], np.r_[guess, np.minimum(guess + step, cap)])
+    # Until an end is shown, step past it with doubling steps; then bisect on whole units.
+    # A column ends when s = 0 meets the target, when the cap misses it, or when its
+    # lower bound reaches the SKU's cheapest feasible policy
+    while True:
+        active = (hi - lo > 1) & (hi > 0) & (lo < cap) & (lo_cost < best[sku, cost])
+        columns = np.flatnonzero(active)
+        if not columns.size:
+            break
+        l, h, d, top = lo[columns], hi[columns], step[columns], cap[columns]
+        level = np.where(l < 0, np.maximum(h - d, 0),
+                         np.where(h > top, np.minimum(l + d, top), np.floor((l + h) / 2)))
+        step[columns] *= 2
+        narrow(columns, level)
+
+    best[:, OPTIMIZED_COLUMNS.index('evaluated')] = evaluated
+    best[np.isinf(best[:, cost]), cost] = np.nan
+    return best, baseline
+
+
+def _run_task(args):
+    return _optimize_skus(*args)
+
+
+def optimize_portfolio(policies, target_fill_rate=0.98, review_periods=DEFAULT_REVIEW_PERIODS,
+                       order_factors=DEFAULT_ORDER_FACTORS, n_paths=500, horizon_days=DAYS_PER_YEAR, seed=0,
+                       workers=1, chunk_paths=DEFAULT_CHUNK_PATHS, round_rows=DEFAULT_ROUND_ROWS):
+    """
+    Cheapest (R, s, S) policy per SKU with a simulated fill rate of at least
+    `target_fill_rate` (a fraction).
+
+    `policies` maps POLICY_COLUMNS to one value per SKU, as for
+    eoq_parallel.simulate_portfolio; order_qty and reorder_point are the
+    current policy and order_qty scales `order_factors`. Returns a dict of
+    per-SKU arrays: OPTIMIZED_COLUMNS, NaN where no candidate meets the
+    target, and the baseline's mean simulated RESULT_COLUMNS prefixed with
+    'baseline_'. A task searches its SKUs together, one simulation per round,
+    and takes as many as fill a round of `round_rows` rows (n_paths per
+    column). The same seed, n_paths and chunk_paths give the same results
+    for any `workers` and `round_rows`.
+    """
+    if not 0 < target_fill_rate <= 1:
+        raise ValueError("target_fill_rate must be in (0, 1]")
+    if n_paths < 1 or chunk_paths < 1:
+        raise ValueError("n_paths and chunk_paths must be at least 1")
+    if not review_periods or min(review_periods) < 1 or not order_factors or min(order_factors) <= 0:
+        raise ValueError("review_periods must be whole days >= 1 and order_factors positive")
+    columns = []
+    for name in POLICY_COLUMNS:
+        if name in policies:
+            columns.append(np.asarray(policies[name], dtype=float))
+        elif name == 'lead_time_std':
+            columns.append(np.zeros(1))
+        else:
+            raise ValueError(f"missing policy column: {name}")
+    n_skus = max(len(np.atleast_1d(values)) for values in columns)
+    policy_array = np.column_stack([np.broadcast_to(values, (n_skus,)) for values in columns])
+    settings = (target_fill_rate, tuple(int(r) for r in review_periods), tuple(order_factors), n_paths,
+                horizon_days, seed, chunk_paths)
+
+    # A round simulates one candidate per column and path (two in the first round)
+    n_columns = len(review_periods) * len(order_factors)
+    size = max(1, round_rows // (n_columns * n_paths))
+    if workers > 1:
+        size = max(1, min(size, math.ceil(n_skus / (workers * _TASKS_PER_WORKER))))
+    # The pipeline spans the longest lead time of a task, so tasks take SKUs in lead time
+    # order; SKU numbers select the random streams and travel with the task
+    lead_time = policy_array[:, POLICY_COLUMNS.index('lead_time_days')]
+    order = np.lexsort((policy_array[:, POLICY_COLUMNS.index('lead_time_std')], lead_time))
+    groups = [order[start:start + size] for start in range(0, n_skus, size)]
+    tasks = [(policy_array[group], group, settings) for group in groups]
+    if workers <= 1 or len(tasks) <= 1:
+        parts = [_run_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_run_task, tasks))
+
+    optimized = np.empty((n_skus, len(OPTIMIZED_COLUMNS)))
+    baseline = np.empty((n_skus, len(RESULT_COLUMNS)))
+    for group, part in zip(groups, parts):
+        optimized[group], baseline[group] = part
+    results = {name: optimized[:, j] for j, name in enumerate(OPTIMIZED_COLUMNS)}
+    results.update({f'baseline_{name}': baseline[:, j] for j, name in enumerate(RESULT_COLUMNS)})
+    return results
+
+
+def optimize_frame(df, **kwargs):
+    """
+    optimize_portfolio for the engine's results (calculate_frame output),
+    with each SKU's EOQ and reorder point as the baseline. Appends the
+    chosen policy as opt_* columns and the baseline's simulated results as
+    sim_* columns to a copy of `df`; keyword arguments go to
+    optimize_portfolio.
+    """
+    policies = {name: df[name].to_numpy(dtype=float) for name in POLICY_COLUMNS
+                if name not in ('order_qty', 'lead_time_std')}
+    policies['order_qty'] = df['eoq'].to_numpy(dtype=float)
+    if 'lead_time_std' in df.columns:
+        policies['lead_time_std'] = df['lead_time_std'].to_numpy(dtype=float)
+    results = optimize_portfolio(policies, **kwargs)
+    out = df.copy()
+    for name in OPTIMIZED_COLUMNS:
+        out[f'opt_{name}'] = results[name]
+    for name in RESULT_COLUMNS:
+        out[f'sim_{name}'] = results[f'baseline_{name}']
+    return out
@@ -0,0 +1,137 @@
+"""
+Compact in-memory portfolio of SKUs.
+
+A Portfolio keeps every SKU's inputs and engine metrics in one structured
+NumPy array (a record per SKU, a field per column) instead of separate
+float64 DataFrame columns, and SKU and supplier identifiers as integer
+codes into arrays of their distinct labels. Fields are read as zero-copy
+views: `portfolio['eoq']` is the EOQ of every SKU, and calculate() feeds
+the input fields to the engine without copying them into a frame.
+
+With dtype='float32' a record takes half the space. Metrics are still
+computed in float64 and rounded once when stored, so every stored value is
+within a relative 2**-24 (about 6e-8) of the float64 result: less than
+€0.001 on a €15,828 annual cost. calculate() recomputes from the rounded
+inputs instead, which loosens the bound to about 3 * 2**-24 for metrics
+that don't involve the service level. The z-score magnifies the rounding
+of service levels close to 100%: measured up to 4, 11 and 61 * 2**-24 for
+service levels below 95%, 99% and 99.9%, and the same for safety stock
+and the costs that include it. Whole quantities stay exact up to 2**24
+(16.7 million) units.
+"""
+
+import numpy as np
+import pandas as pd
+
+from eoq_engine import INPUT_COLUMNS, METRIC_COLUMNS, calculate
+
+PORTFOLIO_DTYPES = ('float64', 'float32')
+FLOAT32_RELATIVE_ERROR = 2.0 ** -24
+
+
+def _codes(values):
+    """Smallest-integer codes and the Index of distinct labels of an identifier column."""
+    codes, labels = pd.factorize(pd.Series(values).astype(str))
+    for dtype in (np.int8, np.int16, np.int32):
+        if len(labels) <= np.iinfo(dtype).max:
+            return codes.astype(dtype), labels
+    return codes, labels
+
+
+class Portfolio:
+    """
+    Inputs and metrics of many SKUs in one structured array.
+
+    Build one with Portfolio.from_frame; index it by field name for
+    zero-copy column views.
+    """
+
+    def __init__(self, data, sku_codes=None, sku_labels=None, supplier_codes=None, supplier_labels=None):
+        self.data = data
+        self.sku_codes, self.sku_labels = sku_codes, sku_labels
+        self.supplier_codes, self.supplier_labels = supplier_codes, supplier_labels
+
+    @classmethod
+    def from_frame(cls, df, dtype='float64', sku_column='sku', supplier_column='supplier'):
+        """
+        Portfolio of a SKU frame with every INPUT_COLUMNS column; the
+        metrics are computed here. SKU and supplier columns are optional.
+        """
+        if dtype not in PORTFOLIO_DTYPES:
+            raise ValueError(f"dtype must be one of {', '.join(PORTFOLIO_DTYPES)}")
+        missing = [col for col in INPUT_COLUMNS if col not in df.columns]
+        if missing:
+            raise ValueError(f"missing input columns: {', '.join(missing)}")
+
+        data = np.empty(len(df), dtype=[(name, dtype) for name in INPUT_COLUMNS + METRIC_COLUMNS])
+        inputs = {col: df[col].to_numpy(dtype=float) for col in INPUT_COLUMNS}
+        for col, values in inputs.items():
+            data[col] = values
+        results = calculate(**inputs)
+        for name in METRIC_COLUMNS:
+            data[name] = results[name]
+
+        portfolio = cls(data)
+        if sku_column in df.columns:
+            portfolio.sku_codes, portfolio.sku_labels = _codes(df[sku_column])
+        if supplier_column in df.columns:
+            portfolio.supplier_codes, portfolio.supplier_labels = _codes(df[supplier_column])
+        return portfolio
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, name):
+        """Zero-copy view of one field for every SKU."""
+        return self.data[name]
+
+    @property
+    def skus(self):
+        return None if self.sku_codes is None else pd.Categorical.from_codes(self.sku_codes, self.sku_labels)
+
+    @property
+    def suppliers(self):
+        if self.supplier_codes is None:
+            return None
+        return pd.Categorical.from_codes(self.supplier_codes, self.supplier_labels)
+
+    def calculate(self):
+        """Recompute the metrics from the stored inputs, e.g. after editing an input field."""
+        results = calculate(**{col: self.data[col] for col in INPUT_COLUMNS})
+        for name in METRIC_COLUMNS:
+            self.data[name] = results[name]
+
+    def to_frame(self):
+        """DataFrame copy, with the identifiers as categoricals."""
+        frame = pd.DataFrame(self.data)
+        if self.supplier_codes is not None:
+            frame.insert(0, 'supplier', self.suppliers)
+        if self.sku_codes is not None:
+            frame.insert(0, 'sku', self.skus)
+        return frame
+
+    def to_arrow(self):
+        """Arrow table with dictionary-encoded identifiers and fields of the stored dtype."""
+        import pyarrow as pa
+
+        columns, names = [], []
+        for name, codes, labels in (('sku', self.sku_codes, self.sku_labels),
+                                    ('supplier', self.supplier_codes, self.supplier_labels)):
+            if codes is not None:
+                columns.append(pa.DictionaryArray.from_arrays(codes, pa.array(labels, pa.string())))
+                names.append(name)
+        for name in self.data.dtype.names:
+            columns.append(pa.array(np.ascontiguousarray(self.data[name])))
+            names.append(name)
+        return pa.table(columns, names=names)
+
+    def memory_usage(self):
+        """Bytes per SKU: values, identifiers (codes plus labels) and total."""
+        n = max(len(self), 1)
+        identifiers = 0
+        for codes, labels in ((self.sku_codes, self.sku_labels), (self.supplier_codes, self.supplier_labels)):
+            if codes is not None:
+                # The labels' data only, not the lookup table pandas builds on first use
+                identifiers += codes.nbytes + pd.Series(labels, copy=False).memory_usage(index=False, deep=True)
+        values = self.data.nbytes
+        return {'values': values / n, 'identifiers': identifiers / n, 'total': (values + identifiers) / n}
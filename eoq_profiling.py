@@ -0,0 +1,122 @@
+"""
+Lightweight stage timing for the Streamlit app.
+
+A StageRecorder keeps a rolling window of wall time and peak allocation
+per named stage and can summarize them as p50/p95 or dump the raw samples
+as JSON lines for offline analysis.
+"""
+
+import json
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+DEFAULT_WINDOW = 500
+
+
+class StageRecorder:
+    """Thread-safe rolling timings per stage; one instance can serve all sessions."""
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+        # Stages tracing allocations right now, how many ever started, and
+        # whether tracemalloc was started here (and so is ours to stop)
+        self._tracers = 0
+        self._traces_started = 0
+        self._started_tracing = False
+
+    def _start_tracing(self):
+        with self._lock:
+            self._tracers += 1
+            self._traces_started += 1
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            return self._traces_started, self._tracers == 1
+
+    def _stop_tracing(self):
+        with self._lock:
+            self._tracers -= 1
+            if self._tracers == 0 and self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name, trace_memory=False):
+        """
+        Time the enclosed block as stage `name`.
+
+        With trace_memory, tracemalloc runs for the duration of the stage
+        only (unless it was already tracing) and the peak allocation is
+        recorded. tracemalloc is process-wide: the peak includes whatever
+        other threads allocate meanwhile, and a stage that overlaps another
+        traced stage records no allocation. Without trace_memory no
+        allocation is recorded and the peak is left alone, so an untraced
+        stage never disturbs a traced one. Stages should not be nested.
+        """
+        if trace_memory:
+            started, alone = self._start_tracing()
+            # Only the stage that owns the trace may reset the process-wide peak
+            if alone:
+                tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            alloc = None
+            if trace_memory:
+                alloc = tracemalloc.get_traced_memory()[1] - base
+                with self._lock:
+                    if not alone or self._traces_started != started:
+                        alloc = None
+                self._stop_tracing()
+            self.record(name, seconds, alloc)
+
+    def record(self, name, seconds, alloc_bytes=None):
+        with self._lock:
+            self._samples[name].append((time.time(), seconds, alloc_bytes))
+
+    def summary(self):
+        """One row per stage: sample count, p50/p95 wall time (ms) and p95 peak allocation (KiB)."""
+        with self._lock:
+            samples = {name: list(values) for name, values in self._samples.items()}
+
+        rows = []
+        for name, values in samples.items():
+            seconds = np.array([s for _, s, _ in values])
+            allocs = np.array([a for _, _, a in values if a is not None])
+            p50, p95 = np.percentile(seconds, [50, 95]) * 1000
+            rows.append({
+                'stage': name,
+                'samples': len(values),
+                'p50_ms': p50,
+                'p95_ms': p95,
+                'alloc_p95_kib': np.percentile(allocs, 95) / 1024 if len(allocs) else None,
+            })
+        return rows
+
+    def dump(self, path):
+        """Append every recorded sample to `path` as JSON lines. Returns the count written."""
+        with self._lock:
+            samples = {name: list(values) for name, values in self._samples.items()}
+
+        count = 0
+        with open(path, 'a') as fh:
+            for name, values in samples.items():
+                for timestamp, seconds, alloc in values:
+                    fh.write(json.dumps({'ts': timestamp, 'stage': name, 'seconds': seconds,
+                                         'alloc_bytes': alloc}) + '\n')
+                    count += 1
+        return count
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
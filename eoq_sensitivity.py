@@ -0,0 +1,58 @@
+"""
+N-dimensional sensitivity sweeps over the EOQ engine.
+
+Every combination of the swept inputs is evaluated by broadcasting, in
+chunks of grid points so large grids never materialize all intermediates.
+"""
+
+import numpy as np
+
+from eoq_engine import INPUT_COLUMNS, calculate
+
+DEFAULT_CHUNK_POINTS = 250_000
+
+
+def sweep(base, axes, metrics='total_inventory_cost_annual', chunk_points=DEFAULT_CHUNK_POINTS):
+    """
+    Evaluate engine metrics over the Cartesian grid of `axes`.
+
+    `base` maps every name in INPUT_COLUMNS to a scalar; `axes` maps some
+    of them to 1-D value arrays, in the order that defines the output axes.
+    Returns an array of shape (len(axis_1), len(axis_2), ...) for a single
+    metric name, or a dict of such arrays for a sequence of names. Only
+    `chunk_points` grid points are evaluated at a time, so temporaries stay
+    bounded; the output arrays themselves are the full grid.
+    """
+    unknown = [name for name in axes if name not in INPUT_COLUMNS]
+    if unknown:
+        raise ValueError(f"cannot sweep unknown inputs: {', '.join(unknown)}")
+
+    names = [metrics] if isinstance(metrics, str) else list(metrics)
+    axis_values = {name: np.asarray(values, dtype=float) for name, values in axes.items()}
+    shape = tuple(len(values) for values in axis_values.values())
+    size = int(np.prod(shape))
+    out = {name: np.empty(size) for name in names}
+
+    for start in range(0, size, chunk_points):
+        flat = np.arange(start, min(start + chunk_points, size))
+        coords = np.unravel_index(flat, shape)
+        inputs = {col: base[col] for col in INPUT_COLUMNS}
+        for (axis, values), idx in zip(axis_values.items(), coords):
+            inputs[axis] = values[idx]
+        results = calculate(**inputs)
+        for name in names:
+            out[name][start:start + len(flat)] = results[name]
+
+    out = {name: values.reshape(shape) for name, values in out.items()}
+    return out[metrics] if isinstance(metrics, str) else out
+
+
+def default_axis(name, base_value, n=50):
+    """A sweep range around `base_value` that stays inside the sidebar limits."""
+    if name == 'service_level':
+        return np.linspace(85, 99.9, n)
+    if name in ('holding_cost_pct', 'demand_variability'):
+        return np.linspace(5, 50, n)
+    if name == 'lead_time_days':
+        return np.linspace(1, max(2 * base_value, 30), n)
+    return np.geomspace(base_value / 4, base_value * 4, n)
@@ -0,0 +1,306 @@
+"""
+HTTP calculation service.
+
+A small JSON API around the engine on the standard library's asyncio
+streams, with no dependencies beyond NumPy:
+
+    GET  /health           -> {"status": "ok", ...}
+    POST /calculate        {"annual_demand": 50000, ...}       -> metrics of one SKU
+    POST /calculate/bulk   [{"annual_demand": 50000, ...}, ...] -> list of metrics
+
+Inputs are named after INPUT_COLUMNS; missing ones fall back to the
+service defaults. Single requests are not computed one by one: they queue
+up for a few milliseconds and the MicroBatcher runs each batch through one
+vectorized engine call, so throughput grows with concurrency. Connections
+are kept alive (HTTP/1.1) for load tests.
+"""
+
+import asyncio
+import json
+import math
+import time
+
+import numpy as np
+
+from eoq_engine import ENGINE_VERSION, INPUT_COLUMNS, METRIC_COLUMNS, calculate
+
+DEFAULT_MAX_BATCH = 1024
+DEFAULT_MAX_DELAY = 0.002  # seconds a request waits for others to join its batch
+MAX_BODY_BYTES = 64 * 1024 * 1024
+MAX_LINE_BYTES = 64 * 1024  # request line and each header line
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            411: 'Length Required', 413: 'Payload Too Large', 431: 'Request Header Fields Too Large',
+            500: 'Internal Server Error'}
+
+
+class RequestError(Exception):
+    """Client error answered with an HTTP status and a JSON message."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _parse_items(items, defaults):
+    """(n, len(INPUT_COLUMNS)) array from a list of JSON objects; raises RequestError on bad input."""
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise RequestError(400, "expected a JSON object per SKU")
+    rows = np.empty((len(items), len(INPUT_COLUMNS)))
+    for i, item in enumerate(items):
+        unknown = set(item) - set(INPUT_COLUMNS)
+        if unknown:
+            raise RequestError(400, f"unknown inputs: {', '.join(sorted(unknown))}")
+        for j, col in enumerate(INPUT_COLUMNS):
+            value = item.get(col, defaults.get(col))
+            if value is None:
+                raise RequestError(400, f"missing input: {col}")
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise RequestError(400, f"{col} must be a number")
+            rows[i, j] = value
+    service_level = rows[:, INPUT_COLUMNS.index('service_level')]
+    if not np.all((service_level > 0) & (service_level < 100)):
+        raise RequestError(400, "service_level must be strictly between 0 and 100 (%)")
+    return rows
+
+
+def _metrics(rows):
+    """Engine metrics per row as JSON-ready dicts; non-finite values become null."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        results = calculate(**{col: rows[:, j] for j, col in enumerate(INPUT_COLUMNS)})
+    columns = [np.broadcast_to(results[name], len(rows)).tolist() for name in METRIC_COLUMNS]
+    return [
+        {name: value if math.isfinite(value) else None for name, value in zip(METRIC_COLUMNS, values)}
+        for values in zip(*columns)
+    ]
+
+
+class MicroBatcher:
+    """
+    Collects single calculations from concurrent requests and runs them
+    together: a batch closes after `max_delay` seconds or `max_batch` items.
+    """
+
+    def __init__(self, max_batch=DEFAULT_MAX_BATCH, max_delay=DEFAULT_MAX_DELAY):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self.items = 0
+        self._queue = asyncio.Queue()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, row):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+            # Let the requests already received reach the queue: keep yielding
+            # to the event loop while that adds to the batch, so a lone request
+            # isn't held back for the full delay
+            while len(batch) < self.max_batch and loop.time() < deadline:
+                size = len(batch)
+                while len(batch) < self.max_batch and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                await asyncio.sleep(0)
+                if len(batch) == size and self._queue.empty():
+                    break
+
+            self.batches += 1
+            self.items += len(batch)
+            try:
+                results = _metrics(np.stack([row for row, _ in batch]))
+            except Exception as exc:  # answer every waiting request, keep serving
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+class CalculationService:
+    """The HTTP server: request parsing, routing and the shared MicroBatcher."""
+
+    def __init__(self, defaults=None, max_batch=DEFAULT_MAX_BATCH, max_delay=DEFAULT_MAX_DELAY):
+        self.defaults = dict(defaults or {})
+        self.batcher = MicroBatcher(max_batch, max_delay)
+        self.requests = 0
+        self._server = None
+
+    async def start(self, host='127.0.0.1', port=8000):
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle, host, port, limit=MAX_LINE_BYTES)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+        await self.batcher.stop()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await self._read_line(reader, 400, "request line")
+                    if not request_line:
+                        break
+                    method, path, version, headers, body_error = await self._read_head(reader, request_line)
+                except RequestError as exc:
+                    # The rest of an overlong line is still unread, so the connection can't go on
+                    self._respond(writer, exc.status, {'error': str(exc)}, keep_alive=False)
+                    await writer.drain()
+                    break
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and (version == 'HTTP/1.1' or headers.get('connection', '').lower() == 'keep-alive'))
+                body = None
+                try:
+                    if body_error:
+                        raise body_error
+                    body = await self._read_body(reader, headers)
+                    status, payload = 200, await self._route(method, path, body)
+                except RequestError as exc:
+                    status, payload = exc.status, {'error': str(exc)}
+                    # Without the body read, the rest of the stream can't be parsed
+                    keep_alive = keep_alive and body is not None
+                except Exception as exc:
+                    status, payload = 500, {'error': f"{type(exc).__name__}: {exc}"}
+                self._respond(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _respond(self, writer, status, payload, keep_alive):
+        self.requests += 1
+        data = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+            .encode() + data
+        )
+
+    @staticmethod
+    async def _read_line(reader, status, what):
+        try:
+            return await reader.readline()
+        except ValueError:  # the stream's LimitOverrunError: no newline within MAX_LINE_BYTES
+            raise RequestError(status, f"{what} longer than {MAX_LINE_BYTES:,} bytes") from None
+
+    @classmethod
+    async def _read_head(cls, reader, request_line):
+        parts = request_line.decode('latin-1').split()
+        error = None
+        if len(parts) != 3:
+            parts, error = ['GET', '/', 'HTTP/1.0'], RequestError(400, "malformed request line")
+        headers = {}
+        while True:
+            line = await cls._read_line(reader, 431, "header line")
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        return parts[0], parts[1], parts[2], headers, error
+
+    @staticmethod
+    async def _read_body(reader, headers):
+        if 'transfer-encoding' in headers:
+            raise RequestError(411, "chunked bodies are not supported; send Content-Length")
+        try:
+            length = int(headers.get('content-length', 0) or 0)
+        except ValueError:
+            raise RequestError(400, "invalid Content-Length") from None
+        if length > MAX_BODY_BYTES:
+            raise RequestError(413, f"body larger than {MAX_BODY_BYTES:,} bytes")
+        return await reader.readexactly(length) if length else b''
+
+    async def _route(self, method, path, body):
+        path = path.split('?', 1)[0].rstrip('/') or '/'
+        routes = {'/health': 'GET', '/calculate': 'POST', '/calculate/bulk': 'POST'}
+        if path not in routes:
+            raise RequestError(404, f"no route {path}")
+        if method != routes[path]:
+            raise RequestError(405, f"{path} takes {routes[path]}")
+        if path == '/health':
+            return {'status': 'ok', 'engine_version': ENGINE_VERSION, 'requests': self.requests,
+                    'batches': self.batcher.batches, 'batched_items': self.batcher.items}
+
+        try:
+            data = json.loads(body or b'null')
+        except ValueError:
+            raise RequestError(400, "body is not valid JSON") from None
+        if path == '/calculate':
+            rows = _parse_items([data], self.defaults)
+            return await self.batcher.submit(rows[0])
+        # Already a batch: one engine call, off the event loop when large
+        rows = _parse_items(data, self.defaults)
+        if len(rows) > self.batcher.max_batch:
+            return await asyncio.to_thread(_metrics, rows)
+        return _metrics(rows)
+
+
+async def load_test(host, port, item, n_requests=10_000, concurrency=64, path='/calculate'):
+    """
+    POST `item` n_requests times over `concurrency` keep-alive connections;
+    returns requests per second. For local load tests of a running service.
+    """
+    body = json.dumps(item).encode()
+    request = (f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+               f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+
+    async def client(count):
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for _ in range(count):
+                writer.write(request)
+                await writer.drain()
+                head = await reader.readuntil(b'\r\n\r\n')
+                status = int(head.split(b' ', 2)[1])
+                length = next(int(line.split(b':')[1]) for line in head.split(b'\r\n')
+                              if line.lower().startswith(b'content-length'))
+                data = await reader.readexactly(length)
+                if status != 200:
+                    raise RuntimeError(f"HTTP {status}: {data.decode()}")
+        finally:
+            writer.close()
+
+    counts = [n_requests // concurrency + (i < n_requests % concurrency) for i in range(concurrency)]
+    start = time.perf_counter()
+    await asyncio.gather(*(client(count) for count in counts if count))
+    return n_requests / (time.perf_counter() - start)
+
+
+async def serve(host='127.0.0.1', port=8000, defaults=None, max_batch=DEFAULT_MAX_BATCH,
+                max_delay=DEFAULT_MAX_DELAY, ready=None):
+    """Run the service until cancelled; `ready(address)` is called once it listens."""
+    service = CalculationService(defaults, max_batch, max_delay)
+    address = await service.start(host, port)
+    if ready is not None:
+        ready(address)
+    try:
+        await service.serve_forever()
+    finally:
+        await service.stop()
@@ -0,0 +1,121 @@
+"""
+Monte Carlo simulation of the (Q, reorder point) inventory policy.
+
+Daily demand and order lead times are sampled as 2-D arrays (paths x days)
+and all paths are stepped through time together. Unmet demand is lost.
+"""
+
+import numpy as np
+
+from eoq_engine import DAYS_PER_YEAR
+
+DEFAULT_CHUNK_PATHS = 2_000
+
+RESULT_COLUMNS = ('fill_rate', 'stockout_days', 'ordering_cost', 'holding_cost', 'total_cost')
+
+
+def sample_paths(rng, n_paths, horizon_days, daily_demand, daily_std_dev,
+                 lead_time_days, lead_time_std=0.0):
+    """
+    Draw demand and lead time matrices of shape (n_paths, horizon_days).
+
+    Demand is normal, truncated at zero. Lead times are normal, rounded to
+    whole days and at least one day; lead_times[p, t] is used if path p
+    places an order on day t.
+    """
+    shape = (n_paths, horizon_days)
+    demand = np.maximum(rng.normal(daily_demand, daily_std_dev, shape), 0)
+    if lead_time_std > 0:
+        lead_times = np.maximum(np.rint(rng.normal(lead_time_days, lead_time_std, shape)), 1)
+    else:
+        lead_times = np.full(shape, max(round(lead_time_days), 1))
+    return demand, lead_times.astype(np.int32)
+
+
+def simulate_paths(demand, lead_times, order_qty, reorder_point, initial_inventory,
+                   holding_cost_per_unit, order_cost):
+    """
+    Step every path through the sampled days under a (Q, R) policy.
+
+    Whenever inventory position (on hand + on order) is at or below
+    `reorder_point` at the end of a day, `order_qty` units are ordered and
+    arrive lead_times[p, t] days later. Policy and cost parameters are
+    scalars or arrays with one value per path. Costs are annualized.
+    Returns a dict of per-path arrays keyed by RESULT_COLUMNS.
+    """
+    n_paths, horizon = demand.shape
+    order_qty = np.broadcast_to(np.asarray(order_qty, dtype=float), (n_paths,))
+    reorder_point = np.broadcast_to(np.asarray(reorder_point, dtype=float), (n_paths,))
+
+    pipeline = np.zeros((n_paths, horizon + int(lead_times.max()) + 1))
+    on_hand = np.broadcast_to(np.asarray(initial_inventory, dtype=float), (n_paths,)).copy()
+    position = on_hand.copy()
+    served_total = np.zeros(n_paths)
+    stockout_days = np.zeros(n_paths, dtype=np.int64)
+    orders = np.zeros(n_paths, dtype=np.int64)
+    inventory_sum = np.zeros(n_paths)
+
+    for t in range(horizon):
+        on_hand += pipeline[:, t]
+        served = np.minimum(on_hand, demand[:, t])
+        on_hand -= served
+        position -= served
+        served_total += served
+        stockout_days += served < demand[:, t]
+        inventory_sum += on_hand
+
+        reorder = np.flatnonzero(position <= reorder_point)
+        if reorder.size:
+            pipeline[reorder, t + lead_times[reorder, t]] += order_qty[reorder]
+            position[reorder] += order_qty[reorder]
+            orders[reorder] += 1
+
+    years = horizon / DAYS_PER_YEAR
+    total_demand = demand.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fill_rate = np.where(total_demand > 0, served_total / total_demand, 1.0)
+    ordering_cost = orders * order_cost / years
+    holding_cost = inventory_sum / horizon * holding_cost_per_unit
+    return {
+        'fill_rate': fill_rate,
+        'stockout_days': stockout_days,
+        'ordering_cost': ordering_cost,
+        'holding_cost': holding_cost,
+        'total_cost': ordering_cost + holding_cost,
+    }
+
+
+def simulate_policy(order_qty, reorder_point, daily_demand, daily_std_dev, lead_time_days,
+                    holding_cost_per_unit, order_cost, lead_time_std=0.0, n_paths=10_000,
+                    horizon_days=DAYS_PER_YEAR, rng=None, chunk_paths=DEFAULT_CHUNK_PATHS):
+    """
+    Simulate `n_paths` independent paths of one item's (Q, R) policy.
+
+    Paths are processed `chunk_paths` at a time so memory stays bounded by
+    the chunk, not the path count. `rng` is a np.random.Generator or a seed;
+    the same seed and chunk size reproduce the same results. Every path
+    starts with Q + safety stock on hand and nothing on order.
+    """
+    rng = np.random.default_rng(rng)
+    initial_inventory = order_qty + reorder_point - daily_demand * lead_time_days
+
+    results = {name: [] for name in RESULT_COLUMNS}
+    for start in range(0, n_paths, chunk_paths):
+        size = min(chunk_paths, n_paths - start)
+        demand, lead_times = sample_paths(rng, size, horizon_days, daily_demand, daily_std_dev,
+                                          lead_time_days, lead_time_std)
+        chunk = simulate_paths(demand, lead_times, order_qty, reorder_point, initial_inventory,
+                               holding_cost_per_unit, order_cost)
+        for name in RESULT_COLUMNS:
+            results[name].append(chunk[name])
+    return {name: np.concatenate(parts) for name, parts in results.items()}
+
+
+def summarize(simulation, percentiles=(5, 50, 95)):
+    """Mean and percentiles of each simulated distribution."""
+    summary = {}
+    for name, values in simulation.items():
+        summary[name] = {'mean': float(np.mean(values))}
+        for p, value in zip(percentiles, np.percentile(values, percentiles)):
+            summary[name][f'p{p}'] = float(value)
+    return summary
@@ -0,0 +1,138 @@
+"""
+Fingerprinted result store for incremental batch runs.
+
+A run's results are kept as a snapshot file (Arrow IPC): one row per SKU
+with a 64-bit fingerprint of the SKU's input columns and the engine's
+metrics. The next run memory-maps the previous snapshot and looks each
+chunk up by SKU: rows whose fingerprint still matches are copied from the
+snapshot, only new or changed rows are computed. Every chunk is written to
+the new snapshot, which replaces the old one when the run completes, so
+SKUs that left the master drop out of the store.
+
+The snapshot records ENGINE_VERSION; after a formula change it is ignored
+and every row is computed again.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from eoq_engine import ENGINE_VERSION, INPUT_COLUMNS, METRIC_COLUMNS, calculate_frame
+
+
+def fingerprint(frame):
+    """64-bit hash of each row's INPUT_COLUMNS (as float64)."""
+    inputs = frame[list(INPUT_COLUMNS)].astype('float64')
+    return pd.util.hash_pandas_object(inputs, index=False).to_numpy().view(np.int64)
+
+
+class ResultStore:
+    """
+    Engine results of the previous run, keyed by SKU.
+
+    Use as a context manager, or call close(): the new snapshot only
+    replaces the old one when the run finishes without an error. `hits`
+    and `misses` count rows served from the snapshot and rows computed.
+    """
+
+    def __init__(self, path, sku_column='sku'):
+        import pyarrow as pa
+
+        self.path = os.fspath(path)
+        self.sku_column = sku_column
+        self.hits = 0
+        self.misses = 0
+        self._previous = None
+        self._positions = pd.Series(dtype=np.int64)
+        self._schema = pa.schema(
+            [('sku', pa.string()), ('fingerprint', pa.int64())]
+            + [(name, pa.float64()) for name in METRIC_COLUMNS],
+            metadata={'engine_version': str(ENGINE_VERSION)},
+        )
+        self._temp_path = f"{self.path}.tmp-{os.getpid()}"
+        self._writer = None
+
+        if os.path.exists(self.path):
+            previous = pa.ipc.open_file(pa.memory_map(self.path)).read_all()
+            if previous.schema.equals(self._schema, check_metadata=True):
+                self._previous = previous
+                skus = pd.Index(previous['sku'].to_numpy(zero_copy_only=False))
+                self._positions = pd.Series(np.arange(len(skus)), index=skus)
+                self._positions = self._positions[~skus.duplicated(keep='last')]
+
+    @property
+    def previous_rows(self):
+        return 0 if self._previous is None else self._previous.num_rows
+
+    def invalidate(self):
+        """Ignore the previous snapshot; every row of this run is computed."""
+        self._previous = None
+        self._positions = pd.Series(dtype=np.int64)
+
+    def calculate_frame(self, df):
+        """
+        Same result as eoq_engine.calculate_frame, computing only the rows
+        whose SKU is new or whose inputs changed since the previous run.
+        """
+        import pyarrow as pa
+
+        if self.sku_column not in df.columns:
+            raise ValueError(f"missing SKU column: {self.sku_column}")
+        missing = [col for col in INPUT_COLUMNS if col not in df.columns]
+        if missing:
+            raise ValueError(f"missing input columns: {', '.join(missing)}")
+
+        skus = df[self.sku_column].astype(str).to_numpy(dtype=object)
+        prints = fingerprint(df)
+        metrics = np.empty((len(df), len(METRIC_COLUMNS)))
+
+        hit = np.zeros(len(df), dtype=bool)
+        if self._previous is not None:
+            positions = self._positions.reindex(skus).to_numpy()
+            found = np.flatnonzero(~np.isnan(positions))
+            rows = positions[found].astype(np.int64)
+            matches = self._previous['fingerprint'].take(rows).to_numpy() == prints[found]
+            found, rows = found[matches], rows[matches]
+            hit[found] = True
+            stored = self._previous.select(list(METRIC_COLUMNS)).take(rows)
+            for i, name in enumerate(METRIC_COLUMNS):
+                metrics[found, i] = stored[name].to_numpy()
+
+        miss = np.flatnonzero(~hit)
+        if len(miss):
+            computed = calculate_frame(df.iloc[miss])
+            metrics[miss] = computed[list(METRIC_COLUMNS)].to_numpy(dtype=float)
+        self.hits += len(df) - len(miss)
+        self.misses += len(miss)
+
+        if self._writer is None:
+            self._writer = pa.ipc.new_file(self._temp_path, self._schema)
+        self._writer.write_batch(pa.record_batch(
+            [pa.array(skus, pa.string()), pa.array(prints)] + [pa.array(metrics[:, i]) for i in range(metrics.shape[1])],
+            schema=self._schema,
+        ))
+
+        out = df.copy()
+        for i, name in enumerate(METRIC_COLUMNS):
+            out[name] = metrics[:, i]
+        return out
+
+    def close(self, commit=True):
+        """Finish the new snapshot and, with `commit`, make it the store."""
+        self._previous = None
+        self._positions = pd.Series(dtype=np.int64)
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._writer = None
+        if commit:
+            os.replace(self._temp_path, self.path)
+        else:
+            os.remove(self._temp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(commit=exc_type is None)